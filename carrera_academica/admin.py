@@ -1,6 +1,6 @@
 # carrera_academica/admin.py
 
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import *
 from datetime import date  # Importamos date para el cálculo de la edad
 
@@ -228,8 +228,19 @@ class CarreraAcademicaAdmin(admin.ModelAdmin):
 
 
 class PlantillaDocumentoAdmin(admin.ModelAdmin):
-    list_display = ("tipo_formulario", "descripcion", "archivo")
+    list_display = ("tipo_formulario", "descripcion", "archivo", "marcadores_detectados")
     list_filter = ("tipo_formulario",)
+    readonly_fields = ("marcadores_detectados",)
+
+    def marcadores_detectados(self, obj):
+        return ", ".join((obj.manifest or {}).get("marcadores", [])) or "-"
+
+    marcadores_detectados.short_description = "Marcadores"
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        for advertencia in (obj.manifest or {}).get("advertencias", []):
+            self.message_user(request, advertencia, messages.WARNING)
 
 
 class EvaluacionAdmin(admin.ModelAdmin):
@@ -0,0 +1,418 @@
+# carrera_academica/management/commands/benchmark_documentos.py
+"""
+Comando para hacer benchmark de los generadores de documentos.
+
+Construye expedientes sintéticos en una base de datos temporal (igual que
+los tests) y mide tiempo, memoria pico y tamaño de salida de:
+
+- PDFService.consolidar_expediente
+- PDFService.generar_propuesta_jurado (WeasyPrint)
+- Acta de equivalencias (WeasyPrint)
+- DocumentService.generar_documento_dinamico
+
+Los resultados se escriben en JSON para comparar corridas entre versiones.
+"""
+import gc
+import io
+import json
+import math
+import os
+import platform
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stderr
+from datetime import date, timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from django.utils import timezone
+from docx import Document
+from PIL import Image
+from pypdf import PdfWriter
+from weasyprint import HTML
+
+from carrera_academica.models import (
+    CarreraAcademica,
+    JuntaEvaluadora,
+    MembreteAnual,
+    MiembroExterno,
+    PlantillaDocumento,
+    Veedor,
+)
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.pdf_service import PDFService
+from equivalencias.models import (
+    AsignaturaParaEquivalencia,
+    DetalleSolicitud,
+    Estudiante,
+    SolicitudEquivalencia,
+)
+from planta_docente.models import Asignatura, Cargo, Correo, Docente
+
+
+GENERADORES = ["consolidar_expediente",
+               "propuesta_jurado", "acta_equivalencias", "documento_dinamico"]
+
+# Páginas A4 a 150 dpi: suficiente para simular un escaneo real
+ESCANEO_TAMANIO = (1240, 1754)
+
+
+class Command(BaseCommand):
+    help = 'Hace benchmark de generación de documentos (PDF y Word) sobre expedientes sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--formularios', type=int, default=20,
+            help='Cantidad de formularios entregados (con PDF) en el expediente sintético')
+        parser.add_argument(
+            '--paginas', type=int, default=5,
+            help='Páginas de cada PDF de formulario')
+        parser.add_argument(
+            '--escaneos', type=int, default=2,
+            help='Cantidad de formularios que son escaneos con imágenes (pesados)')
+        parser.add_argument(
+            '--asignaturas', type=int, default=8,
+            help='Cantidad de asignaturas en la solicitud de equivalencia sintética')
+        parser.add_argument(
+            '--iteraciones', type=int, default=3,
+            help='Repeticiones por generador')
+        parser.add_argument(
+            '--generadores', nargs='+', choices=GENERADORES, default=GENERADORES,
+            help='Generadores a medir (por defecto, todos)')
+        parser.add_argument(
+            '--output', default='benchmark_documentos.json',
+            help='Ruta del archivo JSON de resultados')
+
+    def handle(self, *args, **options):
+        """Ejecuta el benchmark sobre una base de datos y MEDIA_ROOT temporales."""
+        self.stdout.write(self.style.WARNING(
+            'Iniciando benchmark de documentos...\n'))
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            with tempfile.TemporaryDirectory() as media_root, \
+                    override_settings(MEDIA_ROOT=media_root):
+                datos = self.crear_datos_sinteticos(options)
+                results = self.ejecutar_generadores(datos, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.print_results(results)
+        self.write_json(results, options)
+
+    # ------------------------------------------------------------------
+    # Datos sintéticos
+    # ------------------------------------------------------------------
+
+    def crear_datos_sinteticos(self, options):
+        """Crea un expediente, una junta y una solicitud de tamaño configurable."""
+        self.stdout.write('Creando expediente sintético...')
+
+        cantidad_formularios = max(options['formularios'], 1)
+        anios = max(2, math.ceil(cantidad_formularios / 5)) + 1
+        anio_actual = timezone.now().year
+        fecha_inicio = date(anio_actual - anios, 3, 1)
+        fecha_vencimiento = date(anio_actual, 3, 1)
+
+        asignatura = Asignatura.objects.create(
+            nombre="asignatura benchmark", nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        docente = self.crear_docente(1)
+        cargo = Cargo.objects.create(
+            docente=docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=fecha_inicio, fecha_vencimiento=fecha_vencimiento,
+        )
+        ca = CarreraAcademica.objects.create(
+            cargo=cargo,
+            numero_expediente=f"99999/{anio_actual}",
+            fecha_inicio=fecha_inicio,
+            fecha_vencimiento_original=fecha_vencimiento,
+            fecha_vencimiento_actual=fecha_vencimiento,
+        )
+
+        # Entregamos los primeros N formularios con PDFs sintéticos
+        pdf_texto = self.generar_pdf_texto(options['paginas'])
+        pdf_escaneo = self.generar_pdf_escaneo(options['paginas'])
+        formularios = ca.formularios.order_by('anio_correspondiente', 'pk')
+        for i, formulario in enumerate(formularios[:cantidad_formularios]):
+            contenido = pdf_escaneo if i < options['escaneos'] else pdf_texto
+            formulario.archivo.save(
+                f"form_{i}.pdf", ContentFile(contenido), save=False)
+            formulario.estado = "ENT"
+            formulario.fecha_entrega = fecha_inicio + timedelta(days=i)
+            formulario.save()
+
+        self.crear_junta(ca)
+
+        # Plantilla y membrete para los documentos dinámicos
+        formulario_dinamico = ca.formularios.filter(
+            tipo_formulario="F04").order_by('anio_correspondiente').first()
+        self.crear_plantilla_y_membrete(formulario_dinamico.anio_correspondiente)
+
+        solicitud = self.crear_solicitud(options['asignaturas'])
+
+        return {
+            'ca': ca,
+            'formulario_dinamico': formulario_dinamico,
+            'solicitud': solicitud,
+        }
+
+    def crear_docente(self, numero):
+        """Crea un docente con correo principal."""
+        docente = Docente.objects.create(
+            nombre=f"docente{numero}", apellido=f"benchmark{numero}",
+            documento=90000000 + numero, legajo=90000 + numero,
+            fecha_nacimiento=date(1970, 1, 1),
+        )
+        Correo.objects.create(
+            email=f"docente{numero}@benchmark.test", docente=docente)
+        return docente
+
+    def crear_junta(self, ca):
+        """Crea una junta evaluadora completa para la propuesta de jurado."""
+        junta = JuntaEvaluadora.objects.create(
+            carrera_academica=ca,
+            miembro_interno_titular=self.crear_docente(2),
+            miembro_interno_suplente=self.crear_docente(3),
+            veedor_alumno_titular=Veedor.objects.create(
+                nombre_completo="Veedor Alumno", claustro="ALU"),
+            veedor_graduado_titular=Veedor.objects.create(
+                nombre_completo="Veedor Graduado", claustro="GRA"),
+        )
+        externos = [
+            MiembroExterno.objects.create(
+                nombre_completo=f"Externo {i}", email=f"externo{i}@benchmark.test",
+                universidad_origen="Universidad Benchmark",
+                cargo_info="Titular con Dedicación Exclusiva",
+            )
+            for i in range(5)
+        ]
+        junta.miembros_externos_titulares.set(externos[:3])
+        junta.miembros_externos_suplentes.set(externos[3:])
+        return junta
+
+    def crear_plantilla_y_membrete(self, anio):
+        """Crea una plantilla F04 y un membrete con un logo de alta resolución."""
+        doc = Document()
+        header = doc.sections[0].header
+        tabla = header.add_table(rows=1, cols=2, width=doc.sections[0].page_width)
+        tabla.cell(0, 0).paragraphs[0].text = "[LOGO_ANUAL]"
+        tabla.cell(0, 1).paragraphs[0].text = "[FRASE_ANUAL]"
+
+        doc.add_paragraph("Docente: [DOCENTE_NOMBRE]")
+        doc.add_paragraph("Asignatura: [ASIGNATURA] - Cargo: [CARGO]")
+        doc.add_paragraph("Año lectivo: [ANIO_LECTIVO] - Dedicación: [DEDICACION]")
+        tabla_cuerpo = doc.add_table(rows=20, cols=3)
+        for row in tabla_cuerpo.rows:
+            row.cells[0].text = "[COMISIONES]"
+            row.cells[1].text = "[FECHA_GENERACION]"
+            row.cells[2].text = "Texto fijo de la planilla"
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        plantilla = PlantillaDocumento(tipo_formulario="F04")
+        plantilla.archivo.save("plantilla_f04.docx",
+                               ContentFile(buffer.getvalue()), save=True)
+
+        logo = self.imagen_ruido("RGB", (2400, 2400))
+        buffer_logo = io.BytesIO()
+        logo.save(buffer_logo, "PNG")
+        membrete = MembreteAnual(anio=anio, frase="Año del benchmark")
+        membrete.logo.save("logo.png", ContentFile(buffer_logo.getvalue()), save=True)
+
+    def crear_solicitud(self, cantidad_asignaturas):
+        """Crea una solicitud de equivalencia con N asignaturas dictaminadas."""
+        estudiante = Estudiante.objects.create(
+            nombre_completo="Estudiante Benchmark", dni_pasaporte="99999999")
+        solicitud = SolicitudEquivalencia.objects.create(
+            id_estudiante=estudiante)
+
+        estados = ["Aprobada", "Denegada", "Requiere PC"]
+        for i in range(cantidad_asignaturas):
+            asignatura = Asignatura.objects.create(
+                nombre=f"equivalencia {i}", nivel="i", departamento="civil",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            asig_equiv = AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura)
+            estado = estados[i % len(estados)]
+            DetalleSolicitud.objects.create(
+                id_solicitud=solicitud,
+                id_asignatura=asig_equiv,
+                estado_asignatura=estado,
+                detalle_pc="Temas del programa complementario" if estado == "Requiere PC" else None,
+                fecha_dictamen=timezone.now(),
+            )
+        return solicitud
+
+    def generar_pdf_texto(self, paginas):
+        """PDF liviano de N páginas A4."""
+        writer = PdfWriter()
+        for _ in range(max(paginas, 1)):
+            writer.add_blank_page(width=595, height=842)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def generar_pdf_escaneo(self, paginas):
+        """PDF pesado: cada página es una imagen con ruido (no comprime bien)."""
+        imagenes = [
+            self.imagen_ruido("L", ESCANEO_TAMANIO, semilla=i)
+            for i in range(max(paginas, 1))
+        ]
+
+        buffer = io.BytesIO()
+        imagenes[0].save(buffer, "PDF", resolution=150,
+                         save_all=True, append_images=imagenes[1:])
+        return buffer.getvalue()
+
+    def imagen_ruido(self, modo, tamanio, semilla=0):
+        """Imagen con píxeles pseudoaleatorios reproducibles."""
+        ancho, alto = tamanio
+        canales = len(modo)
+        datos = random.Random(semilla).randbytes(ancho * alto * canales)
+        return Image.frombytes(modo, tamanio, datos)
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+
+    def ejecutar_generadores(self, datos, options):
+        """Mide cada generador seleccionado."""
+        funciones = {
+            'consolidar_expediente': lambda: PDFService.consolidar_expediente(datos['ca'])[0],
+            'propuesta_jurado': lambda: PDFService.generar_propuesta_jurado(datos['ca'], ""),
+            'acta_equivalencias': lambda: self.generar_acta(datos['solicitud']),
+            'documento_dinamico': lambda: DocumentService.generar_documento_dinamico(
+                datos['formulario_dinamico'])[0],
+        }
+
+        results = []
+        for nombre in options['generadores']:
+            self.stdout.write(f'Midiendo {nombre}...')
+            results.append(self.benchmark_generador(
+                nombre, funciones[nombre], options['iteraciones']))
+        return results
+
+    def generar_acta(self, solicitud):
+        """Renderiza el acta de equivalencias igual que generar_acta_pdf_view."""
+        firma = Path(settings.STATICFILES_DIRS[0]) / "images" / "firma_holografica.png"
+        html_string = render_to_string("equivalencias/acta_template.html", {
+            "solicitud": solicitud,
+            "detalles": solicitud.detallesolicitud_set.all(),
+            "signature_image_path": firma.as_uri(),
+        })
+        with open(os.devnull, "w") as f, redirect_stderr(f):
+            return HTML(string=html_string, base_url=str(settings.BASE_DIR)).write_pdf()
+
+    def benchmark_generador(self, name, generador_func, iterations):
+        """
+        Mide tiempo (sin tracemalloc activo, para no distorsionarlo) y
+        luego memoria pico de Python en una corrida adicional trazada.
+        """
+        times = []
+        output_bytes = 0
+
+        for _ in range(max(iterations, 1)):
+            gc.collect()
+            start = time.perf_counter()
+            resultado = generador_func()
+            end = time.perf_counter()
+
+            times.append((end - start) * 1000)  # Convertir a ms
+            output_bytes = self.tamanio_salida(resultado)
+
+        gc.collect()
+        tracemalloc.start()
+        generador_func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'name': name,
+            'iterations': len(times),
+            'avg_time_ms': sum(times) / len(times),
+            'min_time_ms': min(times),
+            'max_time_ms': max(times),
+            'peak_memory_bytes': peak_memory,
+            'output_bytes': output_bytes,
+        }
+
+    def tamanio_salida(self, resultado):
+        """Tamaño en bytes de un BytesIO o bytes (0 si el generador falló)."""
+        if resultado is None:
+            return 0
+        if isinstance(resultado, io.BytesIO):
+            return resultado.getbuffer().nbytes
+        return len(resultado)
+
+    # ------------------------------------------------------------------
+    # Salida
+    # ------------------------------------------------------------------
+
+    def print_results(self, results):
+        """Imprime los resultados en formato tabla."""
+        self.stdout.write('\n' + '=' * 80)
+        self.stdout.write('RESULTADOS DEL BENCHMARK DE DOCUMENTOS')
+        self.stdout.write('=' * 80 + '\n')
+
+        self.stdout.write(
+            f"{'Generador':<26} {'Tiempo (ms)':>12} {'Memoria pico':>14} {'Salida':>14}"
+        )
+        self.stdout.write('-' * 80)
+
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<26} "
+                f"{result['avg_time_ms']:>12.2f} "
+                f"{result['peak_memory_bytes'] / 1024 / 1024:>11.2f} MB "
+                f"{result['output_bytes'] / 1024:>11.1f} KB"
+            )
+
+        self.stdout.write('=' * 80)
+
+        fallidos = [r for r in results if r['output_bytes'] == 0]
+        if fallidos:
+            self.stdout.write(self.style.WARNING(
+                f'\n⚠️  {len(fallidos)} generadores no produjeron salida:'
+            ))
+            for r in fallidos:
+                self.stdout.write(f'   - {r["name"]}')
+
+    def write_json(self, results, options):
+        """Escribe los resultados en JSON para comparar entre versiones."""
+        payload = {
+            'generated_at': timezone.now().isoformat(),
+            'parameters': {
+                key: options[key]
+                for key in ('formularios', 'paginas', 'escaneos', 'asignaturas', 'iteraciones')
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                # Pico de RSS del proceso completo (KB en Linux)
+                'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            },
+            'results': results,
+        }
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ Resultados guardados en {options['output']}"))
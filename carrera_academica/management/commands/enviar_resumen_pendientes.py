@@ -0,0 +1,43 @@
+# carrera_academica/management/commands/enviar_resumen_pendientes.py
+"""
+Comando para enviar a cada docente un resumen de sus formularios pendientes.
+
+Pensado para ejecutarse todas las noches (cron):
+    python manage.py enviar_resumen_pendientes
+    python manage.py enviar_resumen_pendientes --dias 14 --enviar
+"""
+from django.core.management.base import BaseCommand
+
+from carrera_academica.services.email_service import EmailService
+from notificaciones.services.outbox_service import OutboxService
+
+
+class Command(BaseCommand):
+    help = 'Encola un resumen de formularios pendientes (F02/F04/F05) por docente'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias', type=int, default=None,
+            help='Días mínimos desde el último resumen a un docente '
+                 '(por defecto, RECORDATORIO_INTERVALO_DIAS)')
+        parser.add_argument(
+            '--enviar', action='store_true',
+            help='Enviar la cola inmediatamente en lugar de esperar al worker')
+
+    def handle(self, *args, **options):
+        """Encola los resúmenes y, opcionalmente, procesa la cola."""
+        resultado = EmailService.encolar_resumenes_pendientes(options['dias'])
+
+        for docente in resultado['sin_correo']:
+            self.stdout.write(self.style.ERROR(f'  ✗ {docente}: sin correo principal'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {resultado['encolados']} resúmenes encolados "
+            f"({resultado['omitidos']} docentes ya recordados recientemente)"
+        ))
+
+        if options['enviar'] and resultado['encolados']:
+            envio = OutboxService.procesar_pendientes()
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {envio['enviados']} enviados, {envio['reintentos']} para reintentar"
+            ))
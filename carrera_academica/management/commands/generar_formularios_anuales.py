@@ -0,0 +1,49 @@
+# carrera_academica/management/commands/generar_formularios_anuales.py
+"""
+Comando para generar en lote los formularios anuales de todas las CA activas.
+
+Uso:
+    python manage.py generar_formularios_anuales --anio 2025
+    python manage.py generar_formularios_anuales --anio 2025 --workers 4 --output /tmp/paquetes
+"""
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from carrera_academica.services.paquete_service import PaqueteFormulariosService
+
+
+class Command(BaseCommand):
+    help = 'Genera los formularios dinámicos de un año agrupados en un ZIP por docente'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--anio', type=int, required=True,
+            help='Año correspondiente de los formularios a generar')
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Cantidad de hilos de generación (por defecto, según CPUs)')
+        parser.add_argument(
+            '--output', default=None,
+            help='Directorio de salida (por defecto, MEDIA_ROOT/paquetes_formularios/<anio>)')
+
+    def handle(self, *args, **options):
+        """Genera los paquetes y muestra un resumen."""
+        anio = options['anio']
+        destino = options['output'] or os.path.join(
+            settings.MEDIA_ROOT, 'paquetes_formularios', str(anio))
+
+        self.stdout.write(self.style.WARNING(
+            f'Generando formularios del año {anio} en {destino}...\n'))
+
+        resultado = PaqueteFormulariosService.generar_paquetes(
+            anio, destino, workers=options['workers'])
+
+        for error in resultado['errores']:
+            self.stdout.write(self.style.ERROR(f'  ✗ {error}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ {len(resultado['paquetes'])} paquetes generados "
+            f"({resultado['documentos']} documentos)"
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carrera_academica', '0003_alter_carreraacademica_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='membreteanual',
+            name='logo_optimizado',
+            field=models.ImageField(blank=True, editable=False, help_text='Versión escalada y comprimida del logo para los documentos', upload_to='membretes/logos/optimizados/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carrera_academica', '0004_membreteanual_logo_optimizado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plantilladocumento',
+            name='manifest',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Marcadores y posiciones de la plantilla (se calcula al guardar)'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+
+def llenar_manifest(apps, schema_editor):
+    """
+    Calcula el manifiesto de las plantillas cargadas antes de que existiera.
+
+    Los problemas de validación solo se informan: esas plantillas se siguen
+    generando sin el manifiesto, recorriéndolas como antes.
+    """
+    from carrera_academica.services.document_service import DocumentService
+    from carrera_academica.services.template_manifest import TemplateManifest
+
+    PlantillaDocumento = apps.get_model('carrera_academica', 'PlantillaDocumento')
+
+    for plantilla in PlantillaDocumento.objects.exclude(archivo=''):
+        try:
+            manifest = TemplateManifest.analizar(
+                plantilla.archivo,
+                dinamica=plantilla.tipo_formulario in DocumentService.TIPOS_DINAMICOS,
+            )
+            plantilla.archivo.close()
+        except OSError:
+            # Archivo faltante: sigue sin manifiesto hasta que se vuelva a subir
+            continue
+        if manifest["errores"]:
+            logger.warning(
+                f"Plantilla {plantilla.pk} ({plantilla.tipo_formulario}) con problemas: "
+                f"{'; '.join(manifest['errores'])}")
+        manifest["archivo"] = plantilla.archivo.name
+        plantilla.manifest = manifest
+        plantilla.save(update_fields=['manifest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('carrera_academica', '0005_plantilladocumento_manifest'),
+    ]
+
+    operations = [
+        migrations.RunPython(llenar_manifest, migrations.RunPython.noop),
+    ]
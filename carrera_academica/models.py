@@ -607,6 +607,12 @@ class MembreteAnual(models.Model):
         unique=True, help_text="Año al que corresponde este membrete"
     )
     logo = models.ImageField(upload_to="membretes/logos/")
+    logo_optimizado = models.ImageField(
+        upload_to="membretes/logos/optimizados/",
+        blank=True,
+        editable=False,
+        help_text="Versión escalada y comprimida del logo para los documentos",
+    )
     frase = models.CharField(
         max_length=255, help_text="Frase del encabezado para este año"
     )
@@ -614,6 +620,36 @@ class MembreteAnual(models.Model):
     def __str__(self):
         return f"Membrete para el año {self.anio}"
 
+    def save(self, *args, **kwargs):
+        """Override save para regenerar el logo optimizado si cambió el logo."""
+        # Un logo recién subido todavía no está guardado en el storage
+        logo_nuevo = bool(self.logo) and not self.logo._committed
+        super().save(*args, **kwargs)
+
+        if self.logo and (logo_nuevo or not self.logo_optimizado):
+            self.generar_logo_optimizado()
+
+    def generar_logo_optimizado(self):
+        """Genera y guarda la variante escalada del logo (Pillow)."""
+        from django.conf import settings
+        from django.core.files.base import ContentFile
+        from carrera_academica.services.image_service import ImageService
+
+        alto_px = getattr(settings, "MEMBRETE_LOGO_ALTO_PX", 300)
+        self.logo.open("rb")
+        try:
+            contenido, extension = ImageService.escalar_logo(self.logo, alto_px)
+        finally:
+            self.logo.close()
+
+        if self.logo_optimizado:
+            self.logo_optimizado.delete(save=False)
+
+        nombre = f"{os.path.splitext(os.path.basename(self.logo.name))[0]}.{extension}"
+        self.logo_optimizado.save(nombre, ContentFile(contenido), save=False)
+        MembreteAnual.objects.filter(pk=self.pk).update(
+            logo_optimizado=self.logo_optimizado.name)
+
     class Meta:
         verbose_name = "Membrete Anual"
         verbose_name_plural = "Membretes Anuales"
@@ -632,6 +668,12 @@ class PlantillaDocumento(models.Model):
     tipo_formulario = models.CharField(max_length=4, choices=TIPO_FORMULARIO_CHOICES)
     archivo = models.FileField(upload_to="plantillas_documentos/")
     descripcion = models.CharField(max_length=255, blank=True)
+    manifest = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Marcadores y posiciones de la plantilla (se calcula al guardar)",
+    )
 
     class Meta:
         # Nos aseguramos de que solo haya una plantilla F04 para el 2024, por ejemplo.
@@ -640,3 +682,48 @@ class PlantillaDocumento(models.Model):
 
     def __str__(self):
         return f"Plantilla para {self.tipo_formulario}"
+
+    def clean(self):
+        """Analiza la plantilla y la rechaza si no sirve para generar documentos."""
+        super().clean()
+
+        if not self.archivo:
+            return
+
+        self.actualizar_manifest()
+        self._manifest_validado = True
+        if self.manifest["errores"]:
+            raise ValidationError({'archivo': self.manifest["errores"]})
+
+    def save(self, *args, **kwargs):
+        """Override save para mantener el manifiesto al día con el archivo."""
+        archivo_nuevo = bool(self.archivo) and not self.archivo._committed
+        manifest_viejo = (self.manifest or {}).get("archivo") != self.archivo.name
+        ya_analizado = getattr(self, "_manifest_validado", False)
+
+        if self.archivo and (archivo_nuevo or manifest_viejo) and not ya_analizado:
+            self.actualizar_manifest()
+        self._manifest_validado = False
+
+        super().save(*args, **kwargs)
+
+        # El nombre definitivo del archivo se conoce recién al guardarlo
+        if self.manifest and self.manifest.get("archivo") != self.archivo.name:
+            self.manifest["archivo"] = self.archivo.name
+            PlantillaDocumento.objects.filter(pk=self.pk).update(manifest=self.manifest)
+
+    def actualizar_manifest(self):
+        """Recalcula el manifiesto a partir del archivo actual."""
+        from carrera_academica.services.document_service import DocumentService
+        from carrera_academica.services.template_manifest import TemplateManifest
+
+        try:
+            self.manifest = TemplateManifest.analizar(
+                self.archivo,
+                dinamica=self.tipo_formulario in DocumentService.TIPOS_DINAMICOS,
+            )
+        finally:
+            # Un archivo recién subido queda abierto para guardarlo en el storage
+            if self.archivo._committed:
+                self.archivo.close()
+        self.manifest["archivo"] = self.archivo.name
@@ -0,0 +1,248 @@
+# carrera_academica/services/artifact_cache.py
+"""
+Caché en disco de documentos generados (DOCX/PDF).
+
+Los documentos se guardan bajo MEDIA_ROOT en
+    <DOCUMENT_ARTIFACT_CACHE_DIR>/<espacio>/<objeto_id>/<clave>.<ext>
+
+La clave se calcula a partir de todo lo que define el contenido (datos de
+los modelos involucrados, versión de la plantilla, etc.), así que una
+entrada nunca queda desactualizada: si algo cambia, cambia la clave. Al
+guardar una versión nueva se borran las anteriores del mismo objeto, y
+cuando el total supera DOCUMENT_ARTIFACT_CACHE_BYTES se eliminan los
+archivos usados hace más tiempo (LRU por fecha de modificación, que se
+actualiza en cada acierto).
+
+El total ocupado se lleva en memoria y se ajusta en cada escritura; el
+árbol de la caché solo se recorre al desalojar y cada OCUPACION_SEGUNDOS,
+para sumar lo que escribieron otros procesos.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Vigencia del total ocupado que lleva cada proceso antes de volver a medirlo
+OCUPACION_SEGUNDOS = 300
+
+
+class ArtifactCache:
+    """Caché de documentos generados con presupuesto de bytes y LRU."""
+
+    _lock = threading.Lock()
+    _contadores = {"aciertos": 0, "fallos": 0, "desalojos": 0}
+    # raíz de la caché -> [bytes ocupados, momento de la medición]
+    _ocupacion = {}
+
+    @staticmethod
+    def clave(*partes) -> str:
+        """Calcula una clave estable a partir de las entradas del documento."""
+        h = hashlib.sha256()
+        for parte in partes:
+            if isinstance(parte, bytes):
+                h.update(parte)
+            else:
+                h.update(repr(parte).encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    @classmethod
+    def obtener(cls, espacio: str, objeto_id, clave: str, extension: str) -> Optional[bytes]:
+        """Devuelve el documento cacheado o None (y cuenta acierto/fallo)."""
+        ruta = cls._ruta(espacio, objeto_id, clave, extension)
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            # Marca el archivo como usado recientemente (LRU)
+            os.utime(ruta)
+        except OSError:
+            cls._contar("fallos")
+            return None
+
+        cls._contar("aciertos")
+        return contenido
+
+    @classmethod
+    def guardar(cls, espacio: str, objeto_id, clave: str, extension: str, contenido: bytes):
+        """Guarda un documento, reemplazando versiones anteriores del objeto."""
+        directorio = cls._directorio(espacio, objeto_id)
+        ruta = cls._ruta(espacio, objeto_id, clave, extension)
+
+        liberados = 0
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            for entrada in os.scandir(directorio):
+                if entrada.name.endswith(".tmp"):
+                    continue
+                # Las versiones anteriores se borran; la misma clave se reemplaza
+                liberados += entrada.stat().st_size
+                if entrada.path != ruta:
+                    os.remove(entrada.path)
+
+            temporal = f"{ruta}.{threading.get_ident()}.tmp"
+            with open(temporal, "wb") as f:
+                f.write(contenido)
+            os.replace(temporal, ruta)
+        except OSError as e:
+            logger.warning(f"No se pudo cachear {espacio}/{objeto_id}: {e}")
+            cls._olvidar_ocupacion()
+            return
+
+        if cls._sumar_ocupacion(len(contenido) - liberados) > cls._max_bytes():
+            cls._desalojar()
+
+    @classmethod
+    def obtener_o_generar(cls, espacio: str, objeto_id, clave: str, extension: str,
+                          generar: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        """
+        Devuelve el documento cacheado o lo genera con `generar()` y lo guarda.
+
+        Si `generar()` devuelve None (error) no se cachea nada.
+        """
+        contenido = cls.obtener(espacio, objeto_id, clave, extension)
+        if contenido is not None:
+            return contenido
+
+        contenido = generar()
+        if contenido is not None:
+            cls.guardar(espacio, objeto_id, clave, extension, contenido)
+        return contenido
+
+    @classmethod
+    def invalidar(cls, espacio: Optional[str] = None, objeto_id=None) -> int:
+        """
+        Elimina documentos cacheados.
+
+        Sin argumentos borra toda la caché; con `espacio`, todos los de ese
+        tipo; con `espacio` y `objeto_id`, solo los de ese objeto.
+        Devuelve la cantidad de archivos eliminados.
+        """
+        if espacio is None:
+            directorio = cls._raiz()
+        elif objeto_id is None:
+            directorio = os.path.join(cls._raiz(), espacio)
+        else:
+            directorio = cls._directorio(espacio, objeto_id)
+
+        if not os.path.isdir(directorio):
+            return 0
+
+        eliminados = sum(len(archivos) for _, _, archivos in os.walk(directorio))
+        shutil.rmtree(directorio, ignore_errors=True)
+        cls._olvidar_ocupacion()
+        return eliminados
+
+    @classmethod
+    def estadisticas(cls) -> dict:
+        """Contadores del proceso y ocupación actual en disco."""
+        archivos = cls._listar_archivos()
+        with cls._lock:
+            contadores = dict(cls._contadores)
+        total = contadores["aciertos"] + contadores["fallos"]
+        contadores.update({
+            "tasa_aciertos": round(contadores["aciertos"] / total, 3) if total else 0.0,
+            "archivos": len(archivos),
+            "bytes": sum(tamanio for _, _, tamanio in archivos),
+            "max_bytes": cls._max_bytes(),
+        })
+        return contadores
+
+    @classmethod
+    def reiniciar_contadores(cls):
+        """Pone en cero los contadores de aciertos, fallos y desalojos."""
+        with cls._lock:
+            for nombre in cls._contadores:
+                cls._contadores[nombre] = 0
+
+    @classmethod
+    def _desalojar(cls):
+        """Elimina los archivos menos usados hasta respetar el presupuesto."""
+        max_bytes = cls._max_bytes()
+        archivos = cls._listar_archivos()
+        total = sum(tamanio for _, _, tamanio in archivos)
+
+        if total > max_bytes:
+            for ruta, _, tamanio in sorted(archivos, key=lambda a: a[1]):
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    continue
+                total -= tamanio
+                cls._contar("desalojos")
+                logger.debug(f"Documento desalojado de la caché: {ruta}")
+
+        with cls._lock:
+            cls._ocupacion[cls._raiz()] = [total, time.monotonic()]
+
+    @classmethod
+    def _sumar_ocupacion(cls, delta: int) -> int:
+        """
+        Ajusta el total ocupado en `delta` bytes y lo devuelve. Si no se
+        conoce o venció (OCUPACION_SEGUNDOS) se vuelve a medir en disco.
+        """
+        raiz = cls._raiz()
+        with cls._lock:
+            medida = cls._ocupacion.get(raiz)
+            if medida is not None and time.monotonic() - medida[1] <= OCUPACION_SEGUNDOS:
+                medida[0] += delta
+                return medida[0]
+
+        total = sum(tamanio for _, _, tamanio in cls._listar_archivos())
+        with cls._lock:
+            cls._ocupacion[raiz] = [total, time.monotonic()]
+        return total
+
+    @classmethod
+    def _olvidar_ocupacion(cls):
+        """Descarta el total ocupado: la próxima escritura lo vuelve a medir."""
+        with cls._lock:
+            cls._ocupacion.pop(cls._raiz(), None)
+
+    @classmethod
+    def _listar_archivos(cls):
+        """Lista (ruta, mtime, tamaño) de todos los archivos cacheados."""
+        archivos = []
+        for raiz, _, nombres in os.walk(cls._raiz()):
+            for nombre in nombres:
+                if nombre.endswith(".tmp"):
+                    continue
+                ruta = os.path.join(raiz, nombre)
+                try:
+                    stat = os.stat(ruta)
+                except OSError:
+                    continue
+                archivos.append((ruta, stat.st_mtime, stat.st_size))
+        return archivos
+
+    @classmethod
+    def _contar(cls, nombre: str):
+        with cls._lock:
+            cls._contadores[nombre] += 1
+
+    @staticmethod
+    def _raiz() -> str:
+        return os.path.join(
+            settings.MEDIA_ROOT,
+            getattr(settings, "DOCUMENT_ARTIFACT_CACHE_DIR", "cache_documentos"),
+        )
+
+    @staticmethod
+    def _max_bytes() -> int:
+        return getattr(settings, "DOCUMENT_ARTIFACT_CACHE_BYTES", 256 * 1024 * 1024)
+
+    @classmethod
+    def _directorio(cls, espacio: str, objeto_id) -> str:
+        return os.path.join(cls._raiz(), espacio, str(objeto_id))
+
+    @classmethod
+    def _ruta(cls, espacio: str, objeto_id, clave: str, extension: str) -> str:
+        return os.path.join(cls._directorio(espacio, objeto_id), f"{clave}.{extension}")
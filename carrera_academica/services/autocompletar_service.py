@@ -0,0 +1,78 @@
+# carrera_academica/services/autocompletar_service.py
+"""
+Búsqueda por prefijo para los selectores con autocompletado.
+
+Cada endpoint (estudiantes, docentes, ...) define un "espacio" y una
+función de consulta que filtra por prefijo sobre columnas indexadas (con
+un rango, ver `rango_prefijo`) y devuelve a lo sumo `limite` filas. Los resultados se guardan en la caché
+de Django por unos segundos, así las teclas sucesivas de un mismo texto
+(o el mismo texto desde otra pestaña) no vuelven a consultar la base.
+Al modificar los datos de un espacio se llama a `invalidar`.
+"""
+import hashlib
+import time
+from typing import Callable, List
+
+from django.core.cache import cache
+
+MIN_CARACTERES = 2
+MAX_RESULTADOS = 20
+TTL_SEGUNDOS = 60
+
+
+class AutocompletarService:
+    """Búsquedas por prefijo limitadas y cacheadas."""
+
+    @staticmethod
+    def normalizar(texto: str) -> str:
+        """Prefijo en mayúsculas y con los espacios colapsados."""
+        return " ".join((texto or "").split()).upper()
+
+    @staticmethod
+    def rango_prefijo(prefijo: str) -> tuple:
+        """
+        Límites (desde, hasta) de las cadenas que empiezan con `prefijo`.
+
+        `columna >= desde AND columna < hasta` se resuelve con un rango del
+        índice de la columna, a diferencia de LIKE 'prefijo%'.
+        """
+        return prefijo, prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+
+    @staticmethod
+    def buscar(
+        espacio: str,
+        texto: str,
+        consulta: Callable[[str, int], List[dict]],
+        limite: int = 10,
+    ) -> List[dict]:
+        """
+        Devuelve las filas que empiezan con `texto`.
+
+        Args:
+            espacio: Nombre del conjunto de datos (ej: "estudiantes")
+            texto: Lo que escribió el usuario
+            consulta: Función (prefijo en mayúsculas, límite) -> lista de dicts
+            limite: Cantidad máxima de resultados (hasta MAX_RESULTADOS)
+
+        Returns:
+            list: Resultados; vacía si el texto tiene menos de MIN_CARACTERES
+        """
+        prefijo = AutocompletarService.normalizar(texto)
+        if len(prefijo) < MIN_CARACTERES:
+            return []
+        limite = max(1, min(limite, MAX_RESULTADOS))
+
+        version = cache.get_or_set(f"autocompletar:{espacio}:version", 1, None)
+        digest = hashlib.md5(prefijo.encode()).hexdigest()
+        clave = f"autocompletar:{espacio}:{version}:{limite}:{digest}"
+
+        resultados = cache.get(clave)
+        if resultados is None:
+            resultados = consulta(prefijo, limite)
+            cache.set(clave, resultados, TTL_SEGUNDOS)
+        return resultados
+
+    @staticmethod
+    def invalidar(espacio: str):
+        """Descarta los resultados cacheados de un espacio (cambia su versión)."""
+        cache.set(f"autocompletar:{espacio}:version", time.time_ns(), None)
@@ -4,22 +4,42 @@ Servicio para generación de documentos dinámicos (Word).
 """
 import io
 import logging
+import os
+import threading
+import time
 from typing import Optional, Tuple
 from datetime import date
 
 from docx import Document
 from docx.shared import Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from django.conf import settings
 from django.utils.text import slugify
 
 from carrera_academica.models import Formulario, PlantillaDocumento, MembreteAnual
+from carrera_academica.services.artifact_cache import ArtifactCache
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+from carrera_academica.services.template_cache import TemplateCache
+from carrera_academica.services.template_manifest import TemplateManifest
 
 logger = logging.getLogger(__name__)
 
+ESPACIO_FORMULARIOS = "formularios"
+
 
 class DocumentService:
     """Servicio para generación de documentos Word dinámicos."""
 
+    # Formularios que se generan a partir de una plantilla con marcadores
+    TIPOS_DINAMICOS = ["F06", "F07", "F13", "ENC", "F04", "F05"]
+
+    # Caché de (tipo_formulario, año) -> (expira, plantilla, membrete)
+    _recursos_cache = {}
+    _recursos_lock = threading.Lock()
+
+    # Caché de nombre del logo optimizado -> bytes de la imagen
+    _logos_cache = {}
+
     @staticmethod
     def generar_documento_dinamico(formulario: Formulario) -> Tuple[Optional[io.BytesIO], Optional[str]]:
         """
@@ -31,15 +51,10 @@ class DocumentService:
         Returns:
             tuple: (BytesIO con el documento, nombre del archivo) o (None, None)
         """
-        ca = formulario.carrera_academica
-
-        plantilla_maestra = PlantillaDocumento.objects.filter(
-            tipo_formulario=formulario.tipo_formulario
-        ).first()
-
-        membrete = MembreteAnual.objects.filter(
-            anio=formulario.anio_correspondiente
-        ).first()
+        plantilla_maestra, membrete = DocumentService._obtener_recursos(
+            formulario.tipo_formulario,
+            formulario.anio_correspondiente
+        )
 
         if not plantilla_maestra or not membrete:
             logger.warning(
@@ -48,36 +63,138 @@ class DocumentService:
             )
             return None, None
 
-        try:
-            doc = Document(plantilla_maestra.archivo.path)
-
-            # Reemplazar datos del cuerpo
-            contexto = DocumentService._preparar_contexto_reemplazo(
-                formulario, ca)
-            DocumentService._reemplazar_texto_documento(doc, contexto)
-
-            # Reemplazar datos del encabezado
-            DocumentService._reemplazar_encabezado(doc, membrete)
-
-            # Guardar en memoria
-            buffer = io.BytesIO()
-            doc.save(buffer)
-            buffer.seek(0)
+        # Las plantillas nuevas se validan en PlantillaDocumento.clean(); una
+        # ya cargada con problemas se sigue generando sin el manifiesto
+        # (recorriendo la plantilla), como antes de que existiera
+        errores_plantilla = (plantilla_maestra.manifest or {}).get("errores")
+        if errores_plantilla:
+            logger.warning(
+                f"Plantilla {plantilla_maestra.pk} con problemas para formulario "
+                f"{formulario.pk}: {'; '.join(errores_plantilla)}"
+            )
 
-            filename = (
-                f"{formulario.tipo_formulario}_{formulario.anio_correspondiente}_"
-                f"{slugify(ca.cargo.docente)}.docx"
+        try:
+            clave = DocumentService._clave_documento(
+                formulario, plantilla_maestra, membrete)
+            contenido = ArtifactCache.obtener_o_generar(
+                ESPACIO_FORMULARIOS, formulario.pk, clave, "docx",
+                lambda: DocumentService.renderizar(
+                    formulario, plantilla_maestra, membrete)[0].getvalue(),
             )
 
             logger.info(
                 f"Documento generado exitosamente para formulario {formulario.pk}")
-            return buffer, filename
+            return io.BytesIO(contenido), DocumentService._nombre_archivo(formulario)
 
         except Exception as e:
             logger.error(
                 f"Error generando documento para formulario {formulario.pk}: {e}")
             return None, None
 
+    @staticmethod
+    def renderizar(formulario: Formulario, plantilla: PlantillaDocumento,
+                   membrete: MembreteAnual) -> Tuple[io.BytesIO, str]:
+        """
+        Genera el documento a partir de recursos ya resueltos.
+
+        No consulta la base de datos si el formulario trae cargados
+        carrera_academica, cargo, docente y asignatura, por lo que puede
+        ejecutarse en hilos de trabajo.
+        """
+        ca = formulario.carrera_academica
+
+        # Con el manifiesto de la plantilla no hace falta buscar marcadores
+        manifest = TemplateManifest.vigente(plantilla)
+        doc, indice = TemplateCache.obtener_con_indice(
+            plantilla.archivo.path, manifest["indice"] if manifest else None)
+
+        # Reemplazar datos del cuerpo, tablas, encabezados y pies
+        contexto = DocumentService._preparar_contexto_reemplazo(formulario, ca)
+        DocumentService._reemplazar_texto_documento(doc, contexto, indice)
+
+        # Reemplazar datos del encabezado
+        DocumentService._reemplazar_encabezado(
+            doc, membrete, manifest["encabezado"] if manifest else None)
+
+        # Guardar en memoria
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+
+        return buffer, DocumentService._nombre_archivo(formulario)
+
+    @staticmethod
+    def invalidar_documentos(formulario_pk=None) -> int:
+        """Descarta los documentos cacheados de un formulario (o todos)."""
+        return ArtifactCache.invalidar(ESPACIO_FORMULARIOS, formulario_pk)
+
+    @staticmethod
+    def _nombre_archivo(formulario: Formulario) -> str:
+        """Nombre de descarga del documento de un formulario."""
+        return (
+            f"{formulario.tipo_formulario}_{formulario.anio_correspondiente}_"
+            f"{slugify(formulario.carrera_academica.cargo.docente)}.docx"
+        )
+
+    @staticmethod
+    def _clave_documento(formulario: Formulario, plantilla: PlantillaDocumento,
+                         membrete: MembreteAnual) -> str:
+        """
+        Clave de caché: versión de la plantilla, del membrete y los datos
+        que se reemplazan en el documento.
+        """
+        contexto = DocumentService._preparar_contexto_reemplazo(
+            formulario, formulario.carrera_academica)
+        return ArtifactCache.clave(
+            plantilla.archivo.name,
+            os.path.getmtime(plantilla.archivo.path),
+            membrete.anio,
+            membrete.frase,
+            membrete.logo.name,
+            getattr(settings, "MEMBRETE_LOGO_ALTO_PX", 300),
+            sorted(contexto.items()),
+        )
+
+    @staticmethod
+    def invalidar_cache_recursos():
+        """
+        Descarta las plantillas/membretes cacheados y los documentos generados
+        con ellos (se llama desde signals).
+        """
+        with DocumentService._recursos_lock:
+            DocumentService._recursos_cache.clear()
+            DocumentService._logos_cache.clear()
+        DocumentService.invalidar_documentos()
+
+    @staticmethod
+    def _obtener_recursos(tipo_formulario: str, anio: Optional[int]):
+        """
+        Obtiene (plantilla, membrete) para un tipo y año, cacheado en proceso.
+
+        Se invalida por signals al guardar plantillas o membretes; el TTL
+        cubre los cambios hechos desde otros procesos.
+        """
+        clave = (tipo_formulario, anio)
+        ahora = time.monotonic()
+
+        with DocumentService._recursos_lock:
+            entrada = DocumentService._recursos_cache.get(clave)
+            if entrada and entrada[0] > ahora:
+                return entrada[1], entrada[2]
+
+        plantilla = PlantillaDocumento.objects.filter(
+            tipo_formulario=tipo_formulario
+        ).first()
+
+        membrete = MembreteAnual.objects.filter(anio=anio).first()
+
+        ttl = getattr(settings, "DOCUMENT_RESOURCES_CACHE_TTL", 300)
+        with DocumentService._recursos_lock:
+            DocumentService._recursos_cache[clave] = (
+                ahora + ttl, plantilla, membrete)
+
+        return plantilla, membrete
+
     @staticmethod
     def _preparar_contexto_reemplazo(formulario: Formulario, ca) -> dict:
         """Prepara el diccionario de reemplazos para el documento."""
@@ -92,29 +209,52 @@ class DocumentService:
         }
 
     @staticmethod
-    def _reemplazar_texto_documento(doc: Document, replacements: dict):
-        """Reemplaza texto en párrafos y tablas del documento."""
-        # Párrafos del cuerpo
-        for p in doc.paragraphs:
-            for run in p.runs:
-                for old_text, new_text in replacements.items():
-                    if old_text in run.text:
-                        run.text = run.text.replace(old_text, new_text)
-
-        # Tablas del cuerpo
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for p in cell.paragraphs:
-                        for run in p.runs:
-                            for old_text, new_text in replacements.items():
-                                if old_text in run.text:
-                                    run.text = run.text.replace(
-                                        old_text, new_text)
+    def _reemplazar_texto_documento(doc: Document, replacements: dict, indice: Optional[list] = None):
+        """
+        Reemplaza los marcadores del documento en una sola pasada.
+
+        Si se recibe el índice precalculado de la plantilla no se recorre
+        el documento buscando marcadores.
+        """
+        if indice is None:
+            indice = PlaceholderEngine.indexar(doc)
+        PlaceholderEngine.aplicar(doc, indice, replacements)
+
+    @staticmethod
+    def _obtener_logo(membrete: MembreteAnual):
+        """
+        Devuelve el logo a embeber: los bytes del logo optimizado (cacheados
+        en proceso) o, si no se puede generar, la ruta del logo original.
+        """
+        if not membrete.logo_optimizado:
+            try:
+                membrete.generar_logo_optimizado()
+            except Exception as e:
+                logger.warning(
+                    f"No se pudo optimizar el logo del membrete {membrete.anio}: {e}")
+                return membrete.logo.path
+
+        nombre = membrete.logo_optimizado.name
+        with DocumentService._recursos_lock:
+            contenido = DocumentService._logos_cache.get(nombre)
+
+        if contenido is None:
+            with membrete.logo_optimizado.open("rb") as archivo:
+                contenido = archivo.read()
+            with DocumentService._recursos_lock:
+                DocumentService._logos_cache[nombre] = contenido
+
+        return io.BytesIO(contenido)
 
     @staticmethod
-    def _reemplazar_encabezado(doc: Document, membrete: MembreteAnual):
-        """Reemplaza el encabezado del documento con logo y frase."""
+    def _reemplazar_encabezado(doc: Document, membrete: MembreteAnual,
+                               encabezado: Optional[dict] = None):
+        """
+        Reemplaza el encabezado del documento con logo y frase.
+
+        Si se recibe la sección "encabezado" del manifiesto se va directo a
+        los párrafos del logo y la frase; si no, se buscan en la tabla.
+        """
         header = doc.sections[0].header
 
         if not header.tables:
@@ -123,16 +263,27 @@ class DocumentService:
 
         table = header.tables[0]
 
-        # Celda del logo (columna 0)
-        cell_logo = table.cell(0, 0)
-        for p in cell_logo.paragraphs:
+        if encabezado:
+            parrafos_logo = [DocumentService._parrafo_en(table, encabezado["logo"])]
+            parrafos_frase = [DocumentService._parrafo_en(table, encabezado["frase"])]
+        else:
+            # Celda del logo (columna 0) y de la frase (columna 1)
+            parrafos_logo = table.cell(0, 0).paragraphs
+            parrafos_frase = table.cell(0, 1).paragraphs
+
+        for p in parrafos_logo:
             if "[LOGO_ANUAL]" in p.text:
                 p.text = ""
-                p.add_run().add_picture(membrete.logo.path, height=Inches(1.5))
+                p.add_run().add_picture(
+                    DocumentService._obtener_logo(membrete), height=Inches(1.5))
 
-        # Celda de la frase (columna 1)
-        cell_frase = table.cell(0, 1)
-        for p in cell_frase.paragraphs:
+        for p in parrafos_frase:
             if "[FRASE_ANUAL]" in p.text:
                 p.text = p.text.replace("[FRASE_ANUAL]", membrete.frase)
                 p.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+    @staticmethod
+    def _parrafo_en(table, posicion: list):
+        """Párrafo de la tabla en la posición [fila, columna, párrafo]."""
+        fila, columna, parrafo = posicion
+        return table.cell(fila, columna).paragraphs[parrafo]
@@ -0,0 +1,132 @@
+# carrera_academica/services/documentacion_service.py
+"""
+Servicio para entregar la documentación de una evaluación a la junta.
+
+Si los formularios entregados superan `JUNTA_ADJUNTOS_MAX_BYTES` no se
+adjuntan uno por uno: según `JUNTA_ADJUNTOS_MODO` se envía un único PDF
+consolidado o un enlace firmado, con vencimiento, a un ZIP servido por la
+aplicación (vista `documentacion_junta_view`).
+"""
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import slugify
+from pypdf import PdfWriter
+
+from carrera_academica.models import Evaluacion, Formulario
+
+logger = logging.getLogger(__name__)
+
+SALT_ENLACE = "carrera_academica.documentacion_junta"
+
+
+class DocumentacionJuntaService:
+    """Tamaño, consolidación y enlaces de descarga de la documentación."""
+
+    @staticmethod
+    def tamanio_total(documentos: List[Formulario]) -> int:
+        """Suma el tamaño de los archivos según el sistema de archivos (sin leerlos)."""
+        total = 0
+        for doc in documentos:
+            try:
+                total += doc.archivo.size
+            except (OSError, ValueError) as e:
+                logger.warning(f"No se pudo obtener el tamaño de {doc.archivo.name}: {e}")
+        return total
+
+    @staticmethod
+    def supera_limite(documentos: List[Formulario]) -> bool:
+        """Si los adjuntos exceden el máximo configurado para un correo."""
+        return DocumentacionJuntaService.tamanio_total(documentos) > settings.JUNTA_ADJUNTOS_MAX_BYTES
+
+    @staticmethod
+    def consolidar_pdf(evaluacion: Evaluacion, documentos: List[Formulario]) -> Optional[str]:
+        """
+        Une los documentos en un único PDF guardado en JUNTA_DOCUMENTACION_DIR,
+        fuera de MEDIA_ROOT: solo se entrega como adjunto del correo.
+
+        Returns:
+            str: Ruta del PDF, o None si hay documentos que no son PDF, si
+                falla la unión o si el resultado sigue superando el límite
+        """
+        if any(not doc.archivo.name.lower().endswith(".pdf") for doc in documentos):
+            return None
+
+        ruta = os.path.join(settings.JUNTA_DOCUMENTACION_DIR, f"evaluacion_{evaluacion.pk}.pdf")
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+        writer = PdfWriter()
+        try:
+            for doc in documentos:
+                writer.append(doc.archivo.path)
+            writer.compress_identical_objects()
+            with open(f"{ruta}.tmp", "wb") as f:
+                writer.write(f)
+            os.replace(f"{ruta}.tmp", ruta)
+        except Exception as e:
+            logger.warning(f"No se pudo consolidar la documentación de evaluación {evaluacion.pk}: {e}")
+            return None
+        finally:
+            writer.close()
+
+        if os.path.getsize(ruta) > settings.JUNTA_ADJUNTOS_MAX_BYTES:
+            os.remove(ruta)
+            return None
+
+        return ruta
+
+    @staticmethod
+    def generar_enlace(evaluacion: Evaluacion, base_url: str) -> tuple[str, datetime]:
+        """
+        Genera el enlace firmado de descarga de la documentación.
+
+        Args:
+            evaluacion: Evaluación cuya documentación se comparte
+            base_url: URL del sitio (ej: request.build_absolute_uri("/"))
+
+        Returns:
+            tuple: (URL absoluta, fecha de vencimiento)
+        """
+        token = signing.dumps({"evaluacion": evaluacion.pk}, salt=SALT_ENLACE, compress=True)
+        url = base_url.rstrip("/") + reverse("documentacion_junta", args=[token])
+        vence = timezone.now() + timedelta(days=settings.JUNTA_ENLACE_DIAS)
+        return url, vence
+
+    @staticmethod
+    def leer_enlace(token: str) -> int:
+        """
+        Valida el token de un enlace y devuelve el pk de la evaluación.
+
+        Raises:
+            signing.SignatureExpired: Si el enlace venció
+            signing.BadSignature: Si el token fue alterado
+        """
+        datos = signing.loads(
+            token, salt=SALT_ENLACE, max_age=timedelta(days=settings.JUNTA_ENLACE_DIAS))
+        return datos["evaluacion"]
+
+    @staticmethod
+    def generar_zip(documentos: List[Formulario]):
+        """
+        ZIP con los documentos, nombrados por tipo y año.
+
+        Se arma en un archivo temporal (en memoria solo si es chico), ya que
+        se usa justamente cuando la documentación es pesada. Los PDF y
+        escaneos ya vienen comprimidos, así que se guardan sin comprimir.
+        """
+        buffer = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+            for doc in documentos:
+                extension = os.path.splitext(doc.archivo.name)[1]
+                nombre = slugify(f"{doc.tipo_formulario} {doc.anio_correspondiente or ''}")
+                zf.write(doc.archivo.path, f"{nombre}_{doc.pk}{extension}")
+        buffer.seek(0)
+        return buffer
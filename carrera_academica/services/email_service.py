@@ -1,11 +1,19 @@
 # carrera_academica/services/email_service.py
 """
 Servicio para manejo de envío de emails relacionados con Carrera Académica.
+
+Los correos no se envían durante la request: se encolan en la bandeja de
+salida (notificaciones) y los entrega el comando `procesar_correos`.
 """
 import logging
+from collections import OrderedDict
+from datetime import timedelta
 from typing import List, Optional
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Prefetch, Q
+from django.utils import timezone
 
 from carrera_academica.models import (
     CarreraAcademica,
@@ -14,7 +22,10 @@ from carrera_academica.models import (
     JuntaEvaluadora,
     MiembroExterno
 )
-from planta_docente.models import Docente
+from carrera_academica.services.documentacion_service import DocumentacionJuntaService
+from notificaciones.models import CorreoSaliente
+from notificaciones.services.outbox_service import OutboxService
+from planta_docente.models import Correo, Docente
 
 logger = logging.getLogger(__name__)
 
@@ -22,29 +33,41 @@ logger = logging.getLogger(__name__)
 class EmailService:
     """Servicio centralizado para envío de emails de Carrera Académica."""
 
+    # Formularios que se recuerdan al docente
+    TIPOS_RECORDATORIO = ["F02", "F04", "F05"]
+
     @staticmethod
-    def enviar_notificacion_junta(evaluacion: Evaluacion) -> tuple[int, List[str]]:
+    def enviar_notificacion_junta(
+        evaluacion: Evaluacion, base_url: str = "", omitir_notificados: bool = False
+    ) -> tuple[int, int, List[str]]:
         """
-        Envía notificación a todos los miembros activos de la junta evaluadora.
+        Encola la notificación a todos los miembros activos de la junta evaluadora.
+
+        Si la documentación supera JUNTA_ADJUNTOS_MAX_BYTES se envía un PDF
+        consolidado o un enlace de descarga en lugar de los adjuntos.
 
         Args:
             evaluacion: Instancia de Evaluacion
+            base_url: URL del sitio, para armar el enlace de descarga
+            omitir_notificados: No repetir el correo a quienes ya lo
+                recibieron (o lo tienen en cola) para esta evaluación; solo
+                para reenvíos, una nueva convocatoria va a todos
 
         Returns:
-            tuple: (cantidad_enviados, lista_errores)
+            tuple: (cantidad_encolados, cantidad_omitidos, lista_errores)
         """
         junta = getattr(evaluacion.carrera_academica, "junta_evaluadora", None)
 
         if not junta:
             logger.error(f"Evaluación {evaluacion.pk} no tiene junta asignada")
-            return 0, ["No hay junta evaluadora asignada"]
+            return 0, 0, ["No hay junta evaluadora asignada"]
 
         miembros = EmailService._obtener_miembros_activos(junta)
 
         if not miembros:
             logger.warning(
                 f"No hay miembros activos en junta de evaluación {evaluacion.pk}")
-            return 0, ["No hay miembros activos en la junta"]
+            return 0, 0, ["No hay miembros activos en la junta"]
 
         documentos = EmailService._obtener_documentos_pertinentes(
             evaluacion.carrera_academica,
@@ -54,9 +77,19 @@ class EmailService:
         if not documentos:
             logger.warning(
                 f"No hay documentos para enviar en evaluación {evaluacion.pk}")
-            return 0, ["No hay documentos entregados para enviar"]
+            return 0, 0, ["No hay documentos entregados para enviar"]
+
+        # La documentación se resuelve una vez para todos los miembros
+        rutas, enlace = EmailService._preparar_documentacion(
+            evaluacion, documentos, base_url)
+
+        notificados = (
+            OutboxService.destinatarios_notificados(evaluacion)
+            if omitir_notificados else set()
+        )
 
         emails_enviados = 0
+        omitidos = 0
         errores = []
 
         for miembro in miembros:
@@ -64,26 +97,29 @@ class EmailService:
                 email_destinatario = EmailService._obtener_email_miembro(
                     miembro)
 
-                if email_destinatario:
-                    EmailService._enviar_email_individual(
+                if email_destinatario in notificados:
+                    omitidos += 1
+                elif email_destinatario:
+                    EmailService._encolar_email_individual(
                         destinatario=email_destinatario,
                         evaluacion=evaluacion,
-                        documentos=documentos
+                        rutas=rutas,
+                        enlace=enlace,
                     )
                     emails_enviados += 1
                 else:
                     errores.append(f"No se encontró email para {miembro}")
 
             except Exception as e:
-                logger.error(f"Error enviando email a {miembro}: {e}")
+                logger.error(f"Error encolando email a {miembro}: {e}")
                 errores.append(f"Error con {miembro}: {str(e)}")
 
-        return emails_enviados, errores
+        return emails_enviados, omitidos, errores
 
     @staticmethod
     def enviar_recordatorio_formularios_pendientes(ca: CarreraAcademica) -> tuple[bool, str]:
         """
-        Envía recordatorio de formularios pendientes al docente.
+        Encola el recordatorio de formularios pendientes al docente.
 
         Args:
             ca: Instancia de CarreraAcademica
@@ -97,30 +133,154 @@ class EmailService:
         if not correo_principal:
             return False, f"El docente {docente} no tiene correo principal"
 
-        tipos_a_notificar = ["F02", "F04", "F05"]
         formularios_pendientes = Formulario.objects.filter(
             carrera_academica=ca,
             estado="PEN",
-            tipo_formulario__in=tipos_a_notificar
+            tipo_formulario__in=EmailService.TIPOS_RECORDATORIO
         )
 
         if not formularios_pendientes.exists():
             return False, "No hay formularios pendientes para notificar"
 
         try:
-            email = EmailService._preparar_email_recordatorio(
+            EmailService._encolar_email_recordatorio(
                 ca,
                 correo_principal.email,
                 formularios_pendientes
             )
-            email.send()
 
-            logger.info(f"Recordatorio enviado a {docente} para CA {ca.pk}")
-            return True, f"Correo enviado exitosamente a {correo_principal.email}"
+            logger.info(f"Recordatorio encolado para {docente} (CA {ca.pk})")
+            return True, f"Correo a {correo_principal.email} encolado para envío"
 
         except Exception as e:
-            logger.error(f"Error enviando recordatorio para CA {ca.pk}: {e}")
-            return False, f"Error al enviar: {str(e)}"
+            logger.error(f"Error encolando recordatorio para CA {ca.pk}: {e}")
+            return False, f"Error al encolar el correo: {str(e)}"
+
+    @staticmethod
+    def encolar_resumenes_pendientes(intervalo_dias: Optional[int] = None) -> dict:
+        """
+        Encola un único recordatorio por docente con todos sus formularios
+        pendientes (F02/F04/F05) de las CA activas.
+
+        Se consideran los formularios generales y los anuales hasta el año
+        en curso. No se vuelve a recordar a un docente que recibió un resumen
+        hace menos de `intervalo_dias` (por defecto, RECORDATORIO_INTERVALO_DIAS).
+
+        Returns:
+            dict: {'encolados': int, 'omitidos': int, 'sin_correo': [docentes]}
+        """
+        intervalo_dias = (
+            settings.RECORDATORIO_INTERVALO_DIAS if intervalo_dias is None else intervalo_dias
+        )
+        resultado = {"encolados": 0, "omitidos": 0, "sin_correo": []}
+
+        # Una sola consulta para todos los pendientes (+1 para los correos)
+        pendientes = (
+            Formulario.objects.filter(
+                estado="PEN",
+                tipo_formulario__in=EmailService.TIPOS_RECORDATORIO,
+                carrera_academica__estado="ACT",
+            )
+            .filter(
+                Q(anio_correspondiente__isnull=True)
+                | Q(anio_correspondiente__lte=timezone.localdate().year)
+            )
+            .select_related(
+                "carrera_academica__cargo__docente",
+                "carrera_academica__cargo__asignatura",
+            )
+            .prefetch_related(Prefetch(
+                "carrera_academica__cargo__docente__correos",
+                queryset=Correo.objects.filter(principal=True),
+                to_attr="correos_principales",
+            ))
+            .order_by(
+                "carrera_academica__cargo__docente__apellido",
+                "carrera_academica__cargo__docente__nombre",
+                "carrera_academica_id",
+                "tipo_formulario",
+                "anio_correspondiente",
+            )
+        )
+
+        por_docente = OrderedDict()
+        for formulario in pendientes:
+            docente = formulario.carrera_academica.cargo.docente
+            cas = por_docente.setdefault(docente.pk, (docente, OrderedDict()))[1]
+            cas.setdefault(formulario.carrera_academica, []).append(formulario)
+
+        if not por_docente:
+            return resultado
+
+        recordados = EmailService._docentes_recordados_desde(
+            timezone.now() - timedelta(days=intervalo_dias))
+
+        for docente, formularios_por_ca in por_docente.values():
+            if docente.pk in recordados:
+                resultado["omitidos"] += 1
+                continue
+
+            correos = docente.correos_principales
+            if not correos:
+                resultado["sin_correo"].append(str(docente))
+                continue
+
+            EmailService._encolar_resumen_pendientes(
+                docente, correos[0].email, formularios_por_ca)
+            resultado["encolados"] += 1
+
+        logger.info(
+            f"Resumen de pendientes: {resultado['encolados']} encolados, "
+            f"{resultado['omitidos']} omitidos por intervalo, "
+            f"{len(resultado['sin_correo'])} sin correo"
+        )
+        return resultado
+
+    @staticmethod
+    def _docentes_recordados_desde(desde) -> set:
+        """Pks de docentes con un resumen encolado (no fallido) después de `desde`."""
+        return set(
+            CorreoSaliente.objects.filter(
+                content_type=ContentType.objects.get_for_model(Docente),
+                fecha_creacion__gte=desde,
+            )
+            .exclude(estado="FAL")
+            .order_by()
+            .values_list("object_id", flat=True)
+        )
+
+    @staticmethod
+    def _encolar_resumen_pendientes(docente: Docente, destinatario: str, formularios_por_ca: dict):
+        """Arma y encola el resumen de pendientes de un docente."""
+        lineas = [
+            "Estimado/a Docente,",
+            "",
+            "Le recordamos que tiene la siguiente documentación pendiente en sus "
+            "expedientes de Carrera Académica:",
+        ]
+
+        for ca, formularios in formularios_por_ca.items():
+            lineas.append("")
+            lineas.append(
+                f"{ca.cargo.asignatura.nombre.title()} "
+                f"({ca.cargo.get_categoria_display()} {ca.cargo.get_caracter_display()}):"
+            )
+            for formulario in formularios:
+                anio = f" {formulario.anio_correspondiente}" if formulario.anio_correspondiente else ""
+                lineas.append(f"- {formulario.get_tipo_formulario_display()}{anio}")
+
+        lineas += [
+            "",
+            "Saludos cordiales,",
+            "Departamento de Ing. Civil",
+        ]
+
+        return OutboxService.encolar(
+            asunto="Resumen de Documentación Pendiente - Carrera Académica",
+            cuerpo="\n".join(lineas),
+            destinatarios=[destinatario],
+            objeto=docente,
+        )
 
     @staticmethod
     def _obtener_miembros_activos(junta: JuntaEvaluadora) -> List:
@@ -174,8 +334,35 @@ class EmailService:
             return miembro.email
 
     @staticmethod
-    def _enviar_email_individual(destinatario: str, evaluacion: Evaluacion, documentos: List[Formulario]):
-        """Envía email individual a un miembro de la junta."""
+    def _preparar_documentacion(evaluacion: Evaluacion, documentos: List[Formulario], base_url: str) -> tuple:
+        """
+        Decide cómo se entrega la documentación según su tamaño.
+
+        Returns:
+            tuple: (rutas a adjuntar, (url, vencimiento) del enlace o None)
+        """
+        rutas = [doc.archivo.path for doc in documentos if doc.archivo]
+
+        if not DocumentacionJuntaService.supera_limite(documentos):
+            return rutas, None
+
+        if settings.JUNTA_ADJUNTOS_MODO == "pdf":
+            consolidado = DocumentacionJuntaService.consolidar_pdf(evaluacion, documentos)
+            if consolidado:
+                return [consolidado], None
+
+        if not base_url:
+            # Sin URL del sitio no se puede armar el enlace: se adjunta todo
+            logger.warning(
+                f"Documentación de evaluación {evaluacion.pk} supera el límite y no hay base_url")
+            return rutas, None
+
+        logger.info(f"Documentación de evaluación {evaluacion.pk} enviada como enlace")
+        return [], DocumentacionJuntaService.generar_enlace(evaluacion, base_url)
+
+    @staticmethod
+    def _encolar_email_individual(destinatario: str, evaluacion: Evaluacion, rutas: List[str], enlace=None):
+        """Encola el email individual a un miembro de la junta."""
         ca = evaluacion.carrera_academica
 
         fecha_texto = (
@@ -184,30 +371,35 @@ class EmailService:
             else 'a confirmar'
         )
 
-        email = EmailMessage(
-            subject=f"Convocatoria y Documentación para Junta Evaluadora - {ca.cargo.docente}",
-            body=f"""Estimado/a Miembro de la Junta Evaluadora,
+        if enlace:
+            url, vence = enlace
+            texto_documentacion = (
+                "La documentación relevante del expediente supera el tamaño máximo para "
+                f"adjuntar. Puede descargarla desde el siguiente enlace, válido hasta el "
+                f"{timezone.localtime(vence):%d/%m/%Y}:\n{url}"
+            )
+        else:
+            texto_documentacion = "Se adjunta toda la documentación relevante del expediente para su análisis."
+
+        OutboxService.encolar(
+            asunto=f"Convocatoria y Documentación para Junta Evaluadora - {ca.cargo.docente}",
+            cuerpo=f"""Estimado/a Miembro de la Junta Evaluadora,
 
 Se le convoca a participar en la evaluación para la Carrera Académica de {ca.cargo.docente}. 
 La misma está agendada para el {fecha_texto}.
 
-Se adjunta toda la documentación relevante del expediente para su análisis.
+{texto_documentacion}
 
 Saludos cordiales,
 Departamento de Ingeniería Civil""",
-            from_email=None,
-            to=[destinatario],
+            destinatarios=[destinatario],
+            rutas=rutas,
+            objeto=evaluacion,
         )
 
-        for doc in documentos:
-            if doc.archivo:
-                email.attach_file(doc.archivo.path)
-
-        email.send()
-
     @staticmethod
-    def _preparar_email_recordatorio(ca: CarreraAcademica, destinatario: str, formularios_pendientes) -> EmailMessage:
-        """Prepara el email de recordatorio de formularios pendientes."""
+    def _encolar_email_recordatorio(ca: CarreraAcademica, destinatario: str, formularios_pendientes):
+        """Prepara y encola el email de recordatorio de formularios pendientes."""
         info_cargo = (
             f"{ca.cargo.get_categoria_display()} {ca.cargo.get_caracter_display()} "
             f"en la asignatura {ca.cargo.asignatura.nombre.title()}"
@@ -222,18 +414,15 @@ Departamento de Ingeniería Civil""",
             "- Curriculum Vitae (formato CONEAU).",
         ]
 
-        email = EmailMessage(
-            subject="Recordatorio de Documentación Pendiente - Carrera Académica",
-            from_email=None,
-            to=[destinatario],
-        )
-
         # Aquí iría la lógica de adjuntar plantillas
         # (la movemos en el siguiente paso)
 
-        email.body = "\n".join(email_body_lines + [
-            "\nSaludos cordiales,",
-            "Departamento de Ing. Civil"
-        ])
-
-        return email
+        return OutboxService.encolar(
+            asunto="Recordatorio de Documentación Pendiente - Carrera Académica",
+            cuerpo="\n".join(email_body_lines + [
+                "\nSaludos cordiales,",
+                "Departamento de Ing. Civil"
+            ]),
+            destinatarios=[destinatario],
+            objeto=ca,
+        )
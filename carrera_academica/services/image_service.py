@@ -0,0 +1,53 @@
+# carrera_academica/services/image_service.py
+"""
+Servicio para procesamiento de imágenes (Pillow).
+"""
+import io
+import logging
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+class ImageService:
+    """Utilidades de imágenes usadas en la generación de documentos."""
+
+    @staticmethod
+    def escalar_logo(archivo, alto_px: int, calidad_jpeg: int = 85) -> Tuple[bytes, str]:
+        """
+        Escala y comprime un logo para embeberlo en documentos Word.
+
+        Args:
+            archivo: Ruta o archivo abierto con la imagen original
+            alto_px: Alto final en píxeles (se mantiene la proporción)
+            calidad_jpeg: Calidad para imágenes sin transparencia
+
+        Returns:
+            tuple: (bytes de la imagen, extensión sin punto: "png" o "jpg")
+        """
+        with Image.open(archivo) as imagen:
+            imagen = ImageOps.exif_transpose(imagen)
+
+            if imagen.height > alto_px:
+                ancho_px = max(1, round(imagen.width * alto_px / imagen.height))
+                imagen = imagen.resize((ancho_px, alto_px), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            if ImageService._tiene_transparencia(imagen):
+                imagen.convert("RGBA").save(buffer, "PNG", optimize=True)
+                extension = "png"
+            else:
+                imagen.convert("RGB").save(
+                    buffer, "JPEG", quality=calidad_jpeg, optimize=True)
+                extension = "jpg"
+
+        return buffer.getvalue(), extension
+
+    @staticmethod
+    def _tiene_transparencia(imagen: Image.Image) -> bool:
+        """Indica si la imagen tiene canal alfa o color transparente."""
+        if imagen.mode in ("RGBA", "LA"):
+            return True
+        return imagen.mode == "P" and "transparency" in imagen.info
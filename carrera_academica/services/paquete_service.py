@@ -0,0 +1,190 @@
+# carrera_academica/services/paquete_service.py
+"""
+Servicio para generación masiva de los formularios anuales (F04-F07, F13, ENC).
+
+Genera todos los formularios dinámicos de un año para las Carreras
+Académicas activas y los agrupa en un ZIP por docente, listo para
+distribuir a comienzo de año.
+"""
+import logging
+import os
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from django.utils.text import slugify
+
+from carrera_academica.models import Formulario
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.template_cache import TemplateCache
+from carrera_academica.services.template_manifest import TemplateManifest
+
+logger = logging.getLogger(__name__)
+
+
+class PaqueteFormulariosService:
+    """Servicio para generar paquetes ZIP de formularios anuales por docente."""
+
+    @staticmethod
+    def generar_paquetes(anio: int, destino: str, workers: Optional[int] = None) -> dict:
+        """
+        Genera un ZIP por docente con sus formularios dinámicos del año.
+
+        Todas las consultas y la carga de plantillas/membrete se hacen en el
+        hilo principal; los hilos de trabajo solo renderizan y comprimen.
+
+        Args:
+            anio: Año correspondiente de los formularios
+            destino: Directorio donde se escriben los ZIP
+            workers: Cantidad de hilos (por defecto, según CPUs)
+
+        Returns:
+            dict: {'paquetes': [rutas], 'documentos': int, 'errores': [str]}
+        """
+        resultado = {"paquetes": [], "documentos": 0, "errores": []}
+
+        formularios = (
+            Formulario.objects.filter(
+                anio_correspondiente=anio,
+                tipo_formulario__in=DocumentService.TIPOS_DINAMICOS,
+                carrera_academica__estado="ACT",
+            )
+            .select_related(
+                "carrera_academica__cargo__docente",
+                "carrera_academica__cargo__asignatura",
+            )
+            .order_by(
+                "carrera_academica__cargo__docente__apellido",
+                "carrera_academica__cargo__docente__nombre",
+                "carrera_academica_id",
+                "tipo_formulario",
+            )
+        )
+
+        recursos = PaqueteFormulariosService._preparar_recursos(
+            anio, {f.tipo_formulario for f in formularios}, resultado["errores"])
+
+        por_docente = OrderedDict()
+        for formulario in formularios:
+            if formulario.tipo_formulario not in recursos:
+                continue
+            docente = formulario.carrera_academica.cargo.docente
+            por_docente.setdefault(docente.pk, (docente, []))[1].append(formulario)
+
+        if not por_docente:
+            logger.warning(f"No hay formularios para generar del año {anio}")
+            return resultado
+
+        os.makedirs(destino, exist_ok=True)
+        workers = workers or min(8, os.cpu_count() or 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futuros = {
+                pool.submit(
+                    PaqueteFormulariosService._generar_zip_docente,
+                    docente, lista, recursos, anio, destino,
+                ): docente
+                for docente, lista in por_docente.values()
+            }
+
+            for futuro in as_completed(futuros):
+                docente = futuros[futuro]
+                try:
+                    ruta, cantidad, errores = futuro.result()
+                except Exception as e:
+                    logger.error(f"Error generando paquete de {docente}: {e}")
+                    resultado["errores"].append(f"{docente}: {e}")
+                    continue
+
+                resultado["errores"].extend(errores)
+                if ruta:
+                    resultado["paquetes"].append(ruta)
+                    resultado["documentos"] += cantidad
+
+        resultado["paquetes"].sort()
+        logger.info(
+            f"Paquetes {anio}: {len(resultado['paquetes'])} ZIP, "
+            f"{resultado['documentos']} documentos, {len(resultado['errores'])} errores"
+        )
+        return resultado
+
+    @staticmethod
+    def _preparar_recursos(anio: int, tipos: set, errores: list) -> dict:
+        """
+        Resuelve plantilla y membrete por tipo y deja plantillas y logo cacheados.
+
+        Returns:
+            dict: tipo_formulario -> (plantilla, membrete)
+        """
+        recursos = {}
+        for tipo in sorted(tipos):
+            plantilla, membrete = DocumentService._obtener_recursos(tipo, anio)
+            if not plantilla or not membrete:
+                errores.append(
+                    f"{tipo}: falta plantilla o membrete para el año {anio}")
+                continue
+
+            # Sin manifiesto vigente se genera recorriendo la plantilla
+            errores_plantilla = (plantilla.manifest or {}).get("errores")
+            if errores_plantilla:
+                logger.warning(
+                    f"{tipo}: plantilla {plantilla.pk} con problemas "
+                    f"({'; '.join(errores_plantilla)})")
+
+            try:
+                manifest = TemplateManifest.vigente(plantilla)
+                TemplateCache.precargar(
+                    plantilla.archivo.path, manifest["indice"] if manifest else None)
+                DocumentService._obtener_logo(membrete)
+            except Exception as e:
+                errores.append(f"{tipo}: no se pudo cargar la plantilla ({e})")
+                continue
+
+            recursos[tipo] = (plantilla, membrete)
+
+        return recursos
+
+    @staticmethod
+    def _generar_zip_docente(docente, formularios: list, recursos: dict, anio: int, destino: str):
+        """
+        Renderiza los formularios de un docente y los escribe en un ZIP.
+
+        Si el docente tiene más de una Carrera Académica, cada una va en una
+        carpeta con el nombre de la asignatura.
+
+        Returns:
+            tuple: (ruta del ZIP o None, documentos incluidos, errores)
+        """
+        errores = []
+        varias_ca = len({f.carrera_academica_id for f in formularios}) > 1
+        # El pk evita que dos docentes homónimos compartan el ZIP (y el .tmp)
+        ruta = os.path.join(
+            destino, f"formularios_{anio}_{docente.pk}_{slugify(docente)}.zip")
+        ruta_temporal = f"{ruta}.tmp"
+        cantidad = 0
+
+        with zipfile.ZipFile(ruta_temporal, "w", zipfile.ZIP_DEFLATED) as zf:
+            for formulario in formularios:
+                plantilla, membrete = recursos[formulario.tipo_formulario]
+                try:
+                    buffer, filename = DocumentService.renderizar(
+                        formulario, plantilla, membrete)
+                except Exception as e:
+                    logger.error(
+                        f"Error generando documento para formulario {formulario.pk}: {e}")
+                    errores.append(f"{docente} - {formulario.tipo_formulario}: {e}")
+                    continue
+
+                if varias_ca:
+                    asignatura = formulario.carrera_academica.cargo.asignatura
+                    filename = f"{slugify(asignatura.nombre)}/{filename}"
+                zf.writestr(filename, buffer.getvalue())
+                cantidad += 1
+
+        if not cantidad:
+            os.remove(ruta_temporal)
+            return None, 0, errores
+
+        os.replace(ruta_temporal, ruta)
+        return ruta, cantidad, errores
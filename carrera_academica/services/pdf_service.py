@@ -13,9 +13,12 @@ from pypdf import PdfWriter
 from weasyprint import HTML
 
 from carrera_academica.models import CarreraAcademica
+from carrera_academica.services.artifact_cache import ArtifactCache
 
 logger = logging.getLogger(__name__)
 
+ESPACIO_PROPUESTAS_JURADO = "propuestas_jurado"
+
 
 class PDFService:
     """Servicio centralizado para generación de PDFs."""
@@ -123,9 +126,13 @@ class PDFService:
                 context
             )
 
-            # Generar PDF silenciando stderr de WeasyPrint
-            with open(os.devnull, "w") as f, redirect_stderr(f):
-                pdf_file = HTML(string=html_string).write_pdf()
+            # El HTML incluye todos los datos de la junta y la versión de la
+            # plantilla: si no cambió, se reutiliza el PDF cacheado
+            pdf_file = ArtifactCache.obtener_o_generar(
+                ESPACIO_PROPUESTAS_JURADO, junta.pk,
+                ArtifactCache.clave(html_string), "pdf",
+                lambda: PDFService._html_a_pdf(html_string),
+            )
 
             logger.info(f"PDF de propuesta de jurado generado para CA {ca.pk}")
             return pdf_file
@@ -134,6 +141,17 @@ class PDFService:
             logger.error(f"Error generando PDF de jurado para CA {ca.pk}: {e}")
             return None
 
+    @staticmethod
+    def invalidar_propuesta_jurado(junta_pk=None) -> int:
+        """Descarta las propuestas de jurado cacheadas de una junta (o todas)."""
+        return ArtifactCache.invalidar(ESPACIO_PROPUESTAS_JURADO, junta_pk)
+
+    @staticmethod
+    def _html_a_pdf(html_string: str) -> bytes:
+        """Genera el PDF silenciando stderr de WeasyPrint."""
+        with open(os.devnull, "w") as f, redirect_stderr(f):
+            return HTML(string=html_string).write_pdf()
+
     @staticmethod
     def _obtener_fecha_orden_formulario(form, ca):
         """Obtiene la fecha para ordenar un formulario."""
@@ -0,0 +1,182 @@
+# carrera_academica/services/placeholder_engine.py
+"""
+Motor de reemplazo de marcadores ([DOCENTE_NOMBRE], [fecha], ...) en Word.
+
+Word suele partir un marcador en varios runs (ej: "[", "alumno", "]"), por
+lo que buscar run por run no alcanza. El motor:
+
+1. Indexa una vez por plantilla dónde está cada marcador (cuerpo, tablas,
+   encabezados y pies), incluso si cruza varios runs.
+2. Aplica todos los reemplazos en una sola pasada usando ese índice,
+   conservando el formato del primer run de cada marcador.
+
+El índice es una estructura JSON (listas y dicts) y sirve para cualquier
+copia de la misma plantilla.
+"""
+import re
+from typing import Dict, Iterator, List, Tuple
+
+from docx.document import Document as DocumentType
+from docx.oxml.ns import qn
+
+PLACEHOLDER_RE = re.compile(r"\[[A-Za-z_]+\]")
+
+# Nodos de texto que pertenecen al párrafo (no a párrafos anidados)
+_XPATH_TEXTOS = (
+    "./w:r/w:t"
+    " | ./w:hyperlink/w:r/w:t"
+    " | ./w:ins/w:r/w:t"
+    " | ./w:smartTag/w:r/w:t"
+)
+
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+_ENCABEZADOS_Y_PIES = (
+    "header",
+    "first_page_header",
+    "even_page_header",
+    "footer",
+    "first_page_footer",
+    "even_page_footer",
+)
+
+
+class PlaceholderEngine:
+    """Indexa y reemplaza marcadores en documentos python-docx."""
+
+    @staticmethod
+    def indexar(doc: DocumentType) -> List[dict]:
+        """
+        Devuelve la ubicación de todos los marcadores del documento.
+
+        Formato de cada entrada:
+            {"parte": "cuerpo" | "s0.header" | ...,
+             "parrafo": <n° de párrafo dentro de la parte>,
+             "marcadores": [{"marcador": "[X]",
+                             "segmentos": [[nodo, inicio, fin], ...]}]}
+        """
+        indice = []
+
+        for nombre_parte, elemento in PlaceholderEngine._iterar_partes(doc):
+            for n_parrafo, parrafo in enumerate(elemento.iter(qn("w:p"))):
+                nodos = parrafo.xpath(_XPATH_TEXTOS)
+                marcadores = PlaceholderEngine._ubicar_marcadores(nodos)
+                if marcadores:
+                    indice.append({
+                        "parte": nombre_parte,
+                        "parrafo": n_parrafo,
+                        "marcadores": marcadores,
+                    })
+
+        return indice
+
+    @staticmethod
+    def aplicar(doc: DocumentType, indice: List[dict], reemplazos: Dict[str, str]) -> int:
+        """
+        Aplica los reemplazos sobre `doc` usando un índice de la misma plantilla.
+
+        Los marcadores que no están en `reemplazos` quedan intactos.
+        Devuelve la cantidad de marcadores reemplazados.
+        """
+        if not indice:
+            return 0
+
+        partes = dict(PlaceholderEngine._iterar_partes(doc))
+        por_parte = {}
+        for entrada in indice:
+            por_parte.setdefault(entrada["parte"], {})[entrada["parrafo"]] = entrada
+
+        reemplazados = 0
+        for nombre_parte, entradas in por_parte.items():
+            elemento = partes.get(nombre_parte)
+            if elemento is None:
+                continue
+
+            for n_parrafo, parrafo in enumerate(elemento.iter(qn("w:p"))):
+                entrada = entradas.get(n_parrafo)
+                if entrada is None:
+                    continue
+
+                nodos = parrafo.xpath(_XPATH_TEXTOS)
+                # De atrás hacia adelante: los offsets previos siguen válidos
+                for marcador in reversed(entrada["marcadores"]):
+                    nuevo_texto = reemplazos.get(marcador["marcador"])
+                    if nuevo_texto is None:
+                        continue
+                    PlaceholderEngine._reemplazar_segmentos(
+                        nodos, marcador["segmentos"], str(nuevo_texto))
+                    reemplazados += 1
+
+        return reemplazados
+
+    @staticmethod
+    def reemplazar(doc: DocumentType, reemplazos: Dict[str, str]) -> int:
+        """Indexa y reemplaza en un solo paso (para documentos no cacheados)."""
+        return PlaceholderEngine.aplicar(doc, PlaceholderEngine.indexar(doc), reemplazos)
+
+    @staticmethod
+    def marcadores(indice: List[dict]) -> List[str]:
+        """Lista ordenada de marcadores distintos presentes en un índice."""
+        return sorted({
+            marcador["marcador"]
+            for entrada in indice
+            for marcador in entrada["marcadores"]
+        })
+
+    @staticmethod
+    def _iterar_partes(doc: DocumentType) -> Iterator[Tuple[str, object]]:
+        """Cuerpo, encabezados y pies (sin repetir partes compartidas)."""
+        yield "cuerpo", doc.element.body
+
+        vistas = set()
+        for n_seccion, seccion in enumerate(doc.sections):
+            for atributo in _ENCABEZADOS_Y_PIES:
+                encabezado = getattr(seccion, atributo)
+                # Acceder a un encabezado vinculado crearía una definición nueva
+                if encabezado.is_linked_to_previous:
+                    continue
+                parte = encabezado.part
+                if id(parte) in vistas:
+                    continue
+                vistas.add(id(parte))
+                yield f"s{n_seccion}.{atributo}", encabezado._element
+
+    @staticmethod
+    def _ubicar_marcadores(nodos) -> List[dict]:
+        """Busca marcadores en el texto concatenado de los nodos de un párrafo."""
+        textos = [nodo.text or "" for nodo in nodos]
+        texto = "".join(textos)
+        if "[" not in texto:
+            return []
+
+        # Posición de inicio de cada nodo dentro del texto concatenado
+        inicios = []
+        posicion = 0
+        for t in textos:
+            inicios.append(posicion)
+            posicion += len(t)
+
+        marcadores = []
+        for match in PLACEHOLDER_RE.finditer(texto):
+            segmentos = []
+            for n_nodo, inicio_nodo in enumerate(inicios):
+                fin_nodo = inicio_nodo + len(textos[n_nodo])
+                inicio = max(match.start(), inicio_nodo)
+                fin = min(match.end(), fin_nodo)
+                if inicio < fin:
+                    segmentos.append([n_nodo, inicio - inicio_nodo, fin - inicio_nodo])
+            marcadores.append({"marcador": match.group(), "segmentos": segmentos})
+
+        return marcadores
+
+    @staticmethod
+    def _reemplazar_segmentos(nodos, segmentos: List[list], nuevo_texto: str):
+        """El primer segmento recibe el texto nuevo; el resto se elimina."""
+        for posicion, (n_nodo, inicio, fin) in enumerate(segmentos):
+            nodo = nodos[n_nodo]
+            texto = nodo.text or ""
+            insertado = nuevo_texto if posicion == 0 else ""
+            nodo.text = texto[:inicio] + insertado + texto[fin:]
+            if nodo.text != nodo.text.strip():
+                nodo.set(_XML_SPACE, "preserve")
+
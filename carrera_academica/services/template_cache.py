@@ -0,0 +1,107 @@
+# carrera_academica/services/template_cache.py
+"""
+Caché en proceso de plantillas Word (.docx) ya parseadas.
+
+Parsear el paquete OOXML es la parte más cara de generar un documento.
+Las plantillas cambian muy poco, así que se guardan parseadas (clave:
+ruta + fecha de modificación) y cada request trabaja sobre una copia.
+"""
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from docx import Document
+
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """LRU de documentos Word parseados, seguro para múltiples hilos."""
+
+    _plantillas = OrderedDict()  # ruta -> (mtime, Document, índice de marcadores)
+    _lock = threading.Lock()
+
+    @classmethod
+    def obtener_documento(cls, path: str) -> Document:
+        """
+        Devuelve una copia del documento ubicado en `path`.
+
+        Si la plantilla ya fue parseada y el archivo no cambió, se copia el
+        árbol XML en memoria (mucho más barato que volver a parsear).
+        """
+        return cls.copiar(cls._obtener_original(path)[0])
+
+    @classmethod
+    def obtener_con_indice(cls, path: str, indice: list = None):
+        """
+        Devuelve (copia del documento, índice de marcadores).
+
+        El índice se calcula una sola vez por versión de la plantilla y se
+        usa con PlaceholderEngine.aplicar(). Si ya se conoce (ej: el
+        manifiesto de PlantillaDocumento) se pasa en `indice` y la plantilla
+        no se recorre.
+        """
+        documento, indice = cls._obtener_original(path, indice)
+        return cls.copiar(documento), indice
+
+    @classmethod
+    def precargar(cls, path: str, indice: list = None):
+        """Parsea e indexa la plantilla si no está cacheada (sin copiarla)."""
+        cls._obtener_original(path, indice)
+
+    @staticmethod
+    def copiar(documento: Document) -> Document:
+        """
+        Copia profunda de un documento python-docx.
+
+        lxml copia cada subárbol por separado, así que el _Body cacheado por
+        el Document quedaría apuntando a un árbol huérfano: se descarta para
+        que se reconstruya desde el elemento raíz copiado.
+        """
+        copia = copy.deepcopy(documento)
+        copia._Document__body = None
+        return copia
+
+    @classmethod
+    def invalidar(cls, path: str = None):
+        """Descarta una plantilla (o todas si no se indica ruta)."""
+        with cls._lock:
+            if path is None:
+                cls._plantillas.clear()
+            else:
+                cls._plantillas.pop(os.path.abspath(path), None)
+
+    @classmethod
+    def _obtener_original(cls, path: str, indice: list = None):
+        """Obtiene (documento, índice) compartidos (no modificar)."""
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+
+        with cls._lock:
+            entrada = cls._plantillas.get(path)
+            if entrada and entrada[0] == mtime:
+                cls._plantillas.move_to_end(path)
+                return entrada[1], entrada[2]
+
+        # Parseamos fuera del lock para no bloquear otras plantillas
+        documento = Document(path)
+        if indice is None:
+            indice = PlaceholderEngine.indexar(documento)
+        logger.info(f"Plantilla parseada y cacheada: {path}")
+
+        with cls._lock:
+            cls._plantillas[path] = (mtime, documento, indice)
+            cls._plantillas.move_to_end(path)
+            while len(cls._plantillas) > cls._max_size():
+                cls._plantillas.popitem(last=False)
+
+        return documento, indice
+
+    @staticmethod
+    def _max_size() -> int:
+        return getattr(settings, "DOCX_TEMPLATE_CACHE_SIZE", 16)
@@ -0,0 +1,183 @@
+# carrera_academica/services/template_manifest.py
+"""
+Manifiesto de plantillas Word (PlantillaDocumento.manifest).
+
+Al guardar una plantilla se analiza una sola vez y se guarda:
+
+- marcadores: lista de marcadores presentes
+- indice: ubicación de cada marcador (párrafo, runs y offsets), en el
+  formato de PlaceholderEngine.indexar()
+- encabezado: dimensiones de la tabla del encabezado y la posición
+  (fila, columna, párrafo) de [LOGO_ANUAL] y [FRASE_ANUAL]
+- errores: problemas que impiden usarla para generar documentos
+- advertencias: texto entre corchetes que no es un marcador (por ejemplo
+  casillas "[X]" o "[SI]"), que queda tal cual en los documentos
+
+Al generar documentos se usa el manifiesto en lugar de recorrer la
+plantilla buscando marcadores.
+"""
+import difflib
+import logging
+from typing import List, Optional, Tuple
+
+from docx import Document
+
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Marcadores que DocumentService reemplaza en el cuerpo
+MARCADORES_CUERPO = (
+    "[DOCENTE_NOMBRE]",
+    "[ASIGNATURA]",
+    "[CARGO]",
+    "[ANIO_LECTIVO]",
+    "[FECHA_GENERACION]",
+    "[DEDICACION]",
+    "[COMISIONES]",
+)
+
+# Marcadores de la tabla del encabezado (membrete anual)
+MARCADORES_ENCABEZADO = ("[LOGO_ANUAL]", "[FRASE_ANUAL]")
+
+# Marcadores del cuerpo que toda plantilla dinámica debe tener
+MARCADORES_REQUERIDOS = ("[DOCENTE_NOMBRE]",)
+
+
+class TemplateManifest:
+    """Análisis y validación de plantillas de documentos."""
+
+    @staticmethod
+    def analizar(archivo, dinamica: bool = True) -> dict:
+        """
+        Analiza una plantilla .docx y devuelve su manifiesto.
+
+        Args:
+            archivo: Ruta o archivo (FieldFile / UploadedFile) de la plantilla
+            dinamica: Si la plantilla se usa para generar documentos; en ese
+                caso se validan los marcadores requeridos y desconocidos
+
+        Returns:
+            dict: Manifiesto (ver docstring del módulo)
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "marcadores": [],
+            "indice": [],
+            "encabezado": None,
+            "errores": [],
+            "advertencias": [],
+        }
+
+        try:
+            if hasattr(archivo, "seek"):
+                archivo.seek(0)
+            doc = Document(archivo)
+        except Exception as e:
+            logger.warning(f"Plantilla inválida: {e}")
+            manifest["errores"].append(
+                "No se pudo leer el archivo como documento Word (.docx).")
+            return manifest
+
+        indice = PlaceholderEngine.indexar(doc)
+        manifest["indice"] = indice
+        manifest["marcadores"] = PlaceholderEngine.marcadores(indice)
+        manifest["encabezado"] = TemplateManifest._analizar_encabezado(doc)
+
+        if dinamica:
+            manifest["errores"], manifest["advertencias"] = TemplateManifest._validar(manifest)
+
+        return manifest
+
+    @staticmethod
+    def vigente(plantilla) -> Optional[dict]:
+        """
+        Devuelve el manifiesto de la plantilla si corresponde a su archivo
+        actual y no tiene errores; si no, None.
+        """
+        manifest = plantilla.manifest or {}
+        if (
+            manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("archivo") != plantilla.archivo.name
+            or manifest.get("errores")
+        ):
+            return None
+        return manifest
+
+    @staticmethod
+    def _analizar_encabezado(doc) -> Optional[dict]:
+        """Ubica los marcadores del membrete en la tabla del encabezado."""
+        header = doc.sections[0].header
+        if not header.tables:
+            return None
+
+        tabla = header.tables[0]
+        encabezado = {
+            "filas": len(tabla.rows),
+            "columnas": len(tabla.columns),
+            "logo": None,
+            "frase": None,
+        }
+
+        for n_fila, fila in enumerate(tabla.rows):
+            for n_columna, celda in enumerate(fila.cells):
+                for n_parrafo, parrafo in enumerate(celda.paragraphs):
+                    if "[LOGO_ANUAL]" in parrafo.text and not encabezado["logo"]:
+                        encabezado["logo"] = [n_fila, n_columna, n_parrafo]
+                    if "[FRASE_ANUAL]" in parrafo.text and not encabezado["frase"]:
+                        encabezado["frase"] = [n_fila, n_columna, n_parrafo]
+
+        return encabezado
+
+    @staticmethod
+    def _validar(manifest: dict) -> Tuple[List[str], List[str]]:
+        """
+        Errores y advertencias de una plantilla dinámica.
+
+        El texto entre corchetes que no es un marcador solo se rechaza si
+        parece un marcador mal escrito (se parece a uno conocido); el resto
+        (casillas como "[X]" o "[SI]") se acepta con una advertencia.
+        """
+        errores = []
+        advertencias = []
+        marcadores = set(manifest["marcadores"])
+
+        encabezado = manifest["encabezado"]
+        if not encabezado or not encabezado["logo"] or not encabezado["frase"]:
+            errores.append(
+                "La plantilla debe tener una tabla en el encabezado con "
+                "[LOGO_ANUAL] y [FRASE_ANUAL].")
+
+        faltantes = [m for m in MARCADORES_REQUERIDOS if m not in marcadores]
+        if faltantes:
+            errores.append(f"Faltan marcadores obligatorios: {', '.join(faltantes)}.")
+
+        conocidos = MARCADORES_CUERPO + MARCADORES_ENCABEZADO
+        mal_escritos = []
+        otros = []
+        for marcador in sorted(marcadores - set(conocidos)):
+            parecido = TemplateManifest._marcador_parecido(marcador, conocidos)
+            if parecido:
+                mal_escritos.append(f"{marcador} (¿{parecido}?)")
+            else:
+                otros.append(marcador)
+
+        if mal_escritos:
+            errores.append(
+                f"Marcadores desconocidos: {', '.join(mal_escritos)}. "
+                f"Disponibles: {', '.join(conocidos)}."
+            )
+        if otros:
+            advertencias.append(
+                f"Texto entre corchetes que no se reemplaza: {', '.join(otros)}.")
+
+        return errores, advertencias
+
+    @staticmethod
+    def _marcador_parecido(marcador: str, conocidos) -> Optional[str]:
+        """Marcador conocido del que `marcador` parece un error de tipeo, o None."""
+        nombres = {conocido.strip("[]"): conocido for conocido in conocidos}
+        parecidos = difflib.get_close_matches(marcador.strip("[]").upper(), nombres, n=1, cutoff=0.8)
+        return nombres[parecidos[0]] if parecidos else None
@@ -1,8 +1,14 @@
 # carrera_academica/signals.py
 
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_save, post_delete
 from django.dispatch import receiver
-from .models import CarreraAcademica, Formulario
+from .models import (
+    CarreraAcademica,
+    Formulario,
+    JuntaEvaluadora,
+    MembreteAnual,
+    PlantillaDocumento,
+)
 
 
 @receiver(post_save, sender=CarreraAcademica)
@@ -41,3 +47,51 @@ def crear_formularios_iniciales(sender, instance, created, **kwargs):
                     tipo_formulario=tipo,
                     anio_correspondiente=anio,
                 )
+
+
+@receiver(post_save, sender=PlantillaDocumento)
+@receiver(post_delete, sender=PlantillaDocumento)
+@receiver(post_save, sender=MembreteAnual)
+@receiver(post_delete, sender=MembreteAnual)
+def invalidar_cache_documentos(sender, instance, **kwargs):
+    """Descarta plantillas y membretes cacheados por DocumentService."""
+    from .services.document_service import DocumentService
+
+    DocumentService.invalidar_cache_recursos()
+
+
+@receiver(post_delete, sender=Formulario)
+def invalidar_documentos_formulario(sender, instance, **kwargs):
+    """Elimina los documentos generados de un formulario borrado."""
+    from .services.document_service import DocumentService
+
+    DocumentService.invalidar_documentos(instance.pk)
+
+
+@receiver(post_save, sender=JuntaEvaluadora)
+@receiver(post_delete, sender=JuntaEvaluadora)
+def invalidar_propuesta_jurado(sender, instance, **kwargs):
+    """Descarta la propuesta de jurado cacheada al modificar la junta."""
+    from .services.pdf_service import PDFService
+
+    PDFService.invalidar_propuesta_jurado(instance.pk)
+
+
+@receiver(m2m_changed, sender=JuntaEvaluadora.miembros_externos_titulares.through)
+@receiver(m2m_changed, sender=JuntaEvaluadora.miembros_externos_suplentes.through)
+def invalidar_propuesta_jurado_miembros(sender, instance, action, reverse, pk_set, **kwargs):
+    """Descarta la propuesta de jurado al cambiar los miembros externos."""
+    if not action.startswith("post_"):
+        return
+
+    from .services.pdf_service import PDFService
+
+    if not reverse:
+        PDFService.invalidar_propuesta_jurado(instance.pk)
+    elif pk_set:
+        # Se modificó desde el lado del MiembroExterno
+        for junta_pk in pk_set:
+            PDFService.invalidar_propuesta_jurado(junta_pk)
+    else:
+        # post_clear desde un MiembroExterno: no se sabe qué juntas tenía
+        PDFService.invalidar_propuesta_jurado()
@@ -0,0 +1,227 @@
+# carrera_academica/test/test_artifact_cache.py
+"""
+Tests para la caché en disco de documentos generados.
+"""
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from docx import Document
+from PIL import Image
+
+from carrera_academica.models import (
+    CarreraAcademica,
+    Formulario,
+    MembreteAnual,
+    PlantillaDocumento,
+)
+from carrera_academica.services.artifact_cache import ArtifactCache
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.template_cache import TemplateCache
+from planta_docente.models import Asignatura, Cargo, Docente
+
+
+class ArtifactCacheTestCase(TestCase):
+    """Tests de almacenamiento, LRU, contadores e invalidación."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(
+            MEDIA_ROOT=self.media_root, DOCUMENT_ARTIFACT_CACHE_BYTES=1000)
+        self.override.enable()
+        ArtifactCache.reiniciar_contadores()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_aciertos_y_fallos(self):
+        """Se genera solo en el primer pedido y se cuentan los accesos."""
+        generar = mock.Mock(return_value=b"pdf")
+
+        for _ in range(3):
+            contenido = ArtifactCache.obtener_o_generar("actas", 1, "abc", "pdf", generar)
+
+        self.assertEqual(contenido, b"pdf")
+        self.assertEqual(generar.call_count, 1)
+        estadisticas = ArtifactCache.estadisticas()
+        self.assertEqual(estadisticas["aciertos"], 2)
+        self.assertEqual(estadisticas["fallos"], 1)
+        self.assertEqual(estadisticas["archivos"], 1)
+
+    def test_no_cachea_errores(self):
+        """Si el generador devuelve None no se guarda nada."""
+        ArtifactCache.obtener_o_generar("actas", 1, "abc", "pdf", lambda: None)
+
+        self.assertEqual(ArtifactCache.estadisticas()["archivos"], 0)
+
+    def test_version_nueva_reemplaza_a_la_anterior(self):
+        """Guardar otra clave del mismo objeto borra la versión vieja."""
+        ArtifactCache.guardar("actas", 1, "v1", "pdf", b"uno")
+        ArtifactCache.guardar("actas", 1, "v2", "pdf", b"dos")
+
+        self.assertIsNone(ArtifactCache.obtener("actas", 1, "v1", "pdf"))
+        self.assertEqual(ArtifactCache.obtener("actas", 1, "v2", "pdf"), b"dos")
+
+    def test_desaloja_los_menos_usados(self):
+        """Al superar el presupuesto se eliminan los de uso más antiguo."""
+        ArtifactCache.guardar("actas", 1, "a", "pdf", b"x" * 400)
+        ArtifactCache.guardar("actas", 2, "b", "pdf", b"x" * 400)
+
+        # El acta 1 se usa después que la 2: queda como la más reciente
+        viejo = time.time() - 100
+        os.utime(ArtifactCache._ruta("actas", 2, "b", "pdf"), (viejo, viejo))
+        os.utime(ArtifactCache._ruta("actas", 1, "a", "pdf"), (viejo - 50, viejo - 50))
+        ArtifactCache.obtener("actas", 1, "a", "pdf")
+
+        ArtifactCache.guardar("actas", 3, "c", "pdf", b"x" * 400)
+
+        self.assertIsNotNone(ArtifactCache.obtener("actas", 1, "a", "pdf"))
+        self.assertIsNone(ArtifactCache.obtener("actas", 2, "b", "pdf"))
+        self.assertIsNotNone(ArtifactCache.obtener("actas", 3, "c", "pdf"))
+        self.assertEqual(ArtifactCache.estadisticas()["desalojos"], 1)
+        self.assertLessEqual(ArtifactCache.estadisticas()["bytes"], 1000)
+
+    def test_escrituras_no_recorren_la_cache(self):
+        """Bajo el presupuesto, solo la primera escritura mide el disco."""
+        with mock.patch(
+            "carrera_academica.services.artifact_cache.os.walk", wraps=os.walk
+        ) as recorrer:
+            for objeto_id in range(5):
+                ArtifactCache.guardar("actas", objeto_id, "a", "pdf", b"x" * 100)
+            # Reemplazar una versión no suma dos veces
+            ArtifactCache.guardar("actas", 0, "b", "pdf", b"x" * 100)
+
+        self.assertEqual(recorrer.call_count, 1)
+        self.assertEqual(ArtifactCache._sumar_ocupacion(0), 500)
+
+    def test_total_vencido_se_vuelve_a_medir(self):
+        """Lo escrito por otros procesos se suma al volver a medir."""
+        ArtifactCache.guardar("actas", 1, "a", "pdf", b"x" * 400)
+        # Otro proceso escribe directamente en la caché
+        otro = ArtifactCache._ruta("actas", 2, "b", "pdf")
+        os.makedirs(os.path.dirname(otro))
+        with open(otro, "wb") as f:
+            f.write(b"x" * 400)
+
+        with mock.patch(
+            "carrera_academica.services.artifact_cache.time.monotonic",
+            return_value=time.monotonic() + 3600,
+        ):
+            ArtifactCache.guardar("actas", 3, "c", "pdf", b"x" * 400)
+
+        self.assertEqual(ArtifactCache.estadisticas()["desalojos"], 1)
+        self.assertLessEqual(ArtifactCache.estadisticas()["bytes"], 1000)
+
+    def test_invalidar(self):
+        """Se puede invalidar por objeto, por espacio o todo."""
+        ArtifactCache.guardar("actas", 1, "a", "pdf", b"1")
+        ArtifactCache.guardar("actas", 2, "b", "pdf", b"2")
+        ArtifactCache.guardar("formularios", 1, "c", "docx", b"3")
+
+        self.assertEqual(ArtifactCache.invalidar("actas", 1), 1)
+        self.assertIsNone(ArtifactCache.obtener("actas", 1, "a", "pdf"))
+        self.assertIsNotNone(ArtifactCache.obtener("actas", 2, "b", "pdf"))
+
+        self.assertEqual(ArtifactCache.invalidar("actas"), 1)
+        self.assertEqual(ArtifactCache.invalidar(), 1)
+        self.assertEqual(ArtifactCache.estadisticas()["archivos"], 0)
+
+
+class DocumentServiceArtifactCacheTestCase(TestCase):
+    """Tests de la caché aplicada a los documentos de formularios."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        DocumentService.invalidar_cache_recursos()
+        TemplateCache.invalidar()
+
+        doc = Document()
+        tabla = doc.sections[0].header.add_table(1, 2, doc.sections[0].page_width)
+        tabla.cell(0, 0).paragraphs[0].text = "[LOGO_ANUAL]"
+        tabla.cell(0, 1).paragraphs[0].text = "[FRASE_ANUAL]"
+        doc.add_paragraph("[DOCENTE_NOMBRE] - [ASIGNATURA]")
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        self.plantilla = PlantillaDocumento(tipo_formulario="F04")
+        self.plantilla.archivo.save("F04.docx", ContentFile(buffer.getvalue()))
+
+        logo = io.BytesIO()
+        Image.new("RGB", (100, 100), "white").save(logo, "PNG")
+        MembreteAnual.objects.create(
+            anio=2024, frase="Año de prueba",
+            logo=SimpleUploadedFile("logo.png", logo.getvalue()),
+        )
+
+        self.docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        asignatura = Asignatura.objects.create(
+            nombre="hidraulica", nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        cargo = Cargo.objects.create(
+            docente=self.docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=date(2023, 1, 1), fecha_vencimiento=date(2026, 1, 1),
+        )
+        ca = CarreraAcademica.objects.create(
+            cargo=cargo, fecha_inicio=date(2023, 1, 1),
+            fecha_vencimiento_original=date(2026, 1, 1),
+            fecha_vencimiento_actual=date(2026, 1, 1),
+        )
+        self.formulario = Formulario.objects.get(
+            carrera_academica=ca, tipo_formulario="F04", anio_correspondiente=2024)
+
+        ArtifactCache.reiniciar_contadores()
+
+    def tearDown(self):
+        DocumentService.invalidar_cache_recursos()
+        TemplateCache.invalidar()
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def generar_texto(self):
+        buffer, _ = DocumentService.generar_documento_dinamico(self.formulario)
+        return Document(buffer).paragraphs[0].text
+
+    def test_segunda_descarga_sale_de_la_cache(self):
+        """Sin cambios en los datos, el documento no se vuelve a renderizar."""
+        with mock.patch.object(
+            DocumentService, "renderizar", wraps=DocumentService.renderizar
+        ) as renderizar:
+            self.generar_texto()
+            self.generar_texto()
+
+        self.assertEqual(renderizar.call_count, 1)
+        self.assertEqual(ArtifactCache.estadisticas()["aciertos"], 1)
+
+    def test_cambio_de_datos_regenera(self):
+        """Si cambia un dato del documento, la clave cambia."""
+        self.assertEqual(self.generar_texto(), "PEREZ, Juan - Hidraulica")
+
+        self.docente.apellido = "gomez"
+        self.docente.save()
+        self.formulario.refresh_from_db()
+
+        self.assertEqual(self.generar_texto(), "GOMEZ, Juan - Hidraulica")
+
+    def test_guardar_plantilla_invalida_documentos(self):
+        """Las signals de plantillas vacían la caché de formularios."""
+        self.generar_texto()
+        self.assertEqual(ArtifactCache.estadisticas()["archivos"], 1)
+
+        self.plantilla.descripcion = "Nueva versión"
+        self.plantilla.save()
+
+        self.assertEqual(ArtifactCache.estadisticas()["archivos"], 0)
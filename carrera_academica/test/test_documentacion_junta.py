@@ -0,0 +1,181 @@
+# carrera_academica/test/test_documentacion_junta.py
+"""
+Tests para la entrega de documentación pesada a la junta evaluadora.
+"""
+import io
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from pypdf import PdfReader, PdfWriter
+
+from carrera_academica.models import (
+    CarreraAcademica,
+    Evaluacion,
+    Formulario,
+    JuntaEvaluadora,
+    MiembroExterno,
+)
+from carrera_academica.services.documentacion_service import DocumentacionJuntaService
+from carrera_academica.services.email_service import EmailService
+from notificaciones.models import CorreoSaliente
+from planta_docente.models import Asignatura, Cargo, Correo, Docente
+
+BASE_URL = "https://civil.frlp.utn.edu.ar/"
+
+
+def pdf(paginas=1):
+    writer = PdfWriter()
+    for _ in range(paginas):
+        writer.add_blank_page(width=595, height=842)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+@override_settings(JUNTA_ADJUNTOS_MAX_BYTES=10 ** 9, JUNTA_ADJUNTOS_MODO="enlace")
+class DocumentacionJuntaTestCase(TestCase):
+    """Tests del modo de entrega según el tamaño de los adjuntos."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(
+            MEDIA_ROOT=f"{self.media_root}/media",
+            JUNTA_DOCUMENTACION_DIR=f"{self.media_root}/privado",
+        )
+        self.override.enable()
+
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        interno = Docente.objects.create(
+            nombre="maria", apellido="lopez", documento=23456789,
+            legajo=1002, fecha_nacimiento=date(1975, 1, 1),
+        )
+        Correo.objects.create(docente=interno, email="maria@frlp.utn.edu.ar", principal=True)
+        asignatura = Asignatura.objects.create(
+            nombre="hidraulica", nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        cargo = Cargo.objects.create(
+            docente=docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=date(2023, 1, 1), fecha_vencimiento=date(2026, 1, 1),
+        )
+        ca = CarreraAcademica.objects.create(
+            cargo=cargo, fecha_inicio=date(2023, 1, 1),
+            fecha_vencimiento_original=date(2026, 1, 1),
+            fecha_vencimiento_actual=date(2026, 1, 1),
+        )
+        junta = JuntaEvaluadora.objects.create(
+            carrera_academica=ca, miembro_interno_titular=interno)
+        junta.miembros_externos_titulares.add(MiembroExterno.objects.create(
+            nombre_completo="Ana Ruiz", email="ana@unlp.edu.ar",
+            universidad_origen="UNLP", cargo_info="Titular",
+        ))
+        self.evaluacion = Evaluacion.objects.create(
+            carrera_academica=ca, numero_evaluacion=1, anios_evaluados=[2024])
+
+        for tipo in ["F04", "F05"]:
+            formulario = Formulario.objects.get(
+                carrera_academica=ca, tipo_formulario=tipo, anio_correspondiente=2024)
+            formulario.archivo.save(f"{tipo}.pdf", ContentFile(pdf(2)), save=False)
+            formulario.estado = "ENT"
+            formulario.save()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def notificar(self):
+        resultado = EmailService.enviar_notificacion_junta(self.evaluacion, BASE_URL)
+        self.assertEqual(resultado, (2, 0, []))
+        return list(CorreoSaliente.objects.prefetch_related("adjuntos"))
+
+    def test_bajo_el_limite_adjunta_cada_archivo(self):
+        """Documentación chica: se adjuntan los formularios."""
+        for correo in self.notificar():
+            self.assertEqual(correo.adjuntos.count(), 2)
+
+    @override_settings(JUNTA_ADJUNTOS_MAX_BYTES=100)
+    def test_sobre_el_limite_envia_enlace(self):
+        """Documentación pesada: sin adjuntos, con un enlace firmado."""
+        correos = self.notificar()
+
+        for correo in correos:
+            self.assertEqual(correo.adjuntos.count(), 0)
+            self.assertIn(f"{BASE_URL}carrera/documentacion/", correo.cuerpo)
+
+        url = next(linea for linea in correos[0].cuerpo.splitlines() if linea.startswith(BASE_URL))
+        response = self.client.get(url[len(BASE_URL) - 1:])
+
+        self.assertEqual(response.status_code, 200)
+        archivo = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(len(archivo.namelist()), 2)
+        # Los PDF ya están comprimidos: se guardan tal cual
+        self.assertEqual(
+            {info.compress_type for info in archivo.infolist()}, {zipfile.ZIP_STORED})
+
+    def test_enlace_alterado_o_vencido(self):
+        """El token no se puede modificar y vence a los JUNTA_ENLACE_DIAS."""
+        url, _ = DocumentacionJuntaService.generar_enlace(self.evaluacion, "")
+
+        self.assertEqual(self.client.get(url[:-3] + "abc/").status_code, 403)
+
+        en_un_anio = time.time() + 365 * 24 * 3600
+        with mock.patch("django.core.signing.time.time", return_value=en_un_anio):
+            self.assertEqual(self.client.get(url).status_code, 410)
+
+    @override_settings(JUNTA_ADJUNTOS_MAX_BYTES=1000, JUNTA_ADJUNTOS_MODO="pdf")
+    def test_modo_pdf_consolidado(self):
+        """En modo "pdf" se adjunta un único PDF con todos los formularios."""
+        self.assertTrue(DocumentacionJuntaService.supera_limite(
+            EmailService._obtener_documentos_pertinentes(
+                self.evaluacion.carrera_academica, [2024])))
+
+        for correo in self.notificar():
+            adjuntos = list(correo.adjuntos.all())
+            self.assertEqual(len(adjuntos), 1)
+            self.assertEqual(len(PdfReader(adjuntos[0].ruta).pages), 4)
+            # No queda bajo MEDIA_ROOT, que se sirve sin el enlace firmado
+            self.assertTrue(adjuntos[0].ruta.startswith(f"{self.media_root}/privado/"))
+
+    def test_nueva_convocatoria_va_a_todos(self):
+        """Notificar otra vez (cambió la fecha o la junta) encola a todos los miembros."""
+        self.notificar()
+
+        resultado = EmailService.enviar_notificacion_junta(self.evaluacion, BASE_URL)
+
+        self.assertEqual(resultado, (2, 0, []))
+        self.assertEqual(CorreoSaliente.objects.count(), 4)
+
+    def test_reenvio_no_repite_a_los_notificados(self):
+        """El reenvío solo encola a quienes no recibieron la convocatoria."""
+        self.notificar()
+        CorreoSaliente.objects.filter(destinatarios=["ana@unlp.edu.ar"]).update(estado="FAL")
+
+        resultado = EmailService.enviar_notificacion_junta(
+            self.evaluacion, BASE_URL, omitir_notificados=True)
+
+        self.assertEqual(resultado, (1, 1, []))
+
+    def test_vista_reenvio_informa_omitidos(self):
+        """La vista de reenvío informa los omitidos como info, no como advertencia."""
+        self.notificar()
+        self.client.force_login(User.objects.create_user("operador"))
+
+        response = self.client.get(
+            reverse("reenviar_junta", args=[self.evaluacion.pk]), follow=True)
+
+        mensajes = [(m.level_tag, m.message) for m in response.context["messages"]]
+        self.assertEqual(mensajes, [
+            ("info", "Se omitieron 2 miembros que ya habían recibido la convocatoria."),
+        ])
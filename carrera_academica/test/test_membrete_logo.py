@@ -0,0 +1,102 @@
+# carrera_academica/test/test_membrete_logo.py
+"""
+Tests para el logo optimizado de MembreteAnual.
+"""
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from docx import Document
+from PIL import Image
+
+from carrera_academica.models import MembreteAnual
+from carrera_academica.services.document_service import DocumentService
+
+
+def imagen_png(ancho, alto, modo="RGB"):
+    """Genera un PNG en memoria."""
+    buffer = io.BytesIO()
+    Image.new(modo, (ancho, alto), "white").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class MembreteLogoOptimizadoTestCase(TestCase):
+    """Tests de la variante escalada del logo."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(
+            MEDIA_ROOT=self.media_root, MEMBRETE_LOGO_ALTO_PX=300)
+        self.override.enable()
+        DocumentService.invalidar_cache_recursos()
+
+    def tearDown(self):
+        DocumentService.invalidar_cache_recursos()
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def crear_membrete(self, contenido, nombre="logo.png"):
+        return MembreteAnual.objects.create(
+            anio=2024,
+            frase="Año de prueba",
+            logo=SimpleUploadedFile(nombre, contenido, content_type="image/png"),
+        )
+
+    def test_genera_logo_escalado_al_guardar(self):
+        """Al guardar se genera una versión de 300 px de alto."""
+        membrete = self.crear_membrete(imagen_png(1200, 1200))
+
+        membrete.refresh_from_db()
+        self.assertTrue(membrete.logo_optimizado)
+        with Image.open(membrete.logo_optimizado.path) as imagen:
+            self.assertEqual(imagen.size, (300, 300))
+            self.assertEqual(imagen.format, "JPEG")
+
+    def test_conserva_transparencia(self):
+        """Los logos con canal alfa se guardan como PNG."""
+        membrete = self.crear_membrete(imagen_png(600, 1200, modo="RGBA"))
+
+        with Image.open(membrete.logo_optimizado.path) as imagen:
+            self.assertEqual(imagen.size, (150, 300))
+            self.assertEqual(imagen.format, "PNG")
+
+    def test_regenera_al_cambiar_logo(self):
+        """Un logo nuevo reemplaza la variante anterior."""
+        membrete = self.crear_membrete(imagen_png(1200, 1200))
+        anterior = membrete.logo_optimizado.name
+
+        membrete.logo = SimpleUploadedFile("otro.png", imagen_png(900, 600))
+        membrete.save()
+
+        self.assertNotEqual(membrete.logo_optimizado.name, anterior)
+        self.assertFalse(membrete.logo_optimizado.storage.exists(anterior))
+
+    def test_no_regenera_si_no_cambia_el_logo(self):
+        """Editar la frase no vuelve a procesar la imagen."""
+        membrete = self.crear_membrete(imagen_png(1200, 1200))
+        nombre = membrete.logo_optimizado.name
+
+        membrete.frase = "Otra frase"
+        membrete.save()
+
+        self.assertEqual(membrete.logo_optimizado.name, nombre)
+
+    def test_encabezado_embebe_logo_optimizado(self):
+        """El documento generado contiene la imagen escalada."""
+        membrete = self.crear_membrete(imagen_png(2400, 2400))
+
+        doc = Document()
+        celda = doc.sections[0].header.add_table(1, 2, doc.sections[0].page_width).cell(0, 0)
+        celda.paragraphs[0].text = "[LOGO_ANUAL]"
+
+        DocumentService._reemplazar_encabezado(doc, membrete)
+
+        imagenes = [
+            parte for parte in doc.part.package.iter_parts()
+            if parte.partname.startswith("/word/media/")
+        ]
+        self.assertEqual(len(imagenes), 1)
+        with Image.open(io.BytesIO(imagenes[0].blob)) as imagen:
+            self.assertEqual(imagen.height, 300)
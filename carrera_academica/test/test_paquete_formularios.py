@@ -0,0 +1,171 @@
+# carrera_academica/test/test_paquete_formularios.py
+"""
+Tests para la generación masiva de formularios anuales.
+"""
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from docx import Document
+from PIL import Image
+
+from carrera_academica.models import CarreraAcademica, MembreteAnual, PlantillaDocumento
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.paquete_service import PaqueteFormulariosService
+from carrera_academica.services.template_cache import TemplateCache
+from planta_docente.models import Asignatura, Cargo, Docente
+
+
+class PaqueteFormulariosTestCase(TestCase):
+    """Tests del generador de paquetes ZIP por docente."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        DocumentService.invalidar_cache_recursos()
+        TemplateCache.invalidar()
+
+        self.crear_plantillas(["F04", "F05", "F06", "F07", "ENC"])
+        logo = io.BytesIO()
+        Image.new("RGB", (600, 600), "white").save(logo, "PNG")
+        MembreteAnual.objects.create(
+            anio=2024, frase="Año de prueba",
+            logo=SimpleUploadedFile("logo.png", logo.getvalue()),
+        )
+
+        self.perez = self.crear_docente("juan", "perez", 1)
+        self.gomez = self.crear_docente("ana", "gomez", 2)
+        self.crear_ca(self.perez, "hidraulica")
+        self.crear_ca(self.perez, "topografia")
+        self.crear_ca(self.gomez, "estructuras")
+        self.crear_ca(self.crear_docente("luis", "diaz", 3), "geotecnia", estado="FIN")
+
+        self.destino = os.path.join(self.media_root, "paquetes")
+
+    def tearDown(self):
+        DocumentService.invalidar_cache_recursos()
+        TemplateCache.invalidar()
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def crear_plantillas(self, tipos):
+        for tipo in tipos:
+            doc = Document()
+            tabla = doc.sections[0].header.add_table(1, 2, doc.sections[0].page_width)
+            tabla.cell(0, 0).paragraphs[0].text = "[LOGO_ANUAL]"
+            tabla.cell(0, 1).paragraphs[0].text = "[FRASE_ANUAL]"
+            doc.add_paragraph(f"{tipo} [DOCENTE_NOMBRE] - [ASIGNATURA]")
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            plantilla = PlantillaDocumento(tipo_formulario=tipo)
+            plantilla.archivo.save(f"{tipo}.docx", ContentFile(buffer.getvalue()))
+
+    def crear_docente(self, nombre, apellido, numero):
+        return Docente.objects.create(
+            nombre=nombre, apellido=apellido, documento=20000000 + numero,
+            legajo=2000 + numero, fecha_nacimiento=date(1980, 1, 1),
+        )
+
+    def nombre_zip(self, docente):
+        return f"formularios_2024_{docente.pk}_{docente.apellido}-{docente.nombre}.zip"
+
+    def crear_ca(self, docente, nombre_asignatura, estado="ACT"):
+        asignatura = Asignatura.objects.create(
+            nombre=nombre_asignatura, nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        cargo = Cargo.objects.create(
+            docente=docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=date(2023, 1, 1), fecha_vencimiento=date(2026, 1, 1),
+        )
+        ca = CarreraAcademica.objects.create(
+            cargo=cargo, fecha_inicio=date(2023, 1, 1),
+            fecha_vencimiento_original=date(2026, 1, 1),
+            fecha_vencimiento_actual=date(2026, 1, 1),
+        )
+        if estado != "ACT":
+            CarreraAcademica.objects.filter(pk=ca.pk).update(estado=estado)
+        return ca
+
+    def test_un_zip_por_docente_activo(self):
+        """Se genera un ZIP por docente con CA activa y sus cinco formularios."""
+        resultado = PaqueteFormulariosService.generar_paquetes(
+            2024, self.destino, workers=2)
+
+        self.assertEqual(resultado["errores"], [])
+        self.assertEqual(
+            [os.path.basename(p) for p in resultado["paquetes"]],
+            sorted([self.nombre_zip(self.gomez), self.nombre_zip(self.perez)]),
+        )
+        # Perez tiene dos CA: 10 formularios; Gomez 5
+        self.assertEqual(resultado["documentos"], 15)
+
+        with zipfile.ZipFile(os.path.join(self.destino, self.nombre_zip(self.gomez))) as zf:
+            nombres = sorted(zf.namelist())
+            self.assertEqual(len(nombres), 5)
+            self.assertIn("F04_2024_gomez-ana.docx", nombres)
+
+            doc = Document(io.BytesIO(zf.read("F04_2024_gomez-ana.docx")))
+            self.assertEqual(doc.paragraphs[0].text, "F04 GOMEZ, Ana - Estructuras")
+
+    def test_varias_ca_en_carpetas_por_asignatura(self):
+        """Si el docente tiene varias CA, cada una va en su carpeta."""
+        PaqueteFormulariosService.generar_paquetes(2024, self.destino, workers=2)
+
+        with zipfile.ZipFile(os.path.join(self.destino, self.nombre_zip(self.perez))) as zf:
+            carpetas = {nombre.split("/")[0] for nombre in zf.namelist()}
+
+        self.assertEqual(carpetas, {"hidraulica", "topografia"})
+
+    def test_docentes_homonimos(self):
+        """Dos docentes con el mismo nombre reciben cada uno su propio ZIP."""
+        homonimo = self.crear_docente("ana", "gomez", 4)
+        self.crear_ca(homonimo, "mecanica")
+
+        resultado = PaqueteFormulariosService.generar_paquetes(
+            2024, self.destino, workers=3)
+
+        self.assertEqual(resultado["errores"], [])
+        self.assertEqual(len(resultado["paquetes"]), 3)
+        for docente, asignatura in ((self.gomez, "Estructuras"), (homonimo, "Mecanica")):
+            with zipfile.ZipFile(os.path.join(self.destino, self.nombre_zip(docente))) as zf:
+                self.assertEqual(len(zf.namelist()), 5)
+                doc = Document(io.BytesIO(zf.read("F04_2024_gomez-ana.docx")))
+                self.assertEqual(doc.paragraphs[0].text, f"F04 GOMEZ, Ana - {asignatura}")
+
+    def test_plantilla_guardada_con_problemas_se_incluye(self):
+        """Una plantilla ya cargada con errores de validación se genera igual."""
+        plantilla = PlantillaDocumento.objects.get(tipo_formulario="F04")
+        PlantillaDocumento.objects.filter(pk=plantilla.pk).update(
+            manifest=dict(plantilla.manifest, errores=["Faltan marcadores obligatorios"]))
+        DocumentService.invalidar_cache_recursos()
+
+        resultado = PaqueteFormulariosService.generar_paquetes(2024, self.destino)
+
+        self.assertEqual(resultado["errores"], [])
+        self.assertEqual(resultado["documentos"], 15)
+
+    def test_reporta_tipos_sin_plantilla(self):
+        """Los tipos sin plantilla se informan y el resto se genera igual."""
+        PlantillaDocumento.objects.filter(tipo_formulario="ENC").delete()
+
+        resultado = PaqueteFormulariosService.generar_paquetes(2024, self.destino)
+
+        self.assertEqual(resultado["documentos"], 12)
+        self.assertEqual(len(resultado["errores"]), 1)
+        self.assertIn("ENC", resultado["errores"][0])
+
+    def test_anio_sin_membrete(self):
+        """Sin membrete para el año no se genera ningún paquete."""
+        resultado = PaqueteFormulariosService.generar_paquetes(2025, self.destino)
+
+        self.assertEqual(resultado["paquetes"], [])
+        self.assertEqual(resultado["documentos"], 0)
@@ -0,0 +1,99 @@
+# carrera_academica/test/test_placeholder_engine.py
+"""
+Tests para el motor de reemplazo de marcadores en documentos Word.
+"""
+from django.conf import settings
+from django.test import SimpleTestCase
+from docx import Document
+
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+from carrera_academica.services.template_cache import TemplateCache
+
+
+class PlaceholderEngineTestCase(SimpleTestCase):
+    """Tests del indexado y reemplazo en una sola pasada."""
+
+    def crear_documento(self):
+        """Documento con marcadores partidos, tablas, encabezado y pie."""
+        doc = Document()
+
+        p = doc.add_paragraph()
+        p.add_run("Docente: [")
+        p.add_run("DOCENTE_").bold = True
+        p.add_run("NOMBRE] - [ANIO_LECTIVO]")
+
+        tabla = doc.add_table(rows=1, cols=2)
+        tabla.cell(0, 0).text = "[ASIGNATURA]"
+        tabla.cell(0, 1).text = "[DESCONOCIDO]"
+
+        doc.sections[0].header.paragraphs[0].text = "Frase: [FRASE_ANUAL]"
+        doc.sections[0].footer.paragraphs[0].text = "Generado el [FECHA_GENERACION]"
+        return doc
+
+    def test_reemplaza_marcador_partido_en_runs(self):
+        """Un marcador partido en varios runs se reemplaza completo."""
+        doc = self.crear_documento()
+
+        PlaceholderEngine.reemplazar(doc, {
+            "[DOCENTE_NOMBRE]": "PEREZ, Juan",
+            "[ANIO_LECTIVO]": "2024",
+        })
+
+        parrafo = doc.paragraphs[0]
+        self.assertEqual(parrafo.text, "Docente: PEREZ, Juan - 2024")
+        # El texto nuevo queda en el primer run del marcador
+        self.assertEqual(parrafo.runs[0].text, "Docente: PEREZ, Juan")
+
+    def test_tablas_encabezados_y_pies(self):
+        """Se reemplazan marcadores fuera del cuerpo principal."""
+        doc = self.crear_documento()
+
+        PlaceholderEngine.reemplazar(doc, {
+            "[ASIGNATURA]": "Hidráulica",
+            "[FRASE_ANUAL]": "Año de prueba",
+            "[FECHA_GENERACION]": "01/01/2024",
+        })
+
+        self.assertEqual(doc.tables[0].cell(0, 0).text, "Hidráulica")
+        self.assertEqual(
+            doc.sections[0].header.paragraphs[0].text, "Frase: Año de prueba")
+        self.assertEqual(
+            doc.sections[0].footer.paragraphs[0].text, "Generado el 01/01/2024")
+
+    def test_marcadores_sin_valor_quedan_intactos(self):
+        """Los marcadores que no están en los reemplazos no se tocan."""
+        doc = self.crear_documento()
+
+        PlaceholderEngine.reemplazar(doc, {"[ASIGNATURA]": "Topografía"})
+
+        self.assertEqual(doc.tables[0].cell(0, 1).text, "[DESCONOCIDO]")
+
+    def test_indice_reutilizable_en_copias(self):
+        """El índice de una plantilla sirve para cualquier copia de ella."""
+        plantilla = self.crear_documento()
+        indice = PlaceholderEngine.indexar(plantilla)
+
+        self.assertIn("[DOCENTE_NOMBRE]", PlaceholderEngine.marcadores(indice))
+
+        for nombre in ("Uno", "Dos"):
+            copia = TemplateCache.copiar(plantilla)
+            PlaceholderEngine.aplicar(copia, indice, {"[DOCENTE_NOMBRE]": nombre})
+            self.assertTrue(copia.paragraphs[0].text.startswith(f"Docente: {nombre}"))
+
+        # La plantilla original no se modifica
+        self.assertIn("[DOCENTE_NOMBRE]", plantilla.paragraphs[0].text)
+
+    def test_planilla_evaluacion_real(self):
+        """La planilla de equivalencias tiene marcadores partidos en runs."""
+        doc = Document(settings.BASE_DIR / "templates_word" / "planilla_evaluacion.docx")
+
+        reemplazados = PlaceholderEngine.reemplazar(doc, {
+            "[fecha]": "1 de Enero de 2024",
+            "[alumno]": "Ana Gómez",
+            "[asignatura]": "Física I",
+        })
+
+        self.assertGreaterEqual(reemplazados, 3)
+        textos = [p.text for p in doc.paragraphs]
+        self.assertIn("SOLICITANTE: Ana Gómez", textos)
+        self.assertEqual(doc.tables[0].rows[1].cells[0].text, "Física I")
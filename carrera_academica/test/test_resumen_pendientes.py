@@ -0,0 +1,111 @@
+# carrera_academica/test/test_resumen_pendientes.py
+"""
+Tests para el resumen de formularios pendientes por docente.
+"""
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from carrera_academica.models import CarreraAcademica
+from carrera_academica.services.email_service import EmailService
+from notificaciones.models import CorreoSaliente
+from planta_docente.models import Asignatura, Cargo, Correo, Docente
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    RECORDATORIO_INTERVALO_DIAS=7,
+    OUTBOX_MAX_POR_MINUTO=0,
+)
+class ResumenPendientesTestCase(TestCase):
+    """Tests de agrupación por docente y del intervalo entre resúmenes."""
+
+    def setUp(self):
+        self.docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        Correo.objects.create(docente=self.docente, email="juan@frlp.utn.edu.ar", principal=True)
+
+        for nombre in ["hidraulica", "estructuras"]:
+            self.crear_ca(self.docente, nombre)
+
+    def crear_ca(self, docente, asignatura):
+        asignatura = Asignatura.objects.create(
+            nombre=asignatura, nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        cargo = Cargo.objects.create(
+            docente=docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=date(2025, 1, 1), fecha_vencimiento=date(2028, 1, 1),
+        )
+        return CarreraAcademica.objects.create(
+            cargo=cargo, fecha_inicio=date(2025, 1, 1),
+            fecha_vencimiento_original=date(2028, 1, 1),
+            fecha_vencimiento_actual=date(2028, 1, 1),
+        )
+
+    def test_un_resumen_por_docente(self):
+        """Las dos CA del docente van en un único correo."""
+        with mock.patch("django.utils.timezone.localdate", return_value=date(2026, 6, 1)):
+            resultado = EmailService.encolar_resumenes_pendientes()
+
+        self.assertEqual(resultado["encolados"], 1)
+        correo = CorreoSaliente.objects.get()
+        self.assertEqual(correo.destinatarios, ["juan@frlp.utn.edu.ar"])
+        self.assertIn("Hidraulica", correo.cuerpo)
+        self.assertIn("Estructuras", correo.cuerpo)
+        self.assertIn("- F04 2026", correo.cuerpo)
+        # Los formularios de años futuros todavía no se recuerdan
+        self.assertNotIn("2027", correo.cuerpo)
+
+    def test_consultas_constantes(self):
+        """Agregar docentes no agrega consultas de lectura."""
+        for i in range(3):
+            otro = Docente.objects.create(
+                nombre=f"docente{i}", apellido="gomez", documento=30000000 + i,
+                legajo=2000 + i, fecha_nacimiento=date(1980, 1, 1),
+            )
+            Correo.objects.create(docente=otro, email=f"d{i}@frlp.utn.edu.ar", principal=True)
+            self.crear_ca(otro, f"asignatura {i}")
+
+        ContentType.objects.get_for_model(Docente)  # caché de content types
+        with mock.patch(
+            "notificaciones.services.outbox_service.OutboxService.encolar"
+        ) as encolar:
+            # Formularios, correos principales y últimos resúmenes
+            with self.assertNumQueries(3):
+                EmailService.encolar_resumenes_pendientes()
+
+        self.assertEqual(encolar.call_count, 4)
+
+    def test_respeta_el_intervalo(self):
+        """Un docente recordado hace menos de N días no recibe otro resumen."""
+        EmailService.encolar_resumenes_pendientes()
+
+        resultado = EmailService.encolar_resumenes_pendientes()
+        self.assertEqual((resultado["encolados"], resultado["omitidos"]), (0, 1))
+
+        CorreoSaliente.objects.update(fecha_creacion=timezone.now() - timedelta(days=8))
+        self.assertEqual(EmailService.encolar_resumenes_pendientes()["encolados"], 1)
+
+    def test_docente_sin_correo(self):
+        """Se informa a los docentes sin correo principal."""
+        self.docente.correos.all().delete()
+
+        resultado = EmailService.encolar_resumenes_pendientes()
+
+        self.assertEqual(resultado["sin_correo"], [str(self.docente)])
+        self.assertFalse(CorreoSaliente.objects.exists())
+
+    def test_comando_encola_y_envia(self):
+        """El comando con --enviar procesa la cola en la misma ejecución."""
+        call_command("enviar_resumen_pendientes", "--enviar", stdout=mock.Mock())
+
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,87 @@
+# carrera_academica/test/test_template_cache.py
+"""
+Tests para la caché de plantillas Word y de recursos de DocumentService.
+"""
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+from docx import Document
+
+from carrera_academica.models import PlantillaDocumento
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.template_cache import TemplateCache
+
+
+class TemplateCacheTestCase(TestCase):
+    """Tests de la caché de documentos parseados."""
+
+    def setUp(self):
+        TemplateCache.invalidar()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "plantilla.docx")
+        doc = Document()
+        doc.add_paragraph("Hola [DOCENTE_NOMBRE]")
+        doc.save(self.path)
+
+    def tearDown(self):
+        TemplateCache.invalidar()
+        self.tmpdir.cleanup()
+
+    def test_parsea_una_sola_vez(self):
+        """Pedidos repetidos no vuelven a parsear el archivo."""
+        with mock.patch(
+            "carrera_academica.services.template_cache.Document",
+            wraps=Document,
+        ) as parser:
+            TemplateCache.obtener_documento(self.path)
+            TemplateCache.obtener_documento(self.path)
+
+        self.assertEqual(parser.call_count, 1)
+
+    def test_copias_independientes(self):
+        """Modificar una copia no afecta a la plantilla cacheada."""
+        copia = TemplateCache.obtener_documento(self.path)
+        copia.paragraphs[0].text = "modificado"
+
+        otra = TemplateCache.obtener_documento(self.path)
+        self.assertEqual(otra.paragraphs[0].text, "Hola [DOCENTE_NOMBRE]")
+
+    def test_reparsea_si_cambia_el_archivo(self):
+        """Un cambio de fecha de modificación invalida la entrada."""
+        TemplateCache.obtener_documento(self.path)
+
+        doc = Document()
+        doc.add_paragraph("Nueva versión")
+        doc.save(self.path)
+        mtime = os.path.getmtime(self.path) + 10
+        os.utime(self.path, (mtime, mtime))
+
+        copia = TemplateCache.obtener_documento(self.path)
+        self.assertEqual(copia.paragraphs[0].text, "Nueva versión")
+
+
+class DocumentServiceRecursosTestCase(TestCase):
+    """Tests de la caché de plantilla/membrete por (tipo, año)."""
+
+    def setUp(self):
+        DocumentService.invalidar_cache_recursos()
+
+    def test_segunda_busqueda_sin_queries(self):
+        """La segunda búsqueda del mismo (tipo, año) no consulta la base."""
+        DocumentService._obtener_recursos("F04", 2024)
+
+        with self.assertNumQueries(0):
+            DocumentService._obtener_recursos("F04", 2024)
+
+    def test_signal_invalida_cache(self):
+        """Guardar una plantilla invalida la caché."""
+        plantilla, _ = DocumentService._obtener_recursos("F04", 2024)
+        self.assertIsNone(plantilla)
+
+        nueva = PlantillaDocumento.objects.create(
+            tipo_formulario="F04", archivo="plantillas_documentos/f04.docx")
+
+        plantilla, _ = DocumentService._obtener_recursos("F04", 2024)
+        self.assertEqual(plantilla, nueva)
@@ -0,0 +1,191 @@
+# carrera_academica/test/test_template_manifest.py
+"""
+Tests para el manifiesto de marcadores de PlantillaDocumento.
+"""
+import importlib
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from docx import Document
+
+from carrera_academica.models import PlantillaDocumento
+from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+from carrera_academica.services.template_cache import TemplateCache
+from carrera_academica.services.template_manifest import (
+    MARCADORES_CUERPO,
+    TemplateManifest,
+)
+
+
+def plantilla_docx(cuerpo="[DOCENTE_NOMBRE] - [ASIGNATURA]", encabezado=True):
+    """Genera una plantilla .docx en memoria."""
+    doc = Document()
+    if encabezado:
+        tabla = doc.sections[0].header.add_table(2, 2, doc.sections[0].page_width)
+        tabla.cell(0, 0).paragraphs[0].text = "[LOGO_ANUAL]"
+        tabla.cell(1, 1).paragraphs[0].text = "Frase: [FRASE_ANUAL]"
+    doc.add_paragraph(cuerpo)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class TemplateManifestTestCase(TestCase):
+    """Tests del análisis y la validación de plantillas."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        TemplateCache.invalidar()
+
+    def tearDown(self):
+        TemplateCache.invalidar()
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def crear_plantilla(self, contenido, tipo="F04"):
+        plantilla = PlantillaDocumento(
+            tipo_formulario=tipo,
+            archivo=SimpleUploadedFile("plantilla.docx", contenido),
+        )
+        plantilla.full_clean()
+        plantilla.save()
+        return plantilla
+
+    def test_manifiesto_de_plantilla_valida(self):
+        """Se guardan marcadores, índice y posiciones del encabezado."""
+        plantilla = self.crear_plantilla(plantilla_docx())
+        plantilla.refresh_from_db()
+
+        manifest = plantilla.manifest
+        self.assertEqual(manifest["archivo"], plantilla.archivo.name)
+        self.assertEqual(manifest["errores"], [])
+        self.assertEqual(
+            manifest["marcadores"],
+            ["[ASIGNATURA]", "[DOCENTE_NOMBRE]", "[FRASE_ANUAL]", "[LOGO_ANUAL]"],
+        )
+        self.assertEqual(manifest["encabezado"]["filas"], 2)
+        self.assertEqual(manifest["encabezado"]["logo"], [0, 0, 0])
+        self.assertEqual(manifest["encabezado"]["frase"], [1, 1, 0])
+        self.assertIsNotNone(TemplateManifest.vigente(plantilla))
+
+    def test_rechaza_plantilla_sin_marcadores_obligatorios(self):
+        """Falta [DOCENTE_NOMBRE]: la plantilla no pasa la validación."""
+        with self.assertRaises(ValidationError) as contexto:
+            self.crear_plantilla(plantilla_docx(cuerpo="[ASIGNATURA]"))
+
+        self.assertIn("[DOCENTE_NOMBRE]", str(contexto.exception.message_dict["archivo"]))
+
+    def test_rechaza_marcadores_desconocidos(self):
+        """Un marcador mal escrito quedaría sin reemplazar en los documentos."""
+        with self.assertRaises(ValidationError) as contexto:
+            self.crear_plantilla(plantilla_docx(cuerpo="[DOCENTE_NOMBRE] [ASIGANTURA]"))
+
+        self.assertIn(
+            "[ASIGANTURA] (¿[ASIGNATURA]?)", str(contexto.exception.message_dict["archivo"]))
+
+    def test_acepta_casillas_entre_corchetes(self):
+        """Texto como "[X]" o "[SI]" no es un marcador: se acepta con una advertencia."""
+        plantilla = self.crear_plantilla(
+            plantilla_docx(cuerpo="[DOCENTE_NOMBRE] Regular: [SI] [NO] [X]"))
+
+        self.assertEqual(plantilla.manifest["errores"], [])
+        self.assertEqual(
+            plantilla.manifest["advertencias"],
+            ["Texto entre corchetes que no se reemplaza: [NO], [SI], [X]."],
+        )
+        self.assertIsNotNone(TemplateManifest.vigente(plantilla))
+
+    def test_migracion_calcula_manifiesto_de_plantillas_existentes(self):
+        """Las plantillas cargadas antes del manifiesto lo obtienen al migrar."""
+        plantilla = self.crear_plantilla(plantilla_docx())
+        PlantillaDocumento.objects.filter(pk=plantilla.pk).update(manifest={})
+        migracion = importlib.import_module(
+            "carrera_academica.migrations.0006_llenar_manifest_plantillas")
+
+        migracion.llenar_manifest(apps, None)
+
+        plantilla.refresh_from_db()
+        self.assertIsNotNone(TemplateManifest.vigente(plantilla))
+        self.assertIn("[DOCENTE_NOMBRE]", plantilla.manifest["marcadores"])
+
+    def test_rechaza_plantilla_sin_tabla_de_encabezado(self):
+        """El membrete necesita la tabla del encabezado."""
+        with self.assertRaises(ValidationError):
+            self.crear_plantilla(plantilla_docx(encabezado=False))
+
+    def test_rechaza_archivo_que_no_es_docx(self):
+        """Un archivo que no es Word se rechaza al guardar."""
+        with self.assertRaises(ValidationError):
+            self.crear_plantilla(b"no es un docx")
+
+    def test_plantilla_estatica_no_requiere_marcadores(self):
+        """F02 se descarga tal cual: no se validan marcadores."""
+        plantilla = self.crear_plantilla(plantilla_docx(cuerpo="Texto fijo", encabezado=False), tipo="F02")
+
+        self.assertEqual(plantilla.manifest["errores"], [])
+
+    def test_reemplazar_archivo_actualiza_manifiesto(self):
+        """Un archivo nuevo recalcula el manifiesto."""
+        plantilla = self.crear_plantilla(plantilla_docx())
+
+        plantilla.archivo = SimpleUploadedFile(
+            "nueva.docx", plantilla_docx(cuerpo="[DOCENTE_NOMBRE] [CARGO]"))
+        plantilla.save()
+
+        self.assertIn("[CARGO]", plantilla.manifest["marcadores"])
+        self.assertEqual(plantilla.manifest["archivo"], plantilla.archivo.name)
+
+    def test_renderizado_usa_el_indice_del_manifiesto(self):
+        """Con manifiesto vigente no se recorre la plantilla buscando marcadores."""
+        plantilla = self.crear_plantilla(plantilla_docx())
+
+        with mock.patch.object(
+            PlaceholderEngine, "indexar", wraps=PlaceholderEngine.indexar
+        ) as indexar:
+            doc, indice = TemplateCache.obtener_con_indice(
+                plantilla.archivo.path, TemplateManifest.vigente(plantilla)["indice"])
+
+        indexar.assert_not_called()
+        self.assertEqual(indice, plantilla.manifest["indice"])
+
+    def test_plantilla_guardada_con_problemas_se_sigue_generando(self):
+        """Una plantilla ya cargada que no pasa la validación se genera sin el manifiesto."""
+        plantilla = PlantillaDocumento(tipo_formulario="F04")
+        plantilla.archivo.save(
+            "vieja.docx", ContentFile(plantilla_docx(cuerpo="[ASIGNATURA]", encabezado=False)))
+        self.assertTrue(plantilla.manifest["errores"])
+        self.assertIsNone(TemplateManifest.vigente(plantilla))
+        formulario = mock.Mock(pk=1, tipo_formulario="F04", anio_correspondiente=2024)
+
+        with mock.patch.object(
+            DocumentService, "_obtener_recursos", return_value=(plantilla, mock.Mock())
+        ), mock.patch.object(
+            DocumentService, "_clave_documento", return_value="clave"
+        ), mock.patch.object(
+            DocumentService, "_nombre_archivo", return_value="F04.docx"
+        ), mock.patch.object(
+            DocumentService, "renderizar", return_value=(io.BytesIO(b"docx"), "F04.docx")
+        ) as renderizar, self.assertLogs(
+            "carrera_academica.services.document_service", "WARNING"
+        ):
+            buffer, nombre = DocumentService.generar_documento_dinamico(formulario)
+
+        renderizar.assert_called_once()
+        self.assertEqual((buffer.getvalue(), nombre), (b"docx", "F04.docx"))
+
+    def test_marcadores_del_cuerpo_coinciden_con_el_contexto(self):
+        """El contrato de marcadores es el que DocumentService reemplaza."""
+        contexto = DocumentService._preparar_contexto_reemplazo(
+            mock.Mock(anio_correspondiente=2024), mock.MagicMock())
+
+        self.assertEqual(set(contexto), set(MARCADORES_CUERPO))
@@ -59,6 +59,16 @@ urlpatterns = [
         views.notificar_junta_view,
         name="notificar_junta",
     ),
+    path(
+        "evaluacion/<int:pk>/reenviar_junta/",
+        views.reenviar_junta_view,
+        name="reenviar_junta",
+    ),
+    path(
+        "documentacion/<str:token>/",
+        views.documentacion_junta_view,
+        name="documentacion_junta",
+    ),
     path(
         "evaluacion/<int:pk>/agendar/",
         views.agendar_evaluacion_view,
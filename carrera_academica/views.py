@@ -9,9 +9,16 @@ import logging
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core import signing
 from django.core.mail import EmailMessage
 from django.db.models import Count, Q, Max
-from django.http import HttpResponse, FileResponse, JsonResponse
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseGone,
+    JsonResponse,
+)
 from django.shortcuts import render, get_object_or_404, redirect
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -41,9 +48,11 @@ from .forms import (
     ExpedienteForm,
     EvaluacionForm,
 )
+from carrera_academica.services.documentacion_service import DocumentacionJuntaService
 from carrera_academica.services.email_service import EmailService
 from carrera_academica.services.pdf_service import PDFService
 from carrera_academica.services.document_service import DocumentService
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
 
 logger = logging.getLogger(__name__)
 
@@ -51,25 +60,11 @@ logger = logging.getLogger(__name__)
 
 def replace_text_in_doc(doc, replacements):
     """
-    Busca y reemplaza texto en párrafos y tablas, conservando el formato.
+    Busca y reemplaza texto en párrafos, tablas, encabezados y pies,
+    conservando el formato (aunque el marcador esté partido en varios runs).
     `replacements` es un diccionario con {marcador: texto_nuevo}.
     """
-    # Recorremos todos los párrafos del cuerpo del documento
-    for p in doc.paragraphs:
-        for run in p.runs:
-            for old_text, new_text in replacements.items():
-                if old_text in run.text:
-                    run.text = run.text.replace(old_text, new_text)
-
-    # Recorremos todas las tablas del cuerpo del documento
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    for run in p.runs:
-                        for old_text, new_text in replacements.items():
-                            if old_text in run.text:
-                                run.text = run.text.replace(old_text, new_text)
+    PlaceholderEngine.reemplazar(doc, replacements)
 
 
 @login_required
@@ -616,9 +611,7 @@ def notificar_pendientes_view(request, pk):
 def descargar_plantilla_view(request, pk):
     """Vista para descargar plantilla de formulario."""
     formulario = get_object_or_404(Formulario, pk=pk)
-    tipos_dinamicos = ["F06", "F07", "F13", "ENC", "F04", "F05"]
-
-    if formulario.tipo_formulario in tipos_dinamicos:
+    if formulario.tipo_formulario in DocumentService.TIPOS_DINAMICOS:
         buffer, filename = DocumentService.generar_documento_dinamico(
             formulario)
 
@@ -652,17 +645,37 @@ def descargar_plantilla_view(request, pk):
 
 @login_required
 def notificar_junta_view(request, pk):
-    """Vista para notificar a la junta evaluadora."""
+    """Vista para notificar a la junta evaluadora (a todos sus miembros)."""
+    return _notificar_junta(request, pk, omitir_notificados=False)
+
+
+@login_required
+def reenviar_junta_view(request, pk):
+    """Reenvía la convocatoria solo a los miembros que no la recibieron."""
+    return _notificar_junta(request, pk, omitir_notificados=True)
+
+
+def _notificar_junta(request, pk, omitir_notificados):
     evaluacion = get_object_or_404(Evaluacion, pk=pk)
     ca = evaluacion.carrera_academica
 
-    emails_enviados, errores = EmailService.enviar_notificacion_junta(
-        evaluacion)
+    emails_enviados, omitidos, errores = EmailService.enviar_notificacion_junta(
+        evaluacion,
+        base_url=request.build_absolute_uri("/"),
+        omitir_notificados=omitir_notificados,
+    )
 
     if emails_enviados > 0:
         messages.success(
             request,
-            f"Se han enviado {emails_enviados} correos a los miembros de la junta."
+            f"Se encolaron {emails_enviados} correos a los miembros de la junta; "
+            "se enviarán en unos instantes."
+        )
+
+    if omitidos:
+        messages.info(
+            request,
+            f"Se omitieron {omitidos} miembros que ya habían recibido la convocatoria."
         )
 
     for error in errores:
@@ -671,6 +684,34 @@ def notificar_junta_view(request, pk):
     return redirect("detalle_ca", pk=ca.pk)
 
 
+def documentacion_junta_view(request, token):
+    """
+    Descarga (ZIP) de la documentación de una evaluación para la junta.
+
+    Es pública porque la usan miembros externos: el acceso lo da el token
+    firmado del enlace enviado por correo, que vence a los JUNTA_ENLACE_DIAS.
+    """
+    try:
+        evaluacion_pk = DocumentacionJuntaService.leer_enlace(token)
+    except signing.SignatureExpired:
+        return HttpResponseGone("El enlace de descarga venció. Solicite uno nuevo al Departamento.")
+    except signing.BadSignature:
+        return HttpResponseForbidden("Enlace de descarga inválido.")
+
+    evaluacion = get_object_or_404(
+        Evaluacion.objects.select_related("carrera_academica__cargo__docente"),
+        pk=evaluacion_pk,
+    )
+    ca = evaluacion.carrera_academica
+    documentos = EmailService._obtener_documentos_pertinentes(ca, evaluacion.anios_evaluados)
+
+    return FileResponse(
+        DocumentacionJuntaService.generar_zip(documentos),
+        as_attachment=True,
+        filename=f"documentacion_{slugify(ca.cargo.docente)}.zip",
+    )
+
+
 @login_required
 def agendar_evaluacion_view(request, pk):
     # El 'pk' que recibimos es el de la Evaluación
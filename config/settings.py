@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     "planta_docente",
     "equivalencias",
     "carrera_academica",
+    "notificaciones",
     # Debug toolbar (solo en desarrollo)
     "debug_toolbar",
 ]
@@ -89,6 +90,17 @@ DATABASES = {
     }
 }
 
+# Caché. Con varios workers conviene una compartida (por ejemplo
+# django.core.cache.backends.redis.RedisCache o .db.DatabaseCache), así la
+# invalidación de las estadísticas de equivalencias llega a todos; la
+# LocMemCache por defecto es por proceso.
+CACHES = {
+    "default": {
+        "BACKEND": config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        "LOCATION": config('CACHE_LOCATION', default=''),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,12 +156,72 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('SMTP_PASS')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Bandeja de salida de correos (ver comando procesar_correos)
+# Intentos de envío antes de marcar un correo como fallido
+OUTBOX_MAX_INTENTOS = config('OUTBOX_MAX_INTENTOS', default=5, cast=int)
+# Espera antes del primer reintento; se duplica en cada fallo hasta el máximo
+OUTBOX_BACKOFF_SEGUNDOS = config('OUTBOX_BACKOFF_SEGUNDOS', default=60, cast=int)
+OUTBOX_BACKOFF_MAX_SEGUNDOS = config('OUTBOX_BACKOFF_MAX_SEGUNDOS', default=3600, cast=int)
+# Tiempo que un worker retiene un correo tomado; luego otro puede retomarlo.
+# Limita el tamaño de cada lote reclamado según OUTBOX_MAX_POR_MINUTO
+OUTBOX_BLOQUEO_SEGUNDOS = config('OUTBOX_BLOQUEO_SEGUNDOS', default=300, cast=int)
+# Mensajes enviados por cada conexión SMTP antes de reconectar (0: sin límite)
+OUTBOX_MENSAJES_POR_CONEXION = config('OUTBOX_MENSAJES_POR_CONEXION', default=25, cast=int)
+# Cupo de mensajes por minuto del proveedor (Office365: 30; 0: sin límite)
+OUTBOX_MAX_POR_MINUTO = config('OUTBOX_MAX_POR_MINUTO', default=30, cast=int)
+# Hilos de envío simultáneos del worker (cada uno con su conexión SMTP)
+OUTBOX_HILOS = config('OUTBOX_HILOS', default=4, cast=int)
+# Correos con adjuntos por encima de este total se codifican y envían por bloques
+OUTBOX_STREAMING_MIN_BYTES = config('OUTBOX_STREAMING_MIN_BYTES', default=5 * 1024 * 1024, cast=int)
+# Memoria máxima del mensaje armado para el envío por bloques (el resto va a disco)
+OUTBOX_SPOOL_BYTES = config('OUTBOX_SPOOL_BYTES', default=1024 * 1024, cast=int)
+# Documentación de juntas: por encima de este tamaño no se adjunta archivo por archivo
+JUNTA_ADJUNTOS_MAX_BYTES = config('JUNTA_ADJUNTOS_MAX_BYTES', default=15 * 1024 * 1024, cast=int)
+# "pdf": un PDF consolidado (si entra en el límite); "enlace": enlace firmado de descarga
+JUNTA_ADJUNTOS_MODO = config('JUNTA_ADJUNTOS_MODO', default='enlace')
+# Días de validez del enlace de descarga
+JUNTA_ENLACE_DIAS = config('JUNTA_ENLACE_DIAS', default=30, cast=int)
+# Directorio de los PDF consolidados para la junta. Fuera de MEDIA_ROOT: no
+# se sirve por /media/, solo se entrega como adjunto de los correos
+JUNTA_DOCUMENTACION_DIR = config(
+    'JUNTA_DOCUMENTACION_DIR', default=os.path.join(BASE_DIR, "privado", "documentacion_junta"))
+# Días mínimos entre resúmenes de formularios pendientes a un mismo docente
+RECORDATORIO_INTERVALO_DIAS = config('RECORDATORIO_INTERVALO_DIAS', default=7, cast=int)
+# Equivalencias: un solo correo por docente responsable con todas sus asignaturas
+EQUIVALENCIAS_AGRUPAR_POR_RESPONSABLE = config(
+    'EQUIVALENCIAS_AGRUPAR_POR_RESPONSABLE', default=True, cast=bool)
+# Solicitudes por página en el dashboard de equivalencias
+EQUIVALENCIAS_DASHBOARD_POR_PAGINA = config('EQUIVALENCIAS_DASHBOARD_POR_PAGINA', default=50, cast=int)
+# Segundos que se cachean las estadísticas del año en curso y del promedio
+# histórico, y las de años cerrados. Las escrituras invalidan al instante
+# el año afectado en la caché compartida; con una caché por proceso
+# (LocMemCache) los años cerrados también usan el TTL corto, porque la
+# invalidación no llega a los demás workers.
+EQUIVALENCIAS_ESTADISTICAS_TTL = config('EQUIVALENCIAS_ESTADISTICAS_TTL', default=300, cast=int)
+EQUIVALENCIAS_ESTADISTICAS_TTL_CERRADOS = config(
+    'EQUIVALENCIAS_ESTADISTICAS_TTL_CERRADOS', default=24 * 60 * 60, cast=int)
+# Cálculo de las estadísticas: "resumenes" (tablas de resumen mensual) o
+# "escaneo" (un recorrido de solicitudes y detalles agrupado con NumPy)
+EQUIVALENCIAS_ESTADISTICAS_MOTOR = config('EQUIVALENCIAS_ESTADISTICAS_MOTOR', default='resumenes')
+
 
 # Configuración para archivos subidos por el usuario (Media Files)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
+# Generación de documentos
+# Cantidad de plantillas Word parseadas que se mantienen en memoria
+DOCX_TEMPLATE_CACHE_SIZE = config('DOCX_TEMPLATE_CACHE_SIZE', default=16, cast=int)
+# Segundos que se cachea la búsqueda de plantilla/membrete por (tipo, año)
+DOCUMENT_RESOURCES_CACHE_TTL = config('DOCUMENT_RESOURCES_CACHE_TTL', default=300, cast=int)
+# Alto en píxeles del logo del membrete embebido (1.5" a 200 dpi)
+MEMBRETE_LOGO_ALTO_PX = config('MEMBRETE_LOGO_ALTO_PX', default=300, cast=int)
+# Caché en disco (bajo MEDIA_ROOT) de documentos DOCX/PDF ya generados
+DOCUMENT_ARTIFACT_CACHE_DIR = config('DOCUMENT_ARTIFACT_CACHE_DIR', default='cache_documentos')
+DOCUMENT_ARTIFACT_CACHE_BYTES = config('DOCUMENT_ARTIFACT_CACHE_BYTES', default=256 * 1024 * 1024, cast=int)
+
+
 # Security Settings (solo en producción)
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -47,8 +47,12 @@ class AsignaturaParaEquivalenciaAdmin(admin.ModelAdmin):
 
 class SolicitudEquivalenciaAdmin(admin.ModelAdmin):
     inlines = [DocumentoAdjuntoInline]
-    list_display = ('__str__', 'estado_general', 'fecha_inicio')
+    list_display = ('__str__', 'estado_general', 'progreso', 'fecha_inicio')
     list_filter = ('estado_general',)
+    readonly_fields = (
+        'cant_asignaturas', 'cant_respondidas', 'cant_aprobadas',
+        'cant_denegadas', 'cant_requiere_pc',
+    )
     search_fields = ('id_estudiante__nombre_completo',)
 
     # ✅ OPTIMIZACIÓN: Optimizar queries en el admin
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class EquivalenciasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "equivalencias"
+
+    def ready(self):
+        import equivalencias.signals
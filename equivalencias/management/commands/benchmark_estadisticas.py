@@ -0,0 +1,263 @@
+# equivalencias/management/commands/benchmark_estadisticas.py
+"""
+Comando para hacer benchmark de los motores de estadísticas de equivalencias.
+
+Carga solicitudes y detalles sintéticos en una base de datos temporal
+(igual que los tests), reconstruye los resúmenes mensuales y mide, para el
+promedio histórico y para el último año:
+
+- resumenes: EstadisticasService.calcular (tablas de resumen mensual)
+- escaneo: EstadisticasService.calcular_por_escaneo (un recorrido agrupado con NumPy)
+
+Informa tiempo, memoria pico de Python y consultas de cada motor, y
+verifica que ambos devuelvan el mismo resultado. Los resultados se
+escriben en JSON para comparar corridas entre versiones.
+"""
+import gc
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from equivalencias.models import (
+    AsignaturaParaEquivalencia,
+    DetalleSolicitud,
+    Estudiante,
+    SolicitudEquivalencia,
+)
+from equivalencias.services.estadisticas_service import EstadisticasService
+from planta_docente.models import Asignatura
+
+
+MOTORES = {
+    'resumenes': EstadisticasService.calcular,
+    'escaneo': EstadisticasService.calcular_por_escaneo,
+}
+
+ESTADOS = ["Aprobada", "Aprobada", "Denegada", "Requiere PC", "Enviada a Cátedra"]
+
+
+class Command(BaseCommand):
+    help = 'Compara los motores de estadísticas de equivalencias sobre datos sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--solicitudes', type=int, default=20000,
+            help='Cantidad de solicitudes sintéticas')
+        parser.add_argument(
+            '--asignaturas', type=int, default=60,
+            help='Cantidad de asignaturas para equivalencia')
+        parser.add_argument(
+            '--detalles', type=int, default=4,
+            help='Asignaturas por solicitud (promedio)')
+        parser.add_argument(
+            '--anios', type=int, default=6,
+            help='Años sobre los que se reparten las solicitudes')
+        parser.add_argument(
+            '--iteraciones', type=int, default=3,
+            help='Repeticiones por motor')
+        parser.add_argument(
+            '--motores', nargs='+', choices=list(MOTORES), default=list(MOTORES),
+            help='Motores a medir (por defecto, todos)')
+        parser.add_argument(
+            '--output', default='benchmark_estadisticas.json',
+            help='Ruta del archivo JSON de resultados')
+
+    def handle(self, *args, **options):
+        """Ejecuta el benchmark sobre una base de datos temporal."""
+        self.stdout.write(self.style.WARNING(
+            'Iniciando benchmark de estadísticas...\n'))
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            ultimo_anio = self.crear_datos_sinteticos(options)
+            results, coinciden = self.ejecutar_motores(ultimo_anio, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.print_results(results, coinciden)
+        self.write_json(results, coinciden, options)
+
+    # ------------------------------------------------------------------
+    # Datos sintéticos
+    # ------------------------------------------------------------------
+
+    def crear_datos_sinteticos(self, options):
+        """Crea solicitudes y detalles con bulk_create y reconstruye los resúmenes."""
+        rng = random.Random(42)
+        cantidad = max(options['solicitudes'], 1)
+        anios = max(options['anios'], 1)
+        ultimo_anio = timezone.now().year
+        primer_dia = timezone.make_aware(datetime(ultimo_anio - anios + 1, 1, 1))
+        dias = (timezone.now() - primer_dia).days or 1
+
+        self.stdout.write(f'Creando {cantidad} solicitudes sintéticas...')
+
+        asignaturas = Asignatura.objects.bulk_create([
+            Asignatura(
+                nombre=f"asignatura {i}", nivel="i", departamento="civil",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            for i in range(max(options['asignaturas'], 1))
+        ])
+        asignaturas = AsignaturaParaEquivalencia.objects.bulk_create([
+            AsignaturaParaEquivalencia(asignatura=asignatura) for asignatura in asignaturas
+        ])
+        estudiante = Estudiante.objects.create(
+            nombre_completo="Estudiante Benchmark", dni_pasaporte="99999999")
+
+        solicitudes = []
+        for _ in range(cantidad):
+            inicio = primer_dia + timedelta(days=rng.randrange(dias), seconds=rng.randrange(86400))
+            completada = rng.random() < 0.6
+            solicitudes.append(SolicitudEquivalencia(
+                id_estudiante=estudiante,
+                fecha_inicio=inicio,
+                estado_general="Completada" if completada else "En Proceso",
+                completada=completada,
+                fecha_completada=(
+                    inicio + timedelta(days=rng.randrange(5, 120)) if completada else None),
+            ))
+        solicitudes = SolicitudEquivalencia.objects.bulk_create(solicitudes, batch_size=2000)
+
+        detalles = []
+        for solicitud in solicitudes:
+            cantidad_detalles = rng.randint(1, max(2 * options['detalles'] - 1, 1))
+            elegidas = rng.sample(asignaturas, min(len(asignaturas), cantidad_detalles))
+            for asig_equiv in elegidas:
+                estado = rng.choice(ESTADOS)
+                dictaminada = estado not in ("Enviada a Cátedra", "Pendiente de envío")
+                detalles.append(DetalleSolicitud(
+                    id_solicitud=solicitud,
+                    id_asignatura=asig_equiv,
+                    estado_asignatura=estado,
+                    fecha_dictamen=(
+                        solicitud.fecha_inicio
+                        + timedelta(days=rng.randrange(1, 90), seconds=rng.randrange(86400))
+                        if dictaminada else None
+                    ),
+                ))
+        DetalleSolicitud.objects.bulk_create(detalles, batch_size=2000)
+        self.stdout.write(f'  {len(detalles)} detalles')
+
+        # bulk_create no dispara las signals que mantienen los resúmenes
+        EstadisticasService.reconstruir()
+        return ultimo_anio
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+
+    def ejecutar_motores(self, ultimo_anio, options):
+        """Mide cada motor seleccionado para el histórico y el último año."""
+        results = []
+        salidas = {}
+        for periodo in (None, ultimo_anio):
+            etiqueta = 'histórico' if periodo is None else str(periodo)
+            for nombre in options['motores']:
+                self.stdout.write(f'Midiendo {nombre} ({etiqueta})...')
+                resultado, salida = self.benchmark_motor(
+                    nombre, MOTORES[nombre], periodo, options['iteraciones'])
+                resultado['periodo'] = etiqueta
+                results.append(resultado)
+                salidas.setdefault(etiqueta, []).append(salida)
+
+        coinciden = all(
+            all(salida == grupo[0] for salida in grupo) for grupo in salidas.values()
+        )
+        return results, coinciden
+
+    def benchmark_motor(self, name, motor, anio, iterations):
+        """
+        Mide tiempo (sin tracemalloc activo, para no distorsionarlo) y
+        luego memoria pico y consultas en una corrida adicional trazada.
+        """
+        times = []
+        for _ in range(max(iterations, 1)):
+            gc.collect()
+            start = time.perf_counter()
+            motor(anio)
+            end = time.perf_counter()
+            times.append((end - start) * 1000)  # Convertir a ms
+
+        gc.collect()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as consultas:
+            salida = motor(anio)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'name': name,
+            'iterations': len(times),
+            'avg_time_ms': sum(times) / len(times),
+            'min_time_ms': min(times),
+            'max_time_ms': max(times),
+            'peak_memory_bytes': peak_memory,
+            'queries': len(consultas),
+        }, salida
+
+    # ------------------------------------------------------------------
+    # Salida
+    # ------------------------------------------------------------------
+
+    def print_results(self, results, coinciden):
+        """Imprime los resultados en formato tabla."""
+        self.stdout.write('\n' + '=' * 80)
+        self.stdout.write('RESULTADOS DEL BENCHMARK DE ESTADÍSTICAS')
+        self.stdout.write('=' * 80 + '\n')
+
+        self.stdout.write(
+            f"{'Motor':<14} {'Período':<12} {'Tiempo (ms)':>12} {'Memoria pico':>14} {'Consultas':>10}"
+        )
+        self.stdout.write('-' * 80)
+
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<14} "
+                f"{result['periodo']:<12} "
+                f"{result['avg_time_ms']:>12.2f} "
+                f"{result['peak_memory_bytes'] / 1024 / 1024:>11.2f} MB "
+                f"{result['queries']:>10}"
+            )
+
+        self.stdout.write('=' * 80)
+
+        if coinciden:
+            self.stdout.write(self.style.SUCCESS('\n✅ Todos los motores devolvieron lo mismo'))
+        else:
+            self.stdout.write(self.style.ERROR('\n✗ Los motores devolvieron resultados distintos'))
+
+    def write_json(self, results, coinciden, options):
+        """Escribe los resultados en JSON para comparar entre versiones."""
+        payload = {
+            'generated_at': timezone.now().isoformat(),
+            'parameters': {
+                key: options[key]
+                for key in ('solicitudes', 'asignaturas', 'detalles', 'anios', 'iteraciones')
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'platform': platform.platform(),
+            },
+            'resultados_coinciden': coinciden,
+            'results': results,
+        }
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✅ Resultados guardados en {options['output']}"))
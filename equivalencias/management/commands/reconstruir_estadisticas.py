@@ -0,0 +1,38 @@
+# equivalencias/management/commands/reconstruir_estadisticas.py
+"""
+Comando para reconstruir los resúmenes mensuales de estadísticas desde
+SolicitudEquivalencia y DetalleSolicitud (por ejemplo, tras cargas
+masivas, ediciones directas en la base o un cambio de TIME_ZONE).
+
+Uso:
+    python manage.py reconstruir_estadisticas
+    python manage.py reconstruir_estadisticas --verificar
+"""
+from django.core.management.base import BaseCommand
+
+from equivalencias.services.estadisticas_service import EstadisticasService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los resúmenes mensuales usados por las estadísticas de equivalencias'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar', action='store_true',
+            help='Solo informa cuántas filas de resumen están desfasadas, sin corregirlas')
+
+    def handle(self, *args, **options):
+        """Verifica o reconstruye y muestra un resumen."""
+        if options['verificar']:
+            distintas = EstadisticasService.verificar()
+            if distintas:
+                self.stdout.write(self.style.ERROR(
+                    f'✗ {distintas} filas de resumen desfasadas'))
+            else:
+                self.stdout.write(self.style.SUCCESS('✅ Los resúmenes están al día'))
+            return
+
+        solicitudes, dictamenes = EstadisticasService.reconstruir()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Resúmenes reconstruidos: {solicitudes} filas de solicitudes '
+            f'y {dictamenes} de dictámenes'))
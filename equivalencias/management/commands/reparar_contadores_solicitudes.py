@@ -0,0 +1,39 @@
+# equivalencias/management/commands/reparar_contadores_solicitudes.py
+"""
+Comando para reconstruir los contadores de asignaturas de las solicitudes
+desde DetalleSolicitud (por ejemplo, tras cargas masivas o ediciones
+directas en la base).
+
+Uso:
+    python manage.py reparar_contadores_solicitudes
+    python manage.py reparar_contadores_solicitudes --verificar
+"""
+from django.core.management.base import BaseCommand
+
+from equivalencias.services.contador_service import ContadoresSolicitudService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los contadores de asignaturas de cada solicitud de equivalencia'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verificar', action='store_true',
+            help='Solo informa las solicitudes con contadores desfasados, sin corregirlas')
+
+    def handle(self, *args, **options):
+        """Recalcula y muestra un resumen."""
+        verificar = options['verificar']
+        desfasadas = ContadoresSolicitudService.recalcular(guardar=not verificar)
+
+        for solicitud in desfasadas:
+            self.stdout.write(self.style.WARNING(f'  • {solicitud} ({solicitud.progreso})'))
+
+        if not desfasadas:
+            self.stdout.write(self.style.SUCCESS('✅ Todos los contadores están al día'))
+        elif verificar:
+            self.stdout.write(self.style.ERROR(
+                f'\n✗ {len(desfasadas)} solicitudes con contadores desfasados'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✅ Contadores reparados en {len(desfasadas)} solicitudes'))
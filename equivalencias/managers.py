@@ -2,11 +2,36 @@
 """
 Managers personalizados para equivalencias.
 """
-from django.db import models
+from django.db import connections, models
+
+# Estados de DetalleSolicitud que cuentan como asignatura ya dictaminada
+ESTADOS_FINALES = ["Aprobada", "Denegada", "Requiere PC"]
+
 
 class SolicitudEquivalenciaQuerySet(models.QuerySet):
     """QuerySet optimizado para SolicitudEquivalencia."""
 
+    def with_progreso(self):
+        """
+        Anota los conteos de asignaturas por estado calculados desde
+        DetalleSolicitud, en una sola consulta. Sirve para verificar o
+        reparar los contadores persistidos (el progreso usa los contadores).
+        """
+        def contar(*estados):
+            return models.Count(
+                'detallesolicitud',
+                filter=models.Q(detallesolicitud__estado_asignatura__in=estados),
+                distinct=True,
+            )
+
+        return self.annotate(
+            total_asignaturas=models.Count('detallesolicitud', distinct=True),
+            asignaturas_respondidas=contar(*ESTADOS_FINALES),
+            asignaturas_aprobadas=contar('Aprobada'),
+            asignaturas_denegadas=contar('Denegada'),
+            asignaturas_requiere_pc=contar('Requiere PC'),
+        )
+
     def with_related_data(self):
         """
         Precarga relaciones para el dashboard.
@@ -61,6 +86,36 @@ class SolicitudEquivalenciaQuerySet(models.QuerySet):
         """Filtra solo las solicitudes completadas."""
         return self.filter(estado_general='Completada')
 
+    def orden_dashboard(self):
+        """En proceso primero, luego por fecha (servido por sol_completada_fecha_idx)."""
+        return self.order_by('completada', 'fecha_inicio', 'id')
+
+    def despues_de(self, completada, fecha_inicio, pk):
+        """
+        Paginación por clave (keyset): las solicitudes que siguen a la dada
+        en `orden_dashboard()`, sin OFFSET.
+
+        Se compara por valor de fila, `(completada, fecha_inicio, id) > (...)`,
+        para que el motor lo resuelva como un rango sobre sol_completada_fecha_idx;
+        el OR equivalente (lo que genera el ORM en SQLite) termina en un SCAN.
+        """
+        conexion = connections[self.db]
+        tabla = conexion.ops.quote_name(self.model._meta.db_table)
+        campos = [self.model._meta.get_field(n) for n in ('completada', 'fecha_inicio', 'id')]
+        columnas = ", ".join(f"{tabla}.{conexion.ops.quote_name(c.column)}" for c in campos)
+        valores = [
+            campo.get_db_prep_value(valor, conexion)
+            for campo, valor in zip(campos, (completada, fecha_inicio, pk))
+        ]
+        return self.extra(where=[f"({columnas}) > (%s, %s, %s)"], params=valores)
+
+    def listas_para_acta(self):
+        """En proceso y con todas sus asignaturas dictaminadas (usa los contadores)."""
+        return self.en_proceso().filter(
+            cant_asignaturas__gt=0,
+            cant_respondidas=models.F('cant_asignaturas'),
+        )
+
 
 class SolicitudEquivalenciaManager(models.Manager):
     """Manager personalizado para SolicitudEquivalencia."""
@@ -68,6 +123,9 @@ class SolicitudEquivalenciaManager(models.Manager):
     def get_queryset(self):
         return SolicitudEquivalenciaQuerySet(self.model, using=self._db)
 
+    def with_progreso(self):
+        return self.get_queryset().with_progreso()
+
     def with_related_data(self):
         return self.get_queryset().with_related_data()
 
@@ -79,3 +137,6 @@ class SolicitudEquivalenciaManager(models.Manager):
 
     def completadas(self):
         return self.get_queryset().completadas()
+
+    def listas_para_acta(self):
+        return self.get_queryset().listas_para_acta()
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:53
+
+from django.db import migrations, models
+
+
+def calcular_contadores(apps, schema_editor):
+    """Inicializa los contadores desde los detalles existentes."""
+    SolicitudEquivalencia = apps.get_model('equivalencias', 'SolicitudEquivalencia')
+
+    def contar(*estados):
+        return models.Count(
+            'detallesolicitud',
+            filter=models.Q(detallesolicitud__estado_asignatura__in=estados),
+        )
+
+    solicitudes = list(SolicitudEquivalencia.objects.annotate(
+        total=models.Count('detallesolicitud'),
+        respondidas=contar('Aprobada', 'Denegada', 'Requiere PC'),
+        aprobadas=contar('Aprobada'),
+        denegadas=contar('Denegada'),
+        requiere_pc=contar('Requiere PC'),
+    ))
+    for solicitud in solicitudes:
+        solicitud.cant_asignaturas = solicitud.total
+        solicitud.cant_respondidas = solicitud.respondidas
+        solicitud.cant_aprobadas = solicitud.aprobadas
+        solicitud.cant_denegadas = solicitud.denegadas
+        solicitud.cant_requiere_pc = solicitud.requiere_pc
+
+    SolicitudEquivalencia.objects.bulk_update(
+        solicitudes,
+        ['cant_asignaturas', 'cant_respondidas', 'cant_aprobadas',
+         'cant_denegadas', 'cant_requiere_pc'],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equivalencias', '0002_alter_detallesolicitud_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='cant_aprobadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='cant_asignaturas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='cant_denegadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='cant_requiere_pc',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='cant_respondidas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudequivalencia',
+            index=models.Index(fields=['estado_general', 'cant_asignaturas', 'cant_respondidas'], name='sol_estado_contadores_idx'),
+        ),
+        migrations.RunPython(calcular_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:54
+
+from django.db import migrations, models
+
+
+def marcar_completadas(apps, schema_editor):
+    """Inicializa `completada` desde estado_general."""
+    SolicitudEquivalencia = apps.get_model('equivalencias', 'SolicitudEquivalencia')
+    SolicitudEquivalencia.objects.filter(estado_general='Completada').update(completada=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equivalencias', '0003_contadores_solicitud'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitudequivalencia',
+            name='completada',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudequivalencia',
+            index=models.Index(fields=['completada', 'fecha_inicio', 'id'], name='sol_completada_fecha_idx'),
+        ),
+        migrations.RunPython(marcar_completadas, migrations.RunPython.noop),
+    ]
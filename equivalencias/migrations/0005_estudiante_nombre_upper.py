@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equivalencias', '0004_solicitud_completada'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='estudiante',
+            index=models.Index(django.db.models.functions.text.Upper('nombre_completo'), name='est_nombre_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def llenar_resumenes(apps, schema_editor):
+    """Carga los resúmenes de estadísticas desde las solicitudes existentes."""
+    from equivalencias.services.estadisticas_service import (
+        CLAVE_DICTAMENES, CLAVE_SOLICITUDES, EstadisticasService,
+    )
+
+    SolicitudEquivalencia = apps.get_model('equivalencias', 'SolicitudEquivalencia')
+    DetalleSolicitud = apps.get_model('equivalencias', 'DetalleSolicitud')
+    ResumenMensualSolicitudes = apps.get_model('equivalencias', 'ResumenMensualSolicitudes')
+    ResumenMensualDictamenes = apps.get_model('equivalencias', 'ResumenMensualDictamenes')
+
+    solicitudes, dictamenes = EstadisticasService.calcular_resumenes(
+        SolicitudEquivalencia, DetalleSolicitud)
+    ResumenMensualSolicitudes.objects.bulk_create(
+        EstadisticasService.filas(ResumenMensualSolicitudes, CLAVE_SOLICITUDES, solicitudes),
+        batch_size=500,
+    )
+    ResumenMensualDictamenes.objects.bulk_create(
+        EstadisticasService.filas(ResumenMensualDictamenes, CLAVE_DICTAMENES, dictamenes),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equivalencias', '0005_estudiante_nombre_upper'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenMensualSolicitudes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio', models.PositiveSmallIntegerField()),
+                ('mes', models.PositiveSmallIntegerField()),
+                ('anio_completada', models.PositiveSmallIntegerField(default=0)),
+                ('mes_completada', models.PositiveSmallIntegerField(default=0)),
+                ('cantidad', models.IntegerField(default=0)),
+                ('segundos_resolucion', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Resumen Mensual de Solicitudes',
+                'verbose_name_plural': 'Resúmenes Mensuales de Solicitudes',
+                'constraints': [models.UniqueConstraint(fields=('anio', 'mes', 'anio_completada', 'mes_completada'), name='res_sol_mes_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenMensualDictamenes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio', models.PositiveSmallIntegerField()),
+                ('mes', models.PositiveSmallIntegerField()),
+                ('estado', models.CharField(max_length=20)),
+                ('cantidad', models.IntegerField(default=0)),
+                ('con_dictamen', models.IntegerField(default=0)),
+                ('segundos_dictamen', models.BigIntegerField(default=0)),
+                ('asignatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='equivalencias.asignaturaparaequivalencia')),
+            ],
+            options={
+                'verbose_name': 'Resumen Mensual de Dictámenes',
+                'verbose_name_plural': 'Resúmenes Mensuales de Dictámenes',
+                'constraints': [models.UniqueConstraint(fields=('anio', 'mes', 'asignatura', 'estado'), name='res_dict_mes_uniq')],
+            },
+        ),
+        migrations.RunPython(llenar_resumenes, migrations.RunPython.noop),
+    ]
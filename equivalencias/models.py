@@ -1,6 +1,7 @@
 # equivalencias/models.py
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from django.utils import timezone
 import os, uuid
@@ -80,6 +81,9 @@ class Estudiante(models.Model):
 
             # Índice para búsqueda por nombre
             models.Index(fields=['nombre_completo'], name='est_nombre_idx'),
+
+            # Índice para el autocompletado por prefijo (sin distinguir mayúsculas)
+            models.Index(Upper('nombre_completo'), name='est_nombre_upper_idx'),
         ]
 
     def __str__(self):
@@ -101,28 +105,76 @@ class SolicitudEquivalencia(models.Model):
         upload_to=get_equivalencias_upload_path, blank=True, null=True
     )
     fecha_completada = models.DateTimeField(null=True, blank=True)
+
+    # Contadores de asignaturas por estado, mantenidos por las signals de
+    # DetalleSolicitud (ver ContadoresSolicitudService y el comando
+    # reparar_contadores_solicitudes)
+    cant_asignaturas = models.PositiveIntegerField(default=0, editable=False)
+    cant_respondidas = models.PositiveIntegerField(default=0, editable=False)
+    cant_aprobadas = models.PositiveIntegerField(default=0, editable=False)
+    cant_denegadas = models.PositiveIntegerField(default=0, editable=False)
+    cant_requiere_pc = models.PositiveIntegerField(default=0, editable=False)
+
+    # Copia de estado_general == "Completada", para ordenar el dashboard por índice
+    completada = models.BooleanField(default=False, editable=False)
+
     objects = SolicitudEquivalenciaManager()
 
+    CAMPOS_CONTADORES = (
+        "cant_asignaturas", "cant_respondidas", "cant_aprobadas",
+        "cant_denegadas", "cant_requiere_pc",
+    )
+
+    def save(self, *args, **kwargs):
+        """
+        Sincroniza `completada` y no pisa los contadores: los mantienen
+        las signals de DetalleSolicitud con UPDATE, y la instancia en
+        memoria puede tener valores viejos.
+        """
+        self.completada = self.estado_general == "Completada"
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            if "estado_general" in update_fields:
+                kwargs["update_fields"] = set(update_fields) | {"completada"}
+        elif not self._state.adding and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.CAMPOS_CONTADORES
+            ]
+
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Recuerda las fechas guardadas para ajustar los resúmenes de estadísticas."""
+        instancia = super().from_db(db, field_names, values)
+        instancia._resumen_guardado = instancia.valores_resumen()
+        return instancia
+
+    def valores_resumen(self):
+        """(fecha_inicio, estado_general, fecha_completada), o None si alguno está diferido."""
+        valores = tuple(
+            self.__dict__.get(campo, models.DEFERRED)
+            for campo in ("fecha_inicio", "estado_general", "fecha_completada")
+        )
+        return None if models.DEFERRED in valores else valores
 
     @property
     def progreso(self):
         """
-        Calcula y devuelve el progreso de la solicitud como un string.
+        Devuelve el progreso de la solicitud como un string.
         Ejemplo: "3 de 5".
         """
-        # Contamos el total de asignaturas en esta solicitud
-        total_asignaturas = self.detallesolicitud_set.count()
-
-        if total_asignaturas == 0:
+        if self.cant_asignaturas == 0:
             return "0 de 0"
 
-        # Contamos cuántas ya tienen un dictamen final
-        estados_finales = ["Aprobada", "Denegada", "Requiere PC"]
-        asignaturas_respondidas = self.detallesolicitud_set.filter(
-            estado_asignatura__in=estados_finales
-        ).count()
+        return f"{self.cant_respondidas} de {self.cant_asignaturas}"
 
-        return f"{asignaturas_respondidas} de {total_asignaturas}"
+    @property
+    def lista_para_acta(self):
+        """Si todas las asignaturas tienen dictamen final."""
+        return 0 < self.cant_asignaturas == self.cant_respondidas
     
     class Meta:
         verbose_name = "Solicitud de Equivalencia"
@@ -147,6 +199,18 @@ class SolicitudEquivalencia(models.Model):
                 fields=['estado_general', 'fecha_inicio'],
                 name='sol_estado_fecha_idx'
             ),
+
+            # Índice compuesto: orden y paginación del dashboard
+            models.Index(
+                fields=['completada', 'fecha_inicio', 'id'],
+                name='sol_completada_fecha_idx'
+            ),
+
+            # Índice compuesto: solicitudes listas para acta (estado + contadores)
+            models.Index(
+                fields=['estado_general', 'cant_asignaturas', 'cant_respondidas'],
+                name='sol_estado_contadores_idx'
+            ),
         ]
 
     def __str__(self):
@@ -192,6 +256,49 @@ class DetalleSolicitud(models.Model):
         blank=True, null=True, help_text="Detallar temas del Programa Complementario"
     )
     fecha_dictamen = models.DateTimeField(blank=True, null=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Recuerda el estado guardado para ajustar los contadores al cambiarlo."""
+        instancia = super().from_db(db, field_names, values)
+        instancia._estado_guardado = instancia.__dict__.get("estado_asignatura")
+        instancia._resumen_guardado = instancia.valores_resumen()
+        return instancia
+
+    def save(self, *args, **kwargs):
+        """
+        Antes de guardar lee, con la fila bloqueada, la solicitud, el estado y
+        los valores de resumen guardados: las signals ajustan contadores y
+        estadísticas desde esa lectura y no desde lo que se cargó en memoria,
+        así dos ediciones simultáneas no aplican dos veces la misma transición.
+        """
+        if self._state.adding or self.pk is None:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            guardado = (
+                DetalleSolicitud.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list("id_solicitud_id", "id_asignatura_id", "estado_asignatura", "fecha_dictamen")
+                .first()
+            )
+            if guardado is None:
+                self._solicitud_guardada = self._estado_guardado = self._resumen_guardado = None
+            else:
+                self._solicitud_guardada = guardado[0]
+                self._estado_guardado = guardado[2]
+                self._resumen_guardado = guardado[1:]
+            super().save(*args, **kwargs)
+        self._solicitud_guardada = self.id_solicitud_id
+
+    def valores_resumen(self):
+        """(id_asignatura_id, estado_asignatura, fecha_dictamen), o None si alguno está diferido."""
+        valores = tuple(
+            self.__dict__.get(campo, models.DEFERRED)
+            for campo in ("id_asignatura_id", "estado_asignatura", "fecha_dictamen")
+        )
+        return None if models.DEFERRED in valores else valores
     
     class Meta:
         verbose_name = "Detalle de Solicitud"
@@ -216,3 +323,62 @@ class DetalleSolicitud(models.Model):
 
     def __str__(self):
         return f"{self.id_asignatura.asignatura.nombre} para {self.id_solicitud.id_estudiante.nombre_completo}"
+
+
+class ResumenMensualSolicitudes(models.Model):
+    """
+    Resumen de solicitudes por mes de inicio y mes de finalización, para
+    las estadísticas. Lo mantiene EstadisticasService (ver signals.py);
+    `anio_completada` y `mes_completada` valen 0 si no está completada.
+    """
+    anio = models.PositiveSmallIntegerField()
+    mes = models.PositiveSmallIntegerField()
+    anio_completada = models.PositiveSmallIntegerField(default=0)
+    mes_completada = models.PositiveSmallIntegerField(default=0)
+    cantidad = models.IntegerField(default=0)
+    # Suma de (fecha_completada - fecha_inicio) de las completadas
+    segundos_resolucion = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Resumen Mensual de Solicitudes"
+        verbose_name_plural = "Resúmenes Mensuales de Solicitudes"
+        constraints = [
+            # También sirve de índice para filtrar por año
+            models.UniqueConstraint(
+                fields=['anio', 'mes', 'anio_completada', 'mes_completada'],
+                name='res_sol_mes_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.mes:02d}/{self.anio}: {self.cantidad} solicitudes"
+
+
+class ResumenMensualDictamenes(models.Model):
+    """
+    Resumen de detalles por mes de inicio de la solicitud, asignatura y
+    estado, para las estadísticas. Lo mantiene EstadisticasService.
+    """
+    anio = models.PositiveSmallIntegerField()
+    mes = models.PositiveSmallIntegerField()
+    asignatura = models.ForeignKey(
+        AsignaturaParaEquivalencia, on_delete=models.CASCADE, related_name="+"
+    )
+    estado = models.CharField(max_length=20)
+    cantidad = models.IntegerField(default=0)
+    con_dictamen = models.IntegerField(default=0)
+    # Suma de (fecha_dictamen - fecha_inicio de la solicitud) de los dictaminados
+    segundos_dictamen = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Resumen Mensual de Dictámenes"
+        verbose_name_plural = "Resúmenes Mensuales de Dictámenes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['anio', 'mes', 'asignatura', 'estado'],
+                name='res_dict_mes_uniq'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.mes:02d}/{self.anio} {self.asignatura} {self.estado}: {self.cantidad}"
@@ -0,0 +1,71 @@
+# equivalencias/services/acta_service.py
+"""
+Servicio para generación del acta de equivalencias (PDF).
+"""
+import logging
+import os
+from contextlib import redirect_stderr
+from typing import Optional
+
+from django.template.loader import render_to_string
+
+from carrera_academica.services.artifact_cache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+ESPACIO_ACTAS = "actas"
+
+
+class ActaService:
+    """Servicio para generar (y cachear) actas de equivalencias."""
+
+    @staticmethod
+    def generar_acta(solicitud, base_url: str) -> Optional[bytes]:
+        """
+        Genera el PDF del acta de una solicitud.
+
+        El HTML renderizado ya contiene todos los datos de la solicitud y la
+        versión de la plantilla, así que se usa como clave de la caché: el
+        PDF solo se vuelve a generar si el acta cambia.
+
+        Args:
+            solicitud: Instancia de SolicitudEquivalencia
+            base_url: URL base para resolver imágenes (ej: la firma)
+
+        Returns:
+            bytes con el PDF o None si hay error
+        """
+        context = {
+            "solicitud": solicitud,
+            "detalles": solicitud.detallesolicitud_set.all(),
+            # Ruta relativa: WeasyPrint la resuelve con base_url
+            "signature_image_path": "/static/images/firma_holografica.png",
+        }
+
+        try:
+            html_string = render_to_string("equivalencias/acta_template.html", context)
+            clave = ArtifactCache.clave(html_string, base_url)
+
+            return ArtifactCache.obtener_o_generar(
+                ESPACIO_ACTAS, solicitud.pk, clave, "pdf",
+                lambda: ActaService._html_a_pdf(html_string, base_url),
+            )
+
+        except Exception as e:
+            logger.error(f"Error generando acta para solicitud {solicitud.pk}: {e}")
+            return None
+
+    @staticmethod
+    def invalidar_acta(solicitud_pk=None) -> int:
+        """Descarta las actas cacheadas de una solicitud (o todas)."""
+        return ArtifactCache.invalidar(ESPACIO_ACTAS, solicitud_pk)
+
+    @staticmethod
+    def _html_a_pdf(html_string: str, base_url: str) -> bytes:
+        """Convierte el HTML a PDF silenciando stderr de WeasyPrint."""
+        # Import diferido: las signals invalidan actas en cada guardado y no
+        # necesitan cargar WeasyPrint (pango/cairo)
+        from weasyprint import HTML
+
+        with open(os.devnull, "w") as f, redirect_stderr(f):
+            return HTML(string=html_string, base_url=base_url).write_pdf()
@@ -0,0 +1,122 @@
+# equivalencias/services/contador_service.py
+"""
+Servicio para los contadores de asignaturas de SolicitudEquivalencia.
+
+Cada alta, baja o cambio de estado de un DetalleSolicitud ajusta los
+contadores de su solicitud con un UPDATE de expresiones F (sin leer la
+fila), así el progreso y las "listas para acta" no vuelven a contar
+detalles. `recalcular` los reconstruye desde los detalles.
+"""
+import logging
+from collections import Counter
+from typing import Optional
+
+from django.db.models import F
+
+from equivalencias.managers import ESTADOS_FINALES
+from equivalencias.models import SolicitudEquivalencia
+
+logger = logging.getLogger(__name__)
+
+CAMPO_POR_ESTADO = {
+    "Aprobada": "cant_aprobadas",
+    "Denegada": "cant_denegadas",
+    "Requiere PC": "cant_requiere_pc",
+}
+
+# Contador persistido -> anotación de SolicitudEquivalenciaQuerySet.with_progreso()
+ANOTACION_POR_CAMPO = {
+    "cant_asignaturas": "total_asignaturas",
+    "cant_respondidas": "asignaturas_respondidas",
+    "cant_aprobadas": "asignaturas_aprobadas",
+    "cant_denegadas": "asignaturas_denegadas",
+    "cant_requiere_pc": "asignaturas_requiere_pc",
+}
+
+
+class ContadoresSolicitudService:
+    """Mantenimiento de los contadores por estado de cada solicitud."""
+
+    @staticmethod
+    def campos(estado: str) -> list:
+        """Contadores en los que suma un detalle con ese estado."""
+        campos = ["cant_asignaturas"]
+        if estado in ESTADOS_FINALES:
+            campos.append("cant_respondidas")
+            campos.append(CAMPO_POR_ESTADO[estado])
+        return campos
+
+    @staticmethod
+    def aplicar(solicitud_id: int, anterior: Optional[str] = None, nuevo: Optional[str] = None):
+        """
+        Ajusta los contadores por una transición de un detalle.
+
+        Args:
+            solicitud_id: pk de la solicitud del detalle
+            anterior: Estado guardado (None si el detalle es nuevo)
+            nuevo: Estado nuevo (None si el detalle se elimina)
+        """
+        cambios = Counter()
+        if anterior is not None:
+            cambios.subtract(ContadoresSolicitudService.campos(anterior))
+        if nuevo is not None:
+            cambios.update(ContadoresSolicitudService.campos(nuevo))
+
+        valores = {campo: F(campo) + delta for campo, delta in cambios.items() if delta}
+        if valores:
+            SolicitudEquivalencia.objects.filter(pk=solicitud_id).update(**valores)
+
+    @staticmethod
+    def aplicar_lote(detalles, anteriores=None):
+        """
+        Ajusta los contadores por un lote de detalles (bulk_create/bulk_update),
+        con un UPDATE por solicitud.
+
+        Args:
+            detalles: DetalleSolicitud ya guardados
+            anteriores: {pk: estado guardado}; si falta, los detalles son nuevos
+        """
+        cambios_por_solicitud = {}
+        for detalle in detalles:
+            cambios = cambios_por_solicitud.setdefault(detalle.id_solicitud_id, Counter())
+            if anteriores is not None:
+                cambios.subtract(ContadoresSolicitudService.campos(anteriores[detalle.pk]))
+            cambios.update(ContadoresSolicitudService.campos(detalle.estado_asignatura))
+
+        for solicitud_id, cambios in cambios_por_solicitud.items():
+            valores = {campo: F(campo) + delta for campo, delta in cambios.items() if delta}
+            if valores:
+                SolicitudEquivalencia.objects.filter(pk=solicitud_id).update(**valores)
+
+    @staticmethod
+    def recalcular(queryset=None, guardar: bool = True) -> list:
+        """
+        Recalcula los contadores desde los detalles.
+
+        Args:
+            queryset: Solicitudes a revisar (por defecto, todas)
+            guardar: Si es False solo informa las diferencias
+
+        Returns:
+            list: Solicitudes cuyos contadores no coincidían
+        """
+        if queryset is None:
+            queryset = SolicitudEquivalencia.objects.all()
+
+        desfasadas = []
+        for solicitud in queryset.with_progreso().order_by():
+            distinto = False
+            for campo, anotacion in ANOTACION_POR_CAMPO.items():
+                valor = getattr(solicitud, anotacion)
+                if getattr(solicitud, campo) != valor:
+                    setattr(solicitud, campo, valor)
+                    distinto = True
+            if distinto:
+                desfasadas.append(solicitud)
+
+        if desfasadas and guardar:
+            SolicitudEquivalencia.objects.bulk_update(
+                desfasadas, list(ANOTACION_POR_CAMPO), batch_size=500)
+            logger.info(f"Contadores reparados en {len(desfasadas)} solicitudes")
+
+        return desfasadas
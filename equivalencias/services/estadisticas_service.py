@@ -0,0 +1,708 @@
+# equivalencias/services/estadisticas_service.py
+"""
+Servicio para las estadísticas de equivalencias.
+
+Las estadísticas no recorren SolicitudEquivalencia ni DetalleSolicitud:
+leen dos tablas de resumen mensual (ResumenMensualSolicitudes y
+ResumenMensualDictamenes) con cantidades y duraciones sumadas, que
+tienen a lo sumo unos cientos de filas. Las signals y las altas masivas
+ajustan los resúmenes en cada cambio con UPDATE de expresiones F;
+`reconstruir` (comando reconstruir_estadisticas) los rehace desde cero.
+
+`calcular_cacheado` guarda los resultados de cada año (y del promedio
+histórico) en la caché de Django con claves versionadas: cada ajuste de
+los resúmenes cambia, al confirmarse la transacción, la versión de los
+años afectados, así los años cerrados se sirven siempre de la caché y
+solo se recalcula el año que recibe cambios.
+"""
+import logging
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from functools import partial
+from itertools import islice
+from typing import Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from equivalencias.models import (
+    AsignaturaParaEquivalencia,
+    DetalleSolicitud,
+    ResumenMensualDictamenes,
+    ResumenMensualSolicitudes,
+    SolicitudEquivalencia,
+)
+
+logger = logging.getLogger(__name__)
+
+MESES = [
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+    "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre",
+]
+
+ESTADOS_SIN_DICTAMEN = ("Enviada a Cátedra", "Pendiente de envío")
+ESTADOS_PROBLEMATICOS = ("Denegada", "Requiere PC")
+
+CLAVE_SOLICITUDES = ("anio", "mes", "anio_completada", "mes_completada")
+SUMAS_SOLICITUDES = ("segundos_resolucion",)
+CLAVE_DICTAMENES = ("anio", "mes", "asignatura_id", "estado")
+SUMAS_DICTAMENES = ("con_dictamen", "segundos_dictamen")
+
+
+class EstadisticasService:
+    """Mantenimiento y lectura de los resúmenes mensuales de estadísticas."""
+
+    @staticmethod
+    def mes_de(fecha) -> Tuple[int, int]:
+        """(año, mes) de una fecha en la zona horaria actual, como TruncMonth."""
+        if timezone.is_aware(fecha):
+            fecha = timezone.localtime(fecha)
+        return fecha.year, fecha.month
+
+    @staticmethod
+    def aporte_solicitud(valores) -> tuple:
+        """
+        Fila y sumas en las que cuenta una solicitud.
+
+        Args:
+            valores: (fecha_inicio, estado_general, fecha_completada)
+
+        Returns:
+            tuple: ((anio, mes, anio_completada, mes_completada), segundos_resolucion)
+        """
+        fecha_inicio, estado, fecha_completada = valores
+        anio, mes = EstadisticasService.mes_de(fecha_inicio)
+        if estado == "Completada" and fecha_completada is not None:
+            anio_completada, mes_completada = EstadisticasService.mes_de(fecha_completada)
+            segundos = int((fecha_completada - fecha_inicio).total_seconds())
+        else:
+            anio_completada = mes_completada = segundos = 0
+        return (anio, mes, anio_completada, mes_completada), segundos
+
+    @staticmethod
+    def aporte_detalle(fecha_inicio, valores) -> tuple:
+        """
+        Fila y sumas en las que cuenta un detalle.
+
+        Args:
+            fecha_inicio: Fecha de inicio de la solicitud del detalle
+            valores: (id_asignatura_id, estado_asignatura, fecha_dictamen)
+
+        Returns:
+            tuple: ((anio, mes, asignatura_id, estado), con_dictamen, segundos_dictamen)
+        """
+        asignatura_id, estado, fecha_dictamen = valores
+        anio, mes = EstadisticasService.mes_de(fecha_inicio)
+        clave = (anio, mes, asignatura_id, (estado or "").strip())
+        if fecha_dictamen is None:
+            return clave, 0, 0
+        return clave, 1, int((fecha_dictamen - fecha_inicio).total_seconds())
+
+    @staticmethod
+    def registrar_solicitud(anterior=None, nuevo=None):
+        """
+        Ajusta el resumen de solicitudes por un alta, baja o cambio.
+
+        Args:
+            anterior: valores_resumen() guardados (None si es nueva)
+            nuevo: valores_resumen() actuales (None si se elimina)
+        """
+        aportes = []
+        if anterior is not None:
+            aportes.append((-1, EstadisticasService.aporte_solicitud(anterior)))
+        if nuevo is not None:
+            aportes.append((1, EstadisticasService.aporte_solicitud(nuevo)))
+        EstadisticasService._aplicar(
+            ResumenMensualSolicitudes, CLAVE_SOLICITUDES, SUMAS_SOLICITUDES, aportes)
+
+    @staticmethod
+    def registrar_detalles(anteriores: Iterable = (), nuevos: Iterable = ()):
+        """
+        Ajusta el resumen de dictámenes por un lote de detalles, con un
+        UPDATE por fila de resumen afectada.
+
+        Args:
+            anteriores: Pares (fecha_inicio, valores_resumen()) a descontar
+            nuevos: Pares (fecha_inicio, valores_resumen()) a sumar
+        """
+        aportes = [(-1, EstadisticasService.aporte_detalle(*par)) for par in anteriores]
+        aportes += [(1, EstadisticasService.aporte_detalle(*par)) for par in nuevos]
+        EstadisticasService._aplicar(
+            ResumenMensualDictamenes, CLAVE_DICTAMENES, SUMAS_DICTAMENES, aportes)
+
+    @staticmethod
+    def _acumular(aportes, sumas) -> dict:
+        """{clave: Counter de deltas} a partir de pares (signo, aporte)."""
+        deltas = defaultdict(Counter)
+        for signo, (clave, *valores) in aportes:
+            deltas[clave]["cantidad"] += signo
+            for campo, valor in zip(sumas, valores):
+                deltas[clave][campo] += signo * valor
+        return deltas
+
+    @staticmethod
+    def _aplicar(modelo, campos_clave, sumas, aportes):
+        """
+        Suma los deltas a las filas de resumen, creándolas si hace falta.
+
+        Una sola fila (signals) se ajusta con un UPDATE de expresiones F; un
+        lote (altas y dictámenes masivos) lee y bloquea sus filas con una
+        consulta y las escribe con un bulk_update y un bulk_create, así la
+        cantidad de consultas no crece con la cantidad de asignaturas.
+        """
+        deltas = {
+            clave: cambios
+            for clave, cambios in EstadisticasService._acumular(aportes, sumas).items()
+            if any(cambios.values())
+        }
+        if not deltas:
+            return
+
+        anios = {clave[0] for clave in deltas}
+        if len(deltas) == 1:
+            EstadisticasService._sumar_fila(modelo, campos_clave, *deltas.popitem())
+        else:
+            EstadisticasService._sumar_lote(modelo, campos_clave, sumas, deltas)
+        transaction.on_commit(partial(EstadisticasService.invalidar, anios))
+
+    @staticmethod
+    def _sumar_fila(modelo, campos_clave, clave, cambios):
+        """Suma los deltas a una fila con UPDATE, o la crea si no existe."""
+        filtro = dict(zip(campos_clave, clave))
+        valores = {campo: F(campo) + delta for campo, delta in cambios.items() if delta}
+        if modelo.objects.filter(**filtro).update(**valores):
+            return
+        if cambios["cantidad"] <= 0:
+            # La fila ya no existe (p. ej. se eliminó la asignatura en cascada)
+            return
+        try:
+            with transaction.atomic():
+                modelo.objects.create(**filtro, **cambios)
+        except IntegrityError:
+            # Otra transacción creó la fila entre el UPDATE y el INSERT
+            modelo.objects.filter(**filtro).update(**valores)
+
+    @staticmethod
+    def _sumar_lote(modelo, campos_clave, sumas, deltas):
+        """Suma los deltas a varias filas con una lectura y dos escrituras."""
+        campos = ("cantidad",) + sumas
+        with transaction.atomic():
+            condicion = Q()
+            for clave in deltas:
+                condicion |= Q(**dict(zip(campos_clave, clave)))
+            existentes = {
+                tuple(getattr(fila, campo) for campo in campos_clave): fila
+                for fila in modelo.objects.select_for_update().filter(condicion)
+            }
+
+            nuevas = []
+            for clave, cambios in deltas.items():
+                fila = existentes.get(clave)
+                if fila is not None:
+                    for campo in campos:
+                        setattr(fila, campo, getattr(fila, campo) + cambios[campo])
+                elif cambios["cantidad"] > 0:
+                    nuevas.append(modelo(**dict(zip(campos_clave, clave)), **cambios))
+
+            if existentes:
+                modelo.objects.bulk_update(existentes.values(), campos)
+            if nuevas:
+                try:
+                    with transaction.atomic():
+                        modelo.objects.bulk_create(nuevas)
+                except IntegrityError:
+                    # Otra transacción creó alguna de las filas: de a una
+                    for fila in nuevas:
+                        clave = tuple(getattr(fila, campo) for campo in campos_clave)
+                        EstadisticasService._sumar_fila(
+                            modelo, campos_clave, clave, deltas[clave])
+
+    @staticmethod
+    def calcular_resumenes(solicitud_model=SolicitudEquivalencia,
+                           detalle_model=DetalleSolicitud) -> Tuple[dict, dict]:
+        """
+        Calcula los resúmenes desde las solicitudes y los detalles.
+
+        Args:
+            solicitud_model, detalle_model: Modelos a leer (las migraciones
+                pasan los modelos históricos)
+
+        Returns:
+            tuple: ({clave: Counter} de solicitudes, {clave: Counter} de dictámenes)
+        """
+        solicitudes = solicitud_model.objects.values_list(
+            "fecha_inicio", "estado_general", "fecha_completada").order_by()
+        detalles = detalle_model.objects.values_list(
+            "id_solicitud__fecha_inicio", "id_asignatura_id",
+            "estado_asignatura", "fecha_dictamen",
+        ).order_by()
+
+        resumen_solicitudes = EstadisticasService._acumular(
+            ((1, EstadisticasService.aporte_solicitud(valores))
+             for valores in solicitudes.iterator(chunk_size=2000)),
+            SUMAS_SOLICITUDES,
+        )
+        resumen_dictamenes = EstadisticasService._acumular(
+            ((1, EstadisticasService.aporte_detalle(fecha_inicio, valores))
+             for fecha_inicio, *valores in detalles.iterator(chunk_size=2000)),
+            SUMAS_DICTAMENES,
+        )
+        return resumen_solicitudes, resumen_dictamenes
+
+    @staticmethod
+    def filas(modelo, campos_clave, resumen) -> list:
+        """Instancias sin guardar de `modelo` para un resumen calculado."""
+        return [
+            modelo(**dict(zip(campos_clave, clave)), **cambios)
+            for clave, cambios in resumen.items() if cambios["cantidad"] > 0
+        ]
+
+    @staticmethod
+    def leer_resumenes() -> Tuple[dict, dict]:
+        """Resúmenes guardados, en el mismo formato que calcular_resumenes()."""
+        def leer(modelo, campos_clave, sumas):
+            return {
+                fila[:len(campos_clave)]: Counter(dict(
+                    zip(("cantidad",) + sumas, fila[len(campos_clave):])))
+                for fila in modelo.objects.filter(cantidad__gt=0).values_list(
+                    *campos_clave, "cantidad", *sumas)
+            }
+
+        return (
+            leer(ResumenMensualSolicitudes, CLAVE_SOLICITUDES, SUMAS_SOLICITUDES),
+            leer(ResumenMensualDictamenes, CLAVE_DICTAMENES, SUMAS_DICTAMENES),
+        )
+
+    @staticmethod
+    def verificar() -> int:
+        """Cantidad de filas de resumen que no coinciden con las solicitudes y detalles."""
+        distintas = 0
+        for calculado, guardado in zip(
+            EstadisticasService.calcular_resumenes(), EstadisticasService.leer_resumenes()
+        ):
+            for clave in calculado.keys() | guardado.keys():
+                if calculado.get(clave, Counter()) != guardado.get(clave, Counter()):
+                    distintas += 1
+        return distintas
+
+    @staticmethod
+    def reconstruir() -> Tuple[int, int]:
+        """
+        Rehace ambos resúmenes desde cero.
+
+        Returns:
+            tuple: Filas creadas (solicitudes, dictámenes)
+        """
+        resumen_solicitudes, resumen_dictamenes = EstadisticasService.calcular_resumenes()
+        solicitudes = EstadisticasService.filas(
+            ResumenMensualSolicitudes, CLAVE_SOLICITUDES, resumen_solicitudes)
+        dictamenes = EstadisticasService.filas(
+            ResumenMensualDictamenes, CLAVE_DICTAMENES, resumen_dictamenes)
+
+        with transaction.atomic():
+            ResumenMensualSolicitudes.objects.all().delete()
+            ResumenMensualDictamenes.objects.all().delete()
+            ResumenMensualSolicitudes.objects.bulk_create(solicitudes, batch_size=500)
+            ResumenMensualDictamenes.objects.bulk_create(dictamenes, batch_size=500)
+            transaction.on_commit(EstadisticasService.invalidar)
+
+        logger.info(
+            f"Resúmenes de estadísticas reconstruidos: {len(solicitudes)} "
+            f"filas de solicitudes y {len(dictamenes)} de dictámenes"
+        )
+        return len(solicitudes), len(dictamenes)
+
+    @staticmethod
+    def anios_disponibles() -> list:
+        """Años con solicitudes, del más reciente al más antiguo."""
+        return list(
+            ResumenMensualSolicitudes.objects.filter(cantidad__gt=0)
+            .order_by("-anio").values_list("anio", flat=True).distinct()
+        )
+
+    @staticmethod
+    def calcular(anio: Optional[int] = None) -> dict:
+        """
+        Métricas de la página de estadísticas, con dos consultas a los resúmenes.
+
+        Args:
+            anio: Año de inicio de las solicitudes; None para el promedio
+                histórico por mes (total de cada mes / cantidad de años)
+
+        Returns:
+            dict: Resultados listos para la plantilla
+        """
+        solicitudes = ResumenMensualSolicitudes.objects.filter(cantidad__gt=0)
+        dictamenes = ResumenMensualDictamenes.objects.filter(cantidad__gt=0)
+        if anio is not None:
+            solicitudes = solicitudes.filter(anio=anio)
+            dictamenes = dictamenes.filter(anio=anio)
+
+        filas_solicitudes = list(
+            solicitudes.values_list(*CLAVE_SOLICITUDES, "cantidad", *SUMAS_SOLICITUDES))
+        filas_dictamenes = list(
+            dictamenes.values("asignatura_id", "estado")
+            .annotate(
+                nombre_materia=F("asignatura__asignatura__nombre"),
+                total=Sum("cantidad"),
+                dictaminados=Sum("con_dictamen"),
+                segundos=Sum("segundos_dictamen"),
+            )
+            .order_by()
+        )
+
+        stats = EstadisticasService._metricas_solicitudes(filas_solicitudes, anio)
+        stats.update(EstadisticasService._metricas_dictamenes(filas_dictamenes))
+        return stats
+
+    @staticmethod
+    def calcular_por_escaneo(anio: Optional[int] = None, chunk_size: int = 20000) -> dict:
+        """
+        Igual que `calcular`, pero sin los resúmenes: recorre una sola vez
+        las solicitudes con sus detalles (LEFT JOIN leído por bloques con
+        values_list) y agrupa cada bloque con NumPy por las mismas claves
+        que los resúmenes. El mes de cada fecha se obtiene con searchsorted
+        sobre los inicios de mes locales, sin funciones de fecha en SQL.
+        Requiere NumPy.
+
+        Es el motor alternativo (EQUIVALENCIAS_ESTADISTICAS_MOTOR = "escaneo")
+        y sirve para contrastar los resúmenes (ver benchmark_estadisticas).
+        """
+        try:
+            import numpy as np
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "El motor de estadísticas 'escaneo' requiere NumPy") from exc
+
+        filas = SolicitudEquivalencia.objects.order_by("id")
+        if anio is not None:
+            filas = filas.filter(fecha_inicio__year=anio)
+        filas = filas.values_list(
+            "id", "estado_general", "fecha_inicio", "fecha_completada",
+            "detallesolicitud__id_asignatura_id", "detallesolicitud__estado_asignatura",
+            "detallesolicitud__fecha_dictamen",
+        ).iterator(chunk_size=chunk_size)
+
+        solicitudes = defaultdict(Counter)
+        dictamenes = defaultdict(Counter)
+        ultima = None
+        while bloque := list(islice(filas, chunk_size)):
+            ultima = EstadisticasService._agrupar_bloque(
+                np, bloque, ultima, solicitudes, dictamenes)
+
+        nombres = dict(
+            AsignaturaParaEquivalencia.objects
+            .filter(pk__in={clave[2] for clave in dictamenes})
+            .values_list("pk", "asignatura__nombre")
+        )
+        filas_solicitudes = [
+            clave + (sumas["cantidad"], sumas["segundos_resolucion"])
+            for clave, sumas in solicitudes.items()
+        ]
+        filas_dictamenes = [
+            {
+                "nombre_materia": nombres[asignatura_id], "estado": estado,
+                "total": sumas["cantidad"], "dictaminados": sumas["con_dictamen"],
+                "segundos": sumas["segundos_dictamen"],
+            }
+            for (_, _, asignatura_id, estado), sumas in dictamenes.items()
+        ]
+
+        stats = EstadisticasService._metricas_solicitudes(filas_solicitudes, anio)
+        stats.update(EstadisticasService._metricas_dictamenes(filas_dictamenes))
+        return stats
+
+    @staticmethod
+    def _agrupar_bloque(np, bloque, ultima, solicitudes, dictamenes):
+        """
+        Suma un bloque del escaneo a los grupos de solicitudes y de dictámenes.
+
+        Las filas vienen ordenadas por solicitud; una solicitud con varios
+        detalles se cuenta una vez aunque quede repartida entre dos bloques
+        (`ultima` es el id de la última solicitud del bloque anterior).
+
+        Returns:
+            int: id de la última solicitud del bloque
+        """
+        (ids, estados_generales, inicios, finales,
+         asignaturas, estados, fechas_dictamen) = zip(*bloque)
+
+        ids = np.array(ids, dtype=np.int64)
+        inicio = EstadisticasService._fechas_numpy(np, inicios)
+        anios, meses = EstadisticasService._meses_numpy(np, inicio)
+
+        # Solicitudes: la primera fila de cada una
+        _, primeras = np.unique(ids, return_index=True)
+        if ids[0] == ultima:
+            primeras = primeras[1:]
+        fin = EstadisticasService._fechas_numpy(np, [finales[i] for i in primeras])
+        completa = (
+            (np.array(estados_generales, dtype=object)[primeras] == "Completada")
+            & ~np.isnat(fin)
+        )
+        anios_completada, meses_completada = EstadisticasService._meses_numpy(np, fin)
+        claves = np.column_stack([
+            anios[primeras],
+            meses[primeras],
+            np.where(completa, anios_completada, 0),
+            np.where(completa, meses_completada, 0),
+        ])
+        demora = np.where(completa, fin - inicio[primeras], np.timedelta64(0, "us"))
+        EstadisticasService._sumar_grupos(
+            np, solicitudes, claves,
+            {"segundos_resolucion": EstadisticasService._segundos_numpy(np, demora)},
+        )
+
+        # Detalles: las filas con asignatura (el LEFT JOIN trae solicitudes sin detalles)
+        asignaturas = np.array(asignaturas, dtype=float)
+        con_detalle = np.flatnonzero(~np.isnan(asignaturas))
+        if len(con_detalle):
+            textos = np.char.strip(np.array([estados[i] for i in con_detalle], dtype=str))
+            nombres_estado, codigos = np.unique(textos, return_inverse=True)
+            dictamen = EstadisticasService._fechas_numpy(
+                np, [fechas_dictamen[i] for i in con_detalle])
+            dictaminado = ~np.isnat(dictamen)
+            demora = np.where(
+                dictaminado, dictamen - inicio[con_detalle], np.timedelta64(0, "us"))
+            claves = np.column_stack([
+                anios[con_detalle], meses[con_detalle],
+                asignaturas[con_detalle].astype(np.int64), codigos.ravel(),
+            ])
+            EstadisticasService._sumar_grupos(
+                np, dictamenes, claves,
+                {
+                    "con_dictamen": dictaminado,
+                    "segundos_dictamen": EstadisticasService._segundos_numpy(np, demora),
+                },
+                traducir=lambda clave: clave[:3] + (str(nombres_estado[clave[3]]),),
+            )
+
+        return int(ids[-1])
+
+    @staticmethod
+    def _sumar_grupos(np, destino, claves, sumas, traducir=None):
+        """Cuenta las filas y suma columnas por clave (filas de `claves`) en `destino`."""
+        unicas, inversa = np.unique(claves, axis=0, return_inverse=True)
+        inversa = inversa.ravel()
+        columnas = [np.bincount(inversa, minlength=len(unicas)).tolist()]
+        columnas += [
+            np.rint(np.bincount(inversa, weights=valores, minlength=len(unicas)))
+            .astype(np.int64).tolist()
+            for valores in sumas.values()
+        ]
+        campos = ("cantidad",) + tuple(sumas)
+        for clave, *valores in zip(map(tuple, unicas.tolist()), *columnas):
+            if traducir is not None:
+                clave = traducir(clave)
+            grupo = destino[clave]
+            for campo, valor in zip(campos, valores):
+                grupo[campo] += valor
+
+    @staticmethod
+    def _fechas_numpy(np, fechas):
+        """
+        datetime64[us] (NaT para None). Con USE_TZ las fechas de la base
+        vienen en UTC, así que alcanza con quitarles la zona horaria.
+        """
+        return np.array(
+            [fecha.replace(tzinfo=None) if fecha is not None else None for fecha in fechas],
+            dtype="datetime64[us]",
+        )
+
+    @staticmethod
+    def _meses_numpy(np, fechas):
+        """
+        (años, meses) en la zona horaria actual, como TruncMonth, de un
+        array datetime64 (UTC con USE_TZ); 0 para NaT.
+
+        Ubica cada fecha con searchsorted entre los inicios de mes locales
+        (convertidos a UTC) del rango de años del array, así los cambios de
+        horario quedan contemplados sin convertir fila por fila.
+        """
+        anios = np.zeros(len(fechas), dtype=np.int64)
+        meses = np.zeros(len(fechas), dtype=np.int64)
+        validas = ~np.isnat(fechas)
+        if not validas.any():
+            return anios, meses
+
+        rango = fechas[validas].astype("datetime64[Y]").astype(np.int64) + 1970
+        primero, ultimo = int(rango.min()) - 1, int(rango.max()) + 1
+        inicios = []
+        for anio in range(primero, ultimo + 1):
+            for mes in range(1, 13):
+                inicio = datetime(anio, mes, 1)
+                if settings.USE_TZ:
+                    inicio = timezone.make_naive(timezone.make_aware(inicio), dt_timezone.utc)
+                inicios.append(inicio)
+        inicios = np.array(inicios, dtype="datetime64[us]")
+
+        indices = np.searchsorted(inicios, fechas[validas], side="right") - 1
+        anios[validas] = primero + indices // 12
+        meses[validas] = indices % 12 + 1
+        return anios, meses
+
+    @staticmethod
+    def _segundos_numpy(np, duraciones):
+        """Segundos enteros (truncados hacia cero, como int()) de timedelta64."""
+        micro = duraciones.astype("timedelta64[us]").astype(np.int64)
+        return np.sign(micro) * (np.abs(micro) // 1_000_000)
+
+    @staticmethod
+    def calcular_cacheado(anio: Optional[int] = None) -> dict:
+        """
+        Igual que `calcular` (o `calcular_por_escaneo`, según
+        EQUIVALENCIAS_ESTADISTICAS_MOTOR), pero servido desde la caché
+        mientras no cambie la versión del período (ver `invalidar`).
+
+        Los años anteriores al actual se guardan EQUIVALENCIAS_ESTADISTICAS_TTL_CERRADOS
+        segundos; el año en curso y el promedio histórico, EQUIVALENCIAS_ESTADISTICAS_TTL.
+        Con una caché por proceso la invalidación no llega a los otros
+        workers, así que todos los períodos usan el TTL corto.
+        """
+        periodo = "historico" if anio is None else anio
+        version_global = cache.get_or_set("estadisticas:version", time.time_ns, None)
+        version = cache.get_or_set(f"estadisticas:version:{periodo}", time.time_ns, None)
+        clave = f"estadisticas:{version_global}:{periodo}:{version}"
+
+        stats = cache.get(clave)
+        if stats is None:
+            if settings.EQUIVALENCIAS_ESTADISTICAS_MOTOR == "escaneo":
+                stats = EstadisticasService.calcular_por_escaneo(anio)
+            else:
+                stats = EstadisticasService.calcular(anio)
+            cerrado = anio is not None and anio < timezone.localdate().year
+            cache.set(clave, stats, (
+                settings.EQUIVALENCIAS_ESTADISTICAS_TTL_CERRADOS
+                if cerrado and EstadisticasService._cache_compartida()
+                else settings.EQUIVALENCIAS_ESTADISTICAS_TTL
+            ))
+        return stats
+
+    @staticmethod
+    def _cache_compartida() -> bool:
+        """Si la caché por defecto la ven todos los procesos (no es LocMemCache)."""
+        return not isinstance(caches["default"], LocMemCache)
+
+    @staticmethod
+    def invalidar(anios: Optional[Iterable[int]] = None):
+        """
+        Descarta las estadísticas cacheadas (cambia su versión).
+
+        Args:
+            anios: Años cuyos resúmenes cambiaron (también invalida el
+                promedio histórico); None invalida todos los períodos
+        """
+        ahora = time.time_ns()
+        if anios is None:
+            cache.set("estadisticas:version", ahora, None)
+            return
+        versiones = {f"estadisticas:version:{anio}": ahora for anio in anios}
+        versiones["estadisticas:version:historico"] = ahora
+        cache.set_many(versiones, None)
+
+    @staticmethod
+    def _dias(segundos: int, cantidad: int) -> int:
+        """Días completos del promedio (como timedelta.days)."""
+        return timedelta(seconds=segundos / cantidad).days if cantidad else 0
+
+    @staticmethod
+    def _metricas_solicitudes(filas, anio: Optional[int]) -> dict:
+        """Volumen, series mensuales y tiempo de resolución."""
+        nuevas = Counter()
+        completadas = Counter()
+        completadas_total = segundos_resolucion = 0
+        anios = set()
+        for anio_inicio, mes, anio_completada, mes_completada, cantidad, segundos in filas:
+            anios.add(anio_inicio)
+            nuevas[(anio_inicio, mes)] += cantidad
+            if anio_completada:
+                completadas[(anio_completada, mes_completada)] += cantidad
+                completadas_total += cantidad
+                segundos_resolucion += segundos
+
+        if anio is None:
+            num_anios = len(anios) or 1  # Evitar división por cero
+            nuevas_data = [0] * 12
+            completadas_data = [0] * 12
+            for (_, mes), cantidad in nuevas.items():
+                nuevas_data[mes - 1] += cantidad
+            for (_, mes), cantidad in completadas.items():
+                completadas_data[mes - 1] += cantidad
+            nuevas_data = [total / num_anios if total else 0 for total in nuevas_data]
+            completadas_data = [total / num_anios if total else 0 for total in completadas_data]
+            meses_labels = MESES
+        else:
+            # Solo los meses con solicitudes nuevas, como en el gráfico de volumen
+            meses = sorted(nuevas)
+            meses_labels = [
+                date(a, m, 1).strftime("%B %Y").capitalize() for a, m in meses
+            ]
+            nuevas_data = [nuevas[mes] for mes in meses]
+            completadas_data = [completadas[mes] for mes in meses]
+
+        return {
+            "total_solicitudes": sum(nuevas.values()),
+            "meses_labels": meses_labels,
+            "solicitudes_data": nuevas_data,
+            "balance_labels": meses_labels,
+            "nuevas_data": nuevas_data,
+            "completadas_data": completadas_data,
+            "avg_resolucion_dias": EstadisticasService._dias(
+                segundos_resolucion, completadas_total),
+        }
+
+    @staticmethod
+    def _ranking(valores: dict) -> list:
+        """Pares (clave, valor) de mayor a menor valor, y por clave ante empates."""
+        return sorted(valores.items(), key=lambda item: (-item[1], item[0]))
+
+    @staticmethod
+    def _metricas_dictamenes(filas) -> dict:
+        """Distribución de dictámenes, rankings por asignatura y demoras."""
+        por_estado = Counter()
+        por_asignatura = Counter()
+        problematicas = Counter()
+        dictaminados = Counter()
+        segundos = Counter()
+        for fila in filas:
+            nombre, estado, total = fila["nombre_materia"], fila["estado"], fila["total"]
+            if estado not in ESTADOS_SIN_DICTAMEN:
+                por_estado[estado] += total
+            if estado in ESTADOS_PROBLEMATICOS:
+                problematicas[(nombre, estado)] += total
+            por_asignatura[nombre] += total
+            dictaminados[nombre] += fila["dictaminados"]
+            segundos[nombre] += fila["segundos"]
+
+        # Empates ordenados por nombre, así ambos motores devuelven lo mismo
+        distribucion = sorted(por_estado.items(), key=lambda item: (item[1], item[0]))
+        demoras = EstadisticasService._ranking({
+            nombre: segundos[nombre] / cantidad
+            for nombre, cantidad in dictaminados.items() if cantidad
+        })
+
+        return {
+            "total_asignaturas_procesadas": sum(por_asignatura.values()),
+            "dictamen_labels": [estado for estado, _ in distribucion],
+            "dictamen_valores": [total for _, total in distribucion],
+            "asignaturas_mas_solicitadas": [
+                {"nombre_materia": nombre, "total": total}
+                for nombre, total in EstadisticasService._ranking(por_asignatura)[:10]
+            ],
+            "asignaturas_problematicas": [
+                {"nombre_materia": nombre, "estado_asignatura": estado, "total": total}
+                for (nombre, estado), total in EstadisticasService._ranking(problematicas)[:10]
+            ],
+            "avg_dictamen_dias": EstadisticasService._dias(
+                sum(segundos.values()), sum(dictaminados.values())),
+            "top_demoras": [
+                {"nombre": nombre, "dias": timedelta(seconds=promedio).days}
+                for nombre, promedio in demoras[:5]
+            ],
+        }
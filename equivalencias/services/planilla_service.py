@@ -0,0 +1,90 @@
+# equivalencias/services/planilla_service.py
+"""
+Servicio para generar la planilla de evaluación (Word) que se envía a cátedra.
+
+La plantilla se parsea e indexa una sola vez (TemplateCache) y cada planilla
+se renderiza sobre una copia en memoria.
+"""
+import io
+import logging
+from datetime import date
+from typing import Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from carrera_academica.services.placeholder_engine import PlaceholderEngine
+from carrera_academica.services.template_cache import TemplateCache
+
+logger = logging.getLogger(__name__)
+
+PLANILLA_EVALUACION = settings.BASE_DIR / "templates_word" / "planilla_evaluacion.docx"
+
+MESES = (
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+)
+
+
+class PlanillaEvaluacionService:
+    """Servicio para renderizar planillas de evaluación de equivalencias."""
+
+    @staticmethod
+    def fecha_texto(fecha: Optional[date] = None) -> str:
+        """Fecha en el formato de la planilla (ej: '5 de Marzo de 2025')."""
+        fecha = fecha or date.today()
+        return f"{fecha.day} de {MESES[fecha.month - 1]} de {fecha.year}"
+
+    @staticmethod
+    def renderizar(detalle_solicitud, fecha_texto: Optional[str] = None) -> bytes:
+        """
+        Genera la planilla de un detalle de solicitud.
+
+        Args:
+            detalle_solicitud: Instancia de DetalleSolicitud
+            fecha_texto: Fecha ya formateada (por defecto, hoy)
+
+        Returns:
+            bytes: Documento .docx
+        """
+        doc, indice = TemplateCache.obtener_con_indice(str(PLANILLA_EVALUACION))
+        PlaceholderEngine.aplicar(doc, indice, {
+            "[fecha]": fecha_texto or PlanillaEvaluacionService.fecha_texto(),
+            "[alumno]": detalle_solicitud.id_solicitud.id_estudiante.nombre_completo,
+            "[asignatura]": detalle_solicitud.id_asignatura.asignatura.nombre,
+        })
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+
+    @staticmethod
+    def generar_planillas(detalles: Iterable) -> Iterator[Tuple[object, Optional[bytes]]]:
+        """
+        Genera las planillas de varios detalles a medida que se consumen.
+
+        La plantilla se parsea una sola vez para todos los detalles. Si una
+        planilla no se puede generar se registra el error y se devuelve
+        (detalle, None) para que quien envía pueda reportarlo.
+
+        Yields:
+            tuple: (detalle, bytes del .docx o None)
+        """
+        fecha_texto = PlanillaEvaluacionService.fecha_texto()
+
+        for detalle in detalles:
+            try:
+                planilla = PlanillaEvaluacionService.renderizar(detalle, fecha_texto)
+            except Exception as e:
+                logger.error(f"Error generando planilla para detalle {detalle.pk}: {e}")
+                planilla = None
+            yield detalle, planilla
@@ -0,0 +1,291 @@
+# equivalencias/services/solicitud_service.py
+"""
+Servicio para crear solicitudes de equivalencia y notificar a las cátedras.
+
+La solicitud, sus documentos y sus detalles se escriben en una sola
+transacción con bulk_create (las asignaturas se resuelven con un único
+in_bulk). Los correos a las cátedras se encolan recién cuando la
+transacción se confirma (transaction.on_commit), así nunca se notifica
+una solicitud que terminó revertida.
+"""
+import logging
+from functools import partial
+from typing import Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from notificaciones.services.outbox_service import OutboxService
+
+from equivalencias.managers import ESTADOS_FINALES
+from equivalencias.models import (
+    AsignaturaParaEquivalencia,
+    DetalleSolicitud,
+    DocumentoAdjunto,
+    SolicitudEquivalencia,
+)
+from equivalencias.services.acta_service import ActaService
+from equivalencias.services.contador_service import ContadoresSolicitudService
+from equivalencias.services.estadisticas_service import EstadisticasService
+from equivalencias.services.planilla_service import PlanillaEvaluacionService
+
+logger = logging.getLogger(__name__)
+
+
+class SolicitudService:
+    """Alta de solicitudes y correos a los docentes responsables."""
+
+    @staticmethod
+    def crear_solicitud(estudiante, asignatura_ids, documentos) -> Tuple[SolicitudEquivalencia, list]:
+        """
+        Crea la solicitud con sus documentos y detalles, y programa el aviso
+        a las cátedras para cuando se confirme la transacción.
+
+        Args:
+            estudiante: Estudiante solicitante
+            asignatura_ids: pks de AsignaturaParaEquivalencia
+            documentos: Archivos subidos (analítico, programas, etc.)
+
+        Returns:
+            tuple: (solicitud, errores). `errores` se completa al encolar los
+                correos, con un mensaje por grupo que no se pudo encolar
+
+        Raises:
+            AsignaturaParaEquivalencia.DoesNotExist: Si algún pk no existe
+        """
+        ids = {int(pk) for pk in asignatura_ids}
+        asignaturas = (
+            AsignaturaParaEquivalencia.objects
+            .select_related("asignatura", "docente_responsable")
+            .in_bulk(ids)
+        )
+        faltantes = ids - asignaturas.keys()
+        if faltantes:
+            raise AsignaturaParaEquivalencia.DoesNotExist(
+                f"No existen las asignaturas {sorted(faltantes)}")
+
+        errores = []
+        with transaction.atomic():
+            solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
+
+            DocumentoAdjunto.objects.bulk_create(
+                DocumentoAdjunto(solicitud=solicitud, archivo=doc) for doc in documentos
+            )
+
+            # Orden del formulario, sin repetidos
+            detalles = DetalleSolicitud.objects.bulk_create([
+                DetalleSolicitud(id_solicitud=solicitud, id_asignatura=asignaturas[pk])
+                for pk in dict.fromkeys(int(pk) for pk in asignatura_ids)
+            ])
+            # bulk_create no dispara las signals de contadores ni de estadísticas
+            ContadoresSolicitudService.aplicar_lote(detalles)
+            EstadisticasService.registrar_detalles(
+                nuevos=[(solicitud.fecha_inicio, d.valores_resumen()) for d in detalles])
+            for detalle in detalles:
+                detalle._estado_guardado = detalle.estado_asignatura
+                detalle._resumen_guardado = detalle.valores_resumen()
+
+            transaction.on_commit(
+                partial(SolicitudService.notificar_catedras, detalles, errores))
+
+        return solicitud, errores
+
+    @staticmethod
+    def registrar_dictamenes(solicitud, dictamenes: dict) -> List[DetalleSolicitud]:
+        """
+        Aplica el estado (y los temas de PC) de varios detalles a la vez.
+
+        Todos los detalles modificados se guardan con un bulk_update en una
+        transacción, con la misma fecha de dictamen, y los contadores de la
+        solicitud se ajustan con un único UPDATE.
+
+        Args:
+            solicitud: SolicitudEquivalencia de los detalles
+            dictamenes: {pk del detalle: (estado, temas de PC o None)}
+
+        Returns:
+            list: Detalles que cambiaron. Los contadores de `solicitud`
+                quedan recargados (ver `lista_para_acta`)
+
+        Raises:
+            ValueError: Si algún estado no es válido
+        """
+        estados_validos = dict(DetalleSolicitud.ESTADO_ASIGNATURA_CHOICES)
+        invalidos = {estado for estado, _ in dictamenes.values()} - estados_validos.keys()
+        if invalidos:
+            raise ValueError(f"Estados inválidos: {', '.join(sorted(invalidos))}")
+
+        ahora = timezone.now()
+        with transaction.atomic():
+            detalles = solicitud.detallesolicitud_set.select_for_update().filter(
+                pk__in=dictamenes.keys())
+            anteriores = {}
+            resumenes_anteriores = []
+            modificados = []
+            for detalle in detalles:
+                estado, temas_pc = dictamenes[detalle.pk]
+                temas_pc = (temas_pc or "") if estado == "Requiere PC" else None
+                if estado == detalle.estado_asignatura and temas_pc == detalle.detalle_pc:
+                    continue
+
+                resumenes_anteriores.append((solicitud.fecha_inicio, detalle.valores_resumen()))
+                if estado != detalle.estado_asignatura:
+                    detalle.fecha_dictamen = ahora if estado in ESTADOS_FINALES else None
+                anteriores[detalle.pk] = detalle.estado_asignatura
+                detalle.estado_asignatura = estado
+                detalle.detalle_pc = temas_pc
+                modificados.append(detalle)
+
+            if modificados:
+                DetalleSolicitud.objects.bulk_update(
+                    modificados, ["estado_asignatura", "detalle_pc", "fecha_dictamen"])
+                # bulk_update no dispara las signals de contadores, estadísticas ni del acta
+                ContadoresSolicitudService.aplicar_lote(modificados, anteriores)
+                EstadisticasService.registrar_detalles(
+                    resumenes_anteriores,
+                    [(solicitud.fecha_inicio, d.valores_resumen()) for d in modificados],
+                )
+                ActaService.invalidar_acta(solicitud.pk)
+                for detalle in modificados:
+                    detalle._estado_guardado = detalle.estado_asignatura
+                    detalle._resumen_guardado = detalle.valores_resumen()
+
+        solicitud.refresh_from_db(fields=SolicitudEquivalencia.CAMPOS_CONTADORES)
+        return modificados
+
+    @staticmethod
+    def notificar_catedras(detalles, errores=None) -> int:
+        """
+        Encola un correo por docente responsable (la planilla se parsea una vez).
+
+        Args:
+            detalles: DetalleSolicitud de una misma solicitud
+            errores: Lista donde agregar los mensajes de error
+
+        Returns:
+            int: Cantidad de correos encolados
+        """
+        errores = errores if errores is not None else []
+        encolados = 0
+        for grupo in SolicitudService.agrupar_por_responsable(
+            PlanillaEvaluacionService.generar_planillas(detalles)
+        ):
+            try:
+                SolicitudService.encolar_email_responsable(grupo)
+                encolados += 1
+            except Exception as e:
+                nombres = ", ".join(d.id_asignatura.asignatura.nombre for d, _ in grupo)
+                logger.warning(f"No se pudo encolar el correo para {nombres}: {e}")
+                errores.append(f"No se pudo encolar el correo para {nombres}. Error: {e}")
+        return encolados
+
+    @staticmethod
+    def agrupar_por_responsable(detalles_y_planillas: Iterable) -> List[list]:
+        """
+        Agrupa pares (detalle, planilla) de una solicitud por docente responsable,
+        para enviar un solo correo por responsable (EQUIVALENCIAS_AGRUPAR_POR_RESPONSABLE).
+
+        Los detalles cuya planilla no se pudo generar quedan en un grupo propio,
+        así el error se informa para esa asignatura.
+        """
+        if not settings.EQUIVALENCIAS_AGRUPAR_POR_RESPONSABLE:
+            return [[par] for par in detalles_y_planillas]
+
+        grupos = {}
+        sueltos = []
+        for detalle, planilla in detalles_y_planillas:
+            if planilla is None:
+                sueltos.append([(detalle, planilla)])
+                continue
+            clave = (detalle.id_solicitud_id, detalle.id_asignatura.docente_responsable_id)
+            grupos.setdefault(clave, []).append((detalle, planilla))
+
+        return list(grupos.values()) + sueltos
+
+    @staticmethod
+    def encolar_email_responsable(detalles_y_planillas: list):
+        """
+        Encola un único email al docente responsable de varias asignaturas de
+        una misma solicitud: una copia de la documentación del estudiante y una
+        planilla por asignatura.
+
+        Args:
+            detalles_y_planillas: Lista de (detalle, planilla o None) de la misma
+                solicitud y el mismo responsable
+        """
+        detalle_solicitud = detalles_y_planillas[0][0]
+        solicitud = detalle_solicitud.id_solicitud
+        estudiante = solicitud.id_estudiante
+
+        # Obtener el email del responsable
+        responsable = detalle_solicitud.id_asignatura.docente_responsable
+        correo_principal = responsable.correos.filter(principal=True).first()
+
+        if not correo_principal:
+            raise ValueError(f"No se encontró correo principal para {responsable}")
+
+        planillas = []
+        for detalle, planilla in detalles_y_planillas:
+            # Personalizar el documento de Word desde la plantilla cacheada
+            if planilla is None:
+                planilla = PlanillaEvaluacionService.renderizar(detalle)
+            nombre_asignatura = detalle.id_asignatura.asignatura.nombre
+            planillas.append((
+                f"Planilla_{estudiante.dni_pasaporte}_{nombre_asignatura}.docx",
+                planilla,
+                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            ))
+
+        nombres = [detalle.id_asignatura.asignatura.nombre for detalle, _ in detalles_y_planillas]
+        if len(nombres) == 1:
+            introduccion = (
+                f"<p>Hola profe, le envío la documentación para dar, si corresponde, la equivalencia de "
+                f"<strong>{nombres[0]}</strong>, al futuro estudiante <strong>{estudiante.nombre_completo}</strong>.</p>"
+            )
+        else:
+            items = "".join(f"<li><strong>{nombre}</strong></li>" for nombre in nombres)
+            introduccion = (
+                f"<p>Hola profe, le envío la documentación para dar, si corresponde, las equivalencias "
+                f"al futuro estudiante <strong>{estudiante.nombre_completo}</strong> de las siguientes "
+                f"asignaturas (se adjunta una planilla por cada una):</p><ul>{items}</ul>"
+            )
+
+        # Preparar y encolar el correo
+        OutboxService.encolar(
+            # Cambiamos el asunto para que sirva en ambos casos
+            asunto=f"Solicitud de Equivalencia de {estudiante.nombre_completo}",
+            # Cambiamos el cuerpo del correo
+            cuerpo=f"""
+            {introduccion}
+
+            <p>Agradeceré que responda a este mismo correo con su dictamen. No es necesario reenviar el archivo.</p>
+        
+            <p>Sin otro particular.</p>
+            <p><br></p>
+
+            <p style='font-size:15px;font-family:"Calibri",sans-serif; color:#174E86;'>
+                <strong>Ing. Jorge RONCONI</strong><br>
+                Secretario de Departamento
+            </p>
+            <p style='font-size:15px;font-family:"Calibri",sans-serif;color:#174E86;'>
+                <strong>
+                    Departamento Ingeniería Civil<br>
+                    Universidad Tecnológica Nacional<br>
+                    Facultad Regional La Plata
+                </strong>
+            </p>
+            <p style='font-size:15px;font-family:"Calibri",sans-serif;text-align:center;color:#70AD47;'>
+                Universidad Publica, Gratuita y de Calidad.
+            </p>
+            """,
+            destinatarios=[correo_principal.email],
+            es_html=True,  # Para enviar el cuerpo como HTML
+            rutas=[
+                documento_adjunto.archivo.path
+                for documento_adjunto in solicitud.documentoadjunto_set.all()
+            ],
+            adjuntos=planillas,
+            # Un correo por asignatura se asocia al detalle; uno agrupado, a la solicitud
+            objeto=detalle_solicitud if len(detalles_y_planillas) == 1 else solicitud,
+        )
@@ -0,0 +1,149 @@
+# equivalencias/signals.py
+
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from .models import DetalleSolicitud, Estudiante, SolicitudEquivalencia
+
+
+@receiver(post_save, sender=SolicitudEquivalencia)
+@receiver(post_delete, sender=SolicitudEquivalencia)
+def invalidar_acta_solicitud(sender, instance, **kwargs):
+    """Descarta el acta cacheada al modificar la solicitud."""
+    from .services.acta_service import ActaService
+
+    ActaService.invalidar_acta(instance.pk)
+
+
+@receiver(post_save, sender=DetalleSolicitud)
+@receiver(post_delete, sender=DetalleSolicitud)
+def invalidar_acta_detalle(sender, instance, **kwargs):
+    """Descarta el acta cacheada al cambiar una asignatura o su dictamen."""
+    from .services.acta_service import ActaService
+
+    ActaService.invalidar_acta(instance.id_solicitud_id)
+    if solicitud_movida(instance):
+        ActaService.invalidar_acta(instance._solicitud_guardada)
+
+
+def solicitud_movida(instance) -> bool:
+    """Si el detalle guardado pertenecía a otra solicitud (ver DetalleSolicitud.save)."""
+    anterior = getattr(instance, "_solicitud_guardada", None)
+    return anterior is not None and anterior != instance.id_solicitud_id
+
+
+@receiver(post_save, sender=DetalleSolicitud)
+def actualizar_contadores_detalle(sender, instance, created, **kwargs):
+    """
+    Ajusta los contadores de la solicitud al crear o cambiar de estado un
+    detalle; si cambió de solicitud, lo descuenta de la anterior.
+    """
+    from .services.contador_service import ContadoresSolicitudService
+
+    if created:
+        ContadoresSolicitudService.aplicar(
+            instance.id_solicitud_id, nuevo=instance.estado_asignatura)
+    elif solicitud_movida(instance) and instance._estado_guardado is not None:
+        ContadoresSolicitudService.aplicar(
+            instance._solicitud_guardada, anterior=instance._estado_guardado)
+        ContadoresSolicitudService.aplicar(
+            instance.id_solicitud_id, nuevo=instance.estado_asignatura)
+    elif getattr(instance, "_estado_guardado", None) is not None:
+        if instance._estado_guardado != instance.estado_asignatura:
+            ContadoresSolicitudService.aplicar(
+                instance.id_solicitud_id,
+                anterior=instance._estado_guardado,
+                nuevo=instance.estado_asignatura,
+            )
+    else:
+        # No se conoce el estado anterior: se recalcula esa solicitud
+        ContadoresSolicitudService.recalcular(
+            SolicitudEquivalencia.objects.filter(pk=instance.id_solicitud_id))
+
+    instance._estado_guardado = instance.estado_asignatura
+
+
+@receiver(post_delete, sender=DetalleSolicitud)
+def descontar_detalle(sender, instance, **kwargs):
+    """Descuenta de la solicitud el detalle eliminado."""
+    from .services.contador_service import ContadoresSolicitudService
+
+    estado = getattr(instance, "_estado_guardado", None) or instance.estado_asignatura
+    ContadoresSolicitudService.aplicar(instance.id_solicitud_id, anterior=estado)
+
+
+@receiver(pre_save, sender=SolicitudEquivalencia)
+@receiver(pre_save, sender=DetalleSolicitud)
+def recordar_valores_resumen(sender, instance, **kwargs):
+    """Lee los valores guardados si la instancia no los trae (campos diferidos)."""
+    if instance.pk is None or getattr(instance, "_resumen_guardado", None) is not None:
+        return
+    guardada = sender.objects.filter(pk=instance.pk).first()
+    instance._resumen_guardado = guardada.valores_resumen() if guardada else None
+
+
+@receiver(post_save, sender=SolicitudEquivalencia)
+def actualizar_estadisticas_solicitud(sender, instance, created, **kwargs):
+    """Ajusta los resúmenes de estadísticas al crear o modificar una solicitud."""
+    from .services.estadisticas_service import EstadisticasService
+
+    anterior = None if created else getattr(instance, "_resumen_guardado", None)
+    nuevo = instance.valores_resumen()
+    if anterior != nuevo:
+        EstadisticasService.registrar_solicitud(anterior, nuevo)
+
+    # Los detalles se resumen por el mes de inicio de la solicitud
+    if anterior is not None and anterior[0] != nuevo[0]:
+        valores = list(DetalleSolicitud.objects.filter(id_solicitud=instance.pk).values_list(
+            "id_asignatura_id", "estado_asignatura", "fecha_dictamen"))
+        EstadisticasService.registrar_detalles(
+            [(anterior[0], v) for v in valores], [(nuevo[0], v) for v in valores])
+
+    instance._resumen_guardado = nuevo
+
+
+@receiver(post_delete, sender=SolicitudEquivalencia)
+def descontar_estadisticas_solicitud(sender, instance, **kwargs):
+    """Descuenta de los resúmenes la solicitud eliminada."""
+    from .services.estadisticas_service import EstadisticasService
+
+    EstadisticasService.registrar_solicitud(
+        anterior=getattr(instance, "_resumen_guardado", None) or instance.valores_resumen())
+
+
+@receiver(post_save, sender=DetalleSolicitud)
+def actualizar_estadisticas_detalle(sender, instance, created, **kwargs):
+    """Ajusta los resúmenes de estadísticas al crear o dictaminar un detalle."""
+    from .services.estadisticas_service import EstadisticasService
+
+    anterior = None if created else getattr(instance, "_resumen_guardado", None)
+    nuevo = instance.valores_resumen()
+    fecha_inicio = fecha_anterior = instance.id_solicitud.fecha_inicio
+    if not created and solicitud_movida(instance):
+        # Los detalles se resumen por el mes de inicio de su solicitud
+        fecha_anterior = SolicitudEquivalencia.objects.values_list(
+            "fecha_inicio", flat=True).get(pk=instance._solicitud_guardada)
+    if anterior != nuevo or fecha_anterior != fecha_inicio:
+        EstadisticasService.registrar_detalles(
+            [(fecha_anterior, anterior)] if anterior is not None else [],
+            [(fecha_inicio, nuevo)],
+        )
+    instance._resumen_guardado = nuevo
+
+
+@receiver(post_delete, sender=DetalleSolicitud)
+def descontar_estadisticas_detalle(sender, instance, **kwargs):
+    """Descuenta de los resúmenes el detalle eliminado."""
+    from .services.estadisticas_service import EstadisticasService
+
+    valores = getattr(instance, "_resumen_guardado", None) or instance.valores_resumen()
+    EstadisticasService.registrar_detalles(
+        anteriores=[(instance.id_solicitud.fecha_inicio, valores)])
+
+
+@receiver(post_save, sender=Estudiante)
+@receiver(post_delete, sender=Estudiante)
+def invalidar_autocompletar_estudiantes(sender, instance, **kwargs):
+    """Descarta las búsquedas de estudiantes cacheadas."""
+    from carrera_academica.services.autocompletar_service import AutocompletarService
+
+    AutocompletarService.invalidar("estudiantes")
@@ -1,3 +1,852 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from docx import Document
+
+from carrera_academica.services.template_cache import TemplateCache
+from equivalencias.models import (
+    AsignaturaParaEquivalencia,
+    DetalleSolicitud,
+    DocumentoAdjunto,
+    Estudiante,
+    ResumenMensualDictamenes,
+    SolicitudEquivalencia,
+)
+from equivalencias.services.contador_service import ContadoresSolicitudService
+from equivalencias.services.estadisticas_service import EstadisticasService
+from equivalencias.services.planilla_service import PlanillaEvaluacionService
+from equivalencias.services.solicitud_service import SolicitudService
+from notificaciones.models import CorreoSaliente
+from planta_docente.models import Asignatura, Correo, Docente
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class PlanillaEvaluacionServiceTestCase(TestCase):
+    """Tests de la generación de planillas de evaluación."""
+
+    def setUp(self):
+        TemplateCache.invalidar()
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        estudiante = Estudiante.objects.create(
+            nombre_completo="Ana Gómez", dni_pasaporte="30111222")
+        self.solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
+
+        self.detalles = []
+        for nombre in ["física i", "química", "análisis matemático i"]:
+            asignatura = Asignatura.objects.create(
+                nombre=nombre, nivel="i", departamento="basicas",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            asig_equiv = AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura, docente_responsable=docente)
+            self.detalles.append(DetalleSolicitud.objects.create(
+                id_solicitud=self.solicitud, id_asignatura=asig_equiv))
+
+    def tearDown(self):
+        TemplateCache.invalidar()
+
+    def test_fecha_texto(self):
+        """La fecha se escribe con el mes en español."""
+        self.assertEqual(
+            PlanillaEvaluacionService.fecha_texto(date(2025, 3, 5)),
+            "5 de Marzo de 2025",
+        )
+
+    def test_parsea_la_plantilla_una_sola_vez(self):
+        """Varias asignaturas comparten una única plantilla parseada."""
+        with mock.patch(
+            "carrera_academica.services.template_cache.Document",
+            wraps=Document,
+        ) as parser:
+            planillas = list(PlanillaEvaluacionService.generar_planillas(self.detalles))
+
+        self.assertEqual(parser.call_count, 1)
+        self.assertEqual(len(planillas), 3)
+
+        for detalle, contenido in planillas:
+            doc = Document(io.BytesIO(contenido))
+            self.assertIn("SOLICITANTE: Ana Gómez", [p.text for p in doc.paragraphs])
+            self.assertEqual(
+                doc.tables[0].rows[1].cells[0].text,
+                detalle.id_asignatura.asignatura.nombre,
+            )
+
+    def test_error_de_renderizado_no_corta_el_lote(self):
+        """Si una planilla falla, se informa None y se sigue con el resto."""
+        original = PlanillaEvaluacionService.renderizar
+
+        def renderizar(detalle, fecha_texto=None):
+            if detalle == self.detalles[1]:
+                raise ValueError("plantilla dañada")
+            return original(detalle, fecha_texto)
+
+        with mock.patch.object(PlanillaEvaluacionService, "renderizar", side_effect=renderizar):
+            planillas = list(PlanillaEvaluacionService.generar_planillas(self.detalles))
+
+        self.assertEqual([p is None for _, p in planillas], [False, True, False])
+
+
+class CorreoPorResponsableTestCase(TestCase):
+    """Tests del envío agrupado por docente responsable."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        Correo.objects.create(docente=docente, email="juan@frlp.utn.edu.ar", principal=True)
+        otro = Docente.objects.create(
+            nombre="maria", apellido="lopez", documento=23456789,
+            legajo=1002, fecha_nacimiento=date(1975, 1, 1),
+        )
+        Correo.objects.create(docente=otro, email="maria@frlp.utn.edu.ar", principal=True)
+
+        estudiante = Estudiante.objects.create(
+            nombre_completo="Ana Gómez", dni_pasaporte="30111222")
+        solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
+        for nombre in ["analitico.pdf", "programas.pdf"]:
+            documento = DocumentoAdjunto(solicitud=solicitud)
+            documento.archivo.save(nombre, ContentFile(b"%PDF-1.4"))
+
+        self.detalles = []
+        for nombre, responsable in [
+            ("física i", docente), ("física ii", docente),
+            ("química", docente), ("sistemas de representación", otro),
+        ]:
+            asignatura = Asignatura.objects.create(
+                nombre=nombre, nivel="i", departamento="basicas",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            asig_equiv = AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura, docente_responsable=responsable)
+            self.detalles.append(DetalleSolicitud.objects.create(
+                id_solicitud=solicitud, id_asignatura=asig_equiv))
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def encolar(self):
+        pares = [(detalle, b"planilla") for detalle in self.detalles]
+        for grupo in SolicitudService.agrupar_por_responsable(pares):
+            SolicitudService.encolar_email_responsable(grupo)
+
+    def test_un_correo_por_responsable(self):
+        """Las tres asignaturas del mismo docente van en un único correo."""
+        self.encolar()
+
+        correo = CorreoSaliente.objects.get(destinatarios=["juan@frlp.utn.edu.ar"])
+        nombres = [adjunto.nombre for adjunto in correo.adjuntos.all()]
+        # Una copia de la documentación y una planilla por asignatura
+        self.assertEqual(len([n for n in nombres if n.endswith(".pdf")]), 2)
+        self.assertEqual(len([n for n in nombres if n.startswith("Planilla_")]), 3)
+        for nombre in ["física i", "física ii", "química"]:
+            self.assertIn(nombre, correo.cuerpo)
+
+        self.assertEqual(CorreoSaliente.objects.count(), 2)
+
+    @override_settings(EQUIVALENCIAS_AGRUPAR_POR_RESPONSABLE=False)
+    def test_sin_agrupar(self):
+        """Con la agrupación desactivada se envía un correo por asignatura."""
+        self.encolar()
+
+        self.assertEqual(
+            CorreoSaliente.objects.filter(destinatarios=["juan@frlp.utn.edu.ar"]).count(), 3)
+
+    def test_planilla_fallida_va_aparte(self):
+        """Un detalle sin planilla no se agrupa, para informar su error."""
+        pares = [(detalle, b"planilla") for detalle in self.detalles]
+        pares[1] = (self.detalles[1], None)
+
+        grupos = SolicitudService.agrupar_por_responsable(pares)
+
+        self.assertEqual(sorted(len(grupo) for grupo in grupos), [1, 1, 2])
+
+
+class ContadoresSolicitudTestCase(TestCase):
+    """Tests de los contadores persistidos de cada solicitud."""
+
+    def setUp(self):
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        self.asignaturas = []
+        for nombre in ["física i", "química", "análisis matemático i"]:
+            asignatura = Asignatura.objects.create(
+                nombre=nombre, nivel="i", departamento="basicas",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            self.asignaturas.append(AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura, docente_responsable=docente))
+
+        for i in range(5):
+            estudiante = Estudiante.objects.create(
+                nombre_completo=f"Estudiante {i}", dni_pasaporte=f"3000000{i}")
+            solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
+            for asig_equiv, estado in zip(
+                self.asignaturas, ["Aprobada", "Requiere PC", "Enviada a Cátedra"]
+            ):
+                DetalleSolicitud.objects.create(
+                    id_solicitud=solicitud, id_asignatura=asig_equiv, estado_asignatura=estado)
+
+        self.solicitud = SolicitudEquivalencia.objects.first()
+
+    def contadores(self):
+        self.solicitud.refresh_from_db()
+        return (
+            self.solicitud.cant_asignaturas, self.solicitud.cant_respondidas,
+            self.solicitud.cant_aprobadas, self.solicitud.cant_denegadas,
+            self.solicitud.cant_requiere_pc,
+        )
+
+    def test_alta_de_detalles(self):
+        """Crear detalles suma en el total y en el contador de su estado."""
+        self.assertEqual(self.contadores(), (3, 2, 1, 0, 1))
+        self.assertEqual(self.solicitud.progreso, "2 de 3")
+
+    def test_transiciones_de_dictamen(self):
+        """Cambiar el estado mueve el detalle entre contadores."""
+        detalle = self.solicitud.detallesolicitud_set.get(estado_asignatura="Enviada a Cátedra")
+        detalle.estado_asignatura = "Denegada"
+        detalle.save()
+        self.assertEqual(self.contadores(), (3, 3, 1, 1, 1))
+        self.assertTrue(self.solicitud.lista_para_acta)
+
+        detalle.estado_asignatura = "Aprobada"
+        detalle.save()
+        self.assertEqual(self.contadores(), (3, 3, 2, 0, 1))
+
+        detalle.delete()
+        self.assertEqual(self.contadores(), (2, 2, 1, 0, 1))
+
+    def test_ediciones_simultaneas_del_mismo_detalle(self):
+        """Dos instancias cargadas antes del cambio no cuentan dos veces la transición."""
+        pk = self.solicitud.detallesolicitud_set.get(estado_asignatura="Enviada a Cátedra").pk
+        admin = DetalleSolicitud.objects.get(pk=pk)
+        vista = DetalleSolicitud.objects.get(pk=pk)
+
+        admin.estado_asignatura = "Aprobada"
+        admin.save()
+        vista.estado_asignatura = "Aprobada"
+        vista.save()
+
+        self.assertEqual(self.contadores(), (3, 3, 2, 0, 1))
+        self.assertEqual(ContadoresSolicitudService.recalcular(guardar=False), [])
+        self.assertEqual(EstadisticasService.verificar(), 0)
+
+    def test_mover_detalle_a_otra_solicitud(self):
+        """Reasignar la solicitud de un detalle ajusta los contadores de ambas."""
+        otra = SolicitudEquivalencia.objects.create(
+            id_estudiante=self.solicitud.id_estudiante,
+            fecha_inicio=timezone.now() - timedelta(days=400),
+        )
+        detalle = self.solicitud.detallesolicitud_set.get(estado_asignatura="Aprobada")
+
+        detalle.id_solicitud = otra
+        detalle.estado_asignatura = "Denegada"
+        detalle.save()
+
+        self.assertEqual(self.contadores(), (2, 1, 0, 0, 1))
+        otra.refresh_from_db()
+        self.assertEqual(
+            (otra.cant_asignaturas, otra.cant_respondidas, otra.cant_aprobadas, otra.cant_denegadas),
+            (1, 1, 0, 1),
+        )
+        self.assertEqual(ContadoresSolicitudService.recalcular(guardar=False), [])
+        # El detalle pasa al mes de inicio de la otra solicitud en las estadísticas
+        self.assertEqual(EstadisticasService.verificar(), 0)
+
+    def test_guardar_sin_cambio_de_estado(self):
+        """Guardar otros campos no toca los contadores."""
+        detalle = self.solicitud.detallesolicitud_set.get(estado_asignatura="Requiere PC")
+        detalle.detalle_pc = "Hidrostática"
+
+        # Lectura del estado guardado (con la fila bloqueada) y el UPDATE
+        with self.assertNumQueries(2):
+            detalle.save()
+
+    def test_guardar_solicitud_no_pisa_contadores(self):
+        """Una instancia con contadores viejos no los sobrescribe al guardarse."""
+        vieja = SolicitudEquivalencia.objects.get(pk=self.solicitud.pk)
+        DetalleSolicitud.objects.create(
+            id_solicitud=self.solicitud, id_asignatura=self.asignaturas[0])
+
+        vieja.estado_general = "Cancelada"
+        vieja.save()
+
+        self.assertEqual(self.contadores()[0], 4)
+
+    def test_listas_para_acta(self):
+        """El filtro usa los contadores, sin agregar detalles."""
+        self.solicitud.detallesolicitud_set.filter(
+            estado_asignatura="Enviada a Cátedra").get().delete()
+
+        with self.assertNumQueries(1):
+            listas = list(SolicitudEquivalencia.objects.listas_para_acta())
+
+        self.assertEqual(listas, [self.solicitud])
+
+    def test_dashboard_sin_n_mas_1(self):
+        """Las consultas del dashboard no crecen con la cantidad de solicitudes."""
+        with self.assertNumQueries(5):  # solicitudes + 4 prefetch
+            progresos = [s.progreso for s in SolicitudEquivalencia.objects.with_related_data()]
+
+        self.assertEqual(progresos, ["2 de 3"] * 5)
+
+    def test_reparar_contadores(self):
+        """El comando reconstruye los contadores desfasados desde los detalles."""
+        # Una edición directa no dispara las signals
+        DetalleSolicitud.objects.filter(id_solicitud=self.solicitud).update(
+            estado_asignatura="Aprobada")
+
+        self.assertEqual(len(ContadoresSolicitudService.recalcular(guardar=False)), 1)
+        call_command("reparar_contadores_solicitudes", stdout=mock.Mock())
+
+        self.assertEqual(self.contadores(), (3, 3, 3, 0, 0))
+        self.assertEqual(ContadoresSolicitudService.recalcular(), [])
+
+
+@override_settings(EQUIVALENCIAS_DASHBOARD_POR_PAGINA=3)
+class DashboardPaginadoTestCase(TestCase):
+    """Tests de la paginación por clave y los filtros del dashboard."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("secretaria"))
+        inicio = timezone.now() - timedelta(days=30)
+        for i in range(7):
+            estudiante = Estudiante.objects.create(
+                nombre_completo=f"Estudiante {i}", dni_pasaporte=f"3000000{i}")
+            solicitud = SolicitudEquivalencia.objects.create(
+                id_estudiante=estudiante, fecha_inicio=inicio + timedelta(days=i))
+            if i < 2:
+                solicitud.estado_general = "Completada"
+                solicitud.save()
+
+    def recorrer(self, **filtros):
+        """Sigue los enlaces "Siguiente" y devuelve las páginas."""
+        paginas = []
+        url = reverse("dashboard")
+        response = self.client.get(url, filtros)
+        while True:
+            paginas.append([s.id_estudiante.nombre_completo for s in response.context["solicitudes"]])
+            if not response.context["siguiente"]:
+                return paginas
+            response = self.client.get(url, {**filtros, "despues": response.context["siguiente"]})
+
+    def test_completadas_al_final(self):
+        """Recorre todas las páginas: en proceso por fecha, luego completadas."""
+        paginas = self.recorrer()
+
+        self.assertEqual([len(p) for p in paginas], [3, 3, 1])
+        self.assertEqual(
+            sum(paginas, []),
+            [f"Estudiante {i}" for i in [2, 3, 4, 5, 6, 0, 1]],
+        )
+
+    def test_consultas_constantes_por_pagina(self):
+        """Cada página cuesta lo mismo, esté al principio o al final."""
+        primera = self.client.get(reverse("dashboard"))
+        cursor = primera.context["siguiente"]
+
+        with self.assertNumQueries(3):  # sesión, usuario y página
+            self.client.get(reverse("dashboard"), {"despues": cursor})
+
+    def test_filtros(self):
+        """Filtra por estado, por fecha y descarta cursores alterados."""
+        self.assertEqual(self.recorrer(estado="Completada"), [["Estudiante 0", "Estudiante 1"]])
+
+        desde = (timezone.now() - timedelta(days=25)).date().isoformat()
+        self.assertEqual(sum(self.recorrer(desde=desde), []), ["Estudiante 5", "Estudiante 6"])
+
+        response = self.client.get(reverse("dashboard"), {"despues": "alterado"})
+        self.assertTrue(response.context["es_primera_pagina"])
+
+    @skipUnless(connection.vendor == "sqlite", "plan de consulta de SQLite")
+    def test_siguiente_pagina_usa_el_indice(self):
+        """El cursor se resuelve como rango sobre sol_completada_fecha_idx, sin SCAN."""
+        ultima = SolicitudEquivalencia.objects.all().orden_dashboard()[2]
+        qs = SolicitudEquivalencia.objects.all().orden_dashboard().despues_de(
+            ultima.completada, ultima.fecha_inicio, ultima.pk)
+        self.assertEqual(len(qs), 4)
+
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plan = " | ".join(fila[-1] for fila in cursor.fetchall())
+
+        self.assertIn("SEARCH", plan)
+        self.assertIn("sol_completada_fecha_idx", plan)
+        self.assertNotIn("SCAN", plan)
+
+
+class AutocompletarEstudiantesTestCase(TestCase):
+    """Tests del endpoint de autocompletado de estudiantes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user("secretaria"))
+        for nombre, dni in [
+            ("Ana Gómez", "30111222"), ("Andrés Paz", "30999888"),
+            ("Beatriz Ríos", "28111333"), ("anabel Suárez", "41222333"),
+        ]:
+            Estudiante.objects.create(nombre_completo=nombre, dni_pasaporte=dni)
+        self.url = reverse("api_estudiantes")
+
+    def buscar(self, **params):
+        return [e["nombre_completo"] for e in self.client.get(self.url, params).json()["estudiantes"]]
+
+    def test_prefijo_de_nombre_o_dni(self):
+        """Busca por prefijo, sin distinguir mayúsculas, en nombre y DNI."""
+        self.assertEqual(self.buscar(q="ana"), ["Ana Gómez", "anabel Suárez"])
+        self.assertEqual(self.buscar(q="301"), ["Ana Gómez"])
+        self.assertEqual(self.buscar(q="gómez"), [])
+
+    def test_minimo_y_limite(self):
+        """Menos de 2 caracteres no consulta; el límite recorta los resultados."""
+        self.assertEqual(self.buscar(q="a"), [])
+        self.assertEqual(len(self.buscar(q="an", limite=2)), 2)
+
+    def test_cachea_y_se_invalida(self):
+        """La misma búsqueda no vuelve a la base hasta que cambian los estudiantes."""
+        self.buscar(q="an")
+
+        with self.assertNumQueries(2):  # sesión y usuario
+            self.buscar(q="  AN ")
+
+        Estudiante.objects.create(nombre_completo="Anselmo Díaz", dni_pasaporte="35000111")
+        self.assertIn("Anselmo Díaz", self.buscar(q="an"))
+
+    def test_sin_cache_http(self):
+        """La respuesta no se cachea en el navegador: vale la versión del servidor."""
+        response = self.client.get(self.url, {"q": "an"})
+        self.assertNotIn("max-age", response.get("Cache-Control", ""))
+
+    @skipUnless(connection.vendor == "sqlite", "plan de consulta de SQLite")
+    def test_busqueda_usa_los_indices(self):
+        """Nombre y DNI se buscan con rangos sobre sus índices, sin SCAN."""
+        with CaptureQueriesContext(connection) as consultas:
+            self.buscar(q="an")
+        sqls = [c["sql"] for c in consultas if "equivalencias_estudiante" in c["sql"]]
+        self.assertEqual(len(sqls), 2)
+
+        planes = []
+        with connection.cursor() as cursor:
+            for sql in sqls:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                planes.append(" | ".join(fila[-1] for fila in cursor.fetchall()))
+
+        self.assertIn("est_nombre_upper_idx", planes[0])
+        self.assertIn("est_dni_idx", planes[1])
+        for plan in planes:
+            self.assertIn("SEARCH", plan)
+            self.assertNotIn("SCAN", plan)
+
+
+class CrearSolicitudTestCase(TestCase):
+    """Tests del alta de solicitudes en lote y en una transacción."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        self.estudiante = Estudiante.objects.create(
+            nombre_completo="Ana Gómez", dni_pasaporte="30111222")
+        self.asignaturas = []
+        for i in range(4):
+            docente = Docente.objects.create(
+                nombre=f"docente{i}", apellido="perez", documento=20000000 + i,
+                legajo=1000 + i, fecha_nacimiento=date(1980, 1, 1),
+            )
+            Correo.objects.create(docente=docente, email=f"d{i}@frlp.utn.edu.ar", principal=True)
+            asignatura = Asignatura.objects.create(
+                nombre=f"asignatura {i}", nivel="i", departamento="basicas",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            self.asignaturas.append(AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura, docente_responsable=docente))
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def documentos(self):
+        return [ContentFile(b"%PDF-1.4", name=n) for n in ["analitico.pdf", "programas.pdf"]]
+
+    def crear(self, asignaturas):
+        return SolicitudService.crear_solicitud(
+            self.estudiante, [str(a.pk) for a in asignaturas], self.documentos())
+
+    def test_crea_todo_y_encola_al_confirmar(self):
+        """Los correos se encolan recién al confirmarse la transacción."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            solicitud, errores = self.crear(self.asignaturas)
+            self.assertFalse(CorreoSaliente.objects.exists())
+
+        # Un aviso a las cátedras (más la invalidación de las estadísticas)
+        avisos = [c for c in callbacks
+                  if getattr(c, "func", None) == SolicitudService.notificar_catedras]
+        self.assertEqual(len(avisos), 1)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(solicitud.documentoadjunto_set.count(), 2)
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.progreso, "0 de 4")
+        self.assertEqual(CorreoSaliente.objects.count(), 4)
+
+    def test_consultas_no_crecen_con_las_asignaturas(self):
+        """Asignaturas, documentos y detalles se escriben en lote."""
+        consultas = []
+        for asignaturas in [self.asignaturas[:1], self.asignaturas]:
+            with self.captureOnCommitCallbacks(), CaptureQueriesContext(connection) as ctx:
+                self.crear(asignaturas)
+            consultas.append(len(ctx))
+
+        self.assertEqual(consultas[0], consultas[1])
+
+    def test_asignatura_inexistente(self):
+        """Un pk inválido no crea nada."""
+        with self.assertRaises(AsignaturaParaEquivalencia.DoesNotExist):
+            SolicitudService.crear_solicitud(self.estudiante, ["999"], self.documentos())
+
+        self.assertFalse(SolicitudEquivalencia.objects.exists())
+
+
+class DictamenesMasivosTestCase(TestCase):
+    """Tests de la carga de varios dictámenes en un solo envío."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user("secretaria"))
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        estudiante = Estudiante.objects.create(
+            nombre_completo="Ana Gómez", dni_pasaporte="30111222")
+        self.solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
+        self.detalles = []
+        for nombre in ["física i", "química", "análisis matemático i"]:
+            asignatura = Asignatura.objects.create(
+                nombre=nombre, nivel="i", departamento="basicas",
+                especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+            )
+            asig_equiv = AsignaturaParaEquivalencia.objects.create(
+                asignatura=asignatura, docente_responsable=docente)
+            self.detalles.append(DetalleSolicitud.objects.create(
+                id_solicitud=self.solicitud, id_asignatura=asig_equiv,
+                estado_asignatura="Enviada a Cátedra"))
+
+    def test_aplica_todos_en_lote(self):
+        """Un envío actualiza todas las asignaturas con la misma fecha."""
+        a, b, c = self.detalles
+        response = self.client.post(reverse("dictamenes_masivos", args=[self.solicitud.pk]), {
+            f"estado_{a.pk}": "Aprobada",
+            f"estado_{b.pk}": "Requiere PC", f"detalle_pc_{b.pk}": "Hidrostática",
+            f"estado_{c.pk}": "Denegada", f"detalle_pc_{c.pk}": "se ignora",
+        })
+        self.assertRedirects(response, reverse("solicitud_detalle", args=[self.solicitud.pk]))
+
+        detalles = {d.pk: d for d in DetalleSolicitud.objects.all()}
+        self.assertEqual(detalles[b.pk].detalle_pc, "Hidrostática")
+        self.assertIsNone(detalles[c.pk].detalle_pc)
+        self.assertEqual(len({d.fecha_dictamen for d in detalles.values()}), 1)
+
+        self.solicitud.refresh_from_db()
+        self.assertEqual(
+            (self.solicitud.cant_aprobadas, self.solicitud.cant_requiere_pc,
+             self.solicitud.cant_denegadas),
+            (1, 1, 1),
+        )
+        self.assertTrue(self.solicitud.lista_para_acta)
+
+    def test_consultas_constantes(self):
+        """Las escrituras no crecen con la cantidad de asignaturas."""
+        dictamenes = {d.pk: ("Aprobada", "") for d in self.detalles}
+
+        # Savepoint, detalles, bulk_update, contadores, release y recarga, más
+        # los resúmenes de estadísticas: lectura, bulk_update y bulk_create
+        # (con sus dos savepoints y releases)
+        with self.assertNumQueries(13):
+            SolicitudService.registrar_dictamenes(self.solicitud, dictamenes)
+
+        self.assertEqual(self.solicitud.progreso, "3 de 3")
+
+    def test_estado_invalido(self):
+        """Un estado inexistente no aplica ningún cambio."""
+        a, b, _ = self.detalles
+        with self.assertRaises(ValueError):
+            SolicitudService.registrar_dictamenes(
+                self.solicitud, {a.pk: ("Aprobada", ""), b.pk: ("Otra", "")})
+
+        self.assertFalse(DetalleSolicitud.objects.filter(estado_asignatura="Aprobada").exists())
+
+    def test_vista_de_detalle_con_estado_invalido(self):
+        """Un formulario alterado muestra el error en lugar de fallar con un 500."""
+        url = reverse("solicitud_detalle", args=[self.solicitud.pk])
+
+        response = self.client.post(
+            url, {"detalle_id": self.detalles[0].pk, "estado_asignatura": "Otra"}, follow=True)
+
+        self.assertRedirects(response, url)
+        mensajes = [(m.level_tag, m.message) for m in response.context["messages"]]
+        self.assertEqual(mensajes, [("error", "No se guardó el dictamen: Estados inválidos: Otra")])
+        self.assertEqual(
+            DetalleSolicitud.objects.get(pk=self.detalles[0].pk).estado_asignatura,
+            "Enviada a Cátedra",
+        )
+
+
+class EstadisticasResumenTestCase(TestCase):
+    """Tests de los resúmenes mensuales que alimentan las estadísticas."""
+
+    def setUp(self):
+        cache.clear()
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        self.fisica, self.quimica = [
+            AsignaturaParaEquivalencia.objects.create(
+                asignatura=Asignatura.objects.create(
+                    nombre=nombre, nivel="i", departamento="basicas",
+                    especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+                ),
+                docente_responsable=docente,
+            )
+            for nombre in ["física i", "química"]
+        ]
+        self.estudiante = Estudiante.objects.create(
+            nombre_completo="Ana Gómez", dni_pasaporte="30111222")
+
+        # 2025: una solicitud en marzo, completada en abril a los 25 días
+        marzo = self.fecha(2025, 3, 10)
+        self.sol_2025 = self.crear_solicitud(marzo, [
+            (self.fisica, "Aprobada", marzo + timedelta(days=4)),
+            (self.quimica, "Denegada", marzo + timedelta(days=10)),
+        ])
+        self.sol_2025.estado_general = "Completada"
+        self.sol_2025.fecha_completada = marzo + timedelta(days=25)
+        self.sol_2025.save()
+
+        # 2026: dos solicitudes en mayo, una sin dictámenes
+        mayo = self.fecha(2026, 5, 2)
+        self.sol_2026 = self.crear_solicitud(mayo, [
+            (self.fisica, "Requiere PC", mayo + timedelta(days=6)),
+        ])
+        self.crear_solicitud(mayo + timedelta(days=1), [
+            (self.fisica, "Enviada a Cátedra", None),
+            (self.quimica, "Enviada a Cátedra", None),
+        ])
+
+    def fecha(self, anio, mes, dia):
+        return timezone.make_aware(timezone.datetime(anio, mes, dia, 12))
+
+    def crear_solicitud(self, fecha_inicio, detalles):
+        solicitud = SolicitudEquivalencia.objects.create(
+            id_estudiante=self.estudiante, fecha_inicio=fecha_inicio)
+        for asig_equiv, estado, fecha_dictamen in detalles:
+            DetalleSolicitud.objects.create(
+                id_solicitud=solicitud, id_asignatura=asig_equiv,
+                estado_asignatura=estado, fecha_dictamen=fecha_dictamen)
+        return solicitud
+
+    def test_metricas_de_un_anio(self):
+        """Las métricas del año salen de los resúmenes de ese año."""
+        stats = EstadisticasService.calcular(2025)
+
+        self.assertEqual(stats["total_solicitudes"], 1)
+        self.assertEqual(stats["total_asignaturas_procesadas"], 2)
+        # Solo los meses con solicitudes nuevas: la completada en abril no figura
+        self.assertEqual((stats["nuevas_data"], stats["completadas_data"]), ([1], [0]))
+        self.assertEqual(stats["avg_resolucion_dias"], 25)
+        self.assertEqual(stats["avg_dictamen_dias"], 7)
+        self.assertEqual(stats["dictamen_labels"], ["Aprobada", "Denegada"])
+        self.assertEqual(stats["asignaturas_problematicas"], [
+            {"nombre_materia": "química", "estado_asignatura": "Denegada", "total": 1}])
+        self.assertEqual(stats["top_demoras"], [
+            {"nombre": "química", "dias": 10}, {"nombre": "física i", "dias": 4}])
+
+    def test_promedio_historico(self):
+        """Sin año, cada mes promedia sobre la cantidad de años con solicitudes."""
+        stats = EstadisticasService.calcular()
+
+        self.assertEqual(stats["total_solicitudes"], 3)
+        self.assertEqual(stats["nuevas_data"][2], 0.5)   # marzo
+        self.assertEqual(stats["nuevas_data"][4], 1)     # mayo
+        self.assertEqual(stats["completadas_data"][3], 0.5)   # abril
+        self.assertEqual(stats["asignaturas_mas_solicitadas"][0],
+                         {"nombre_materia": "física i", "total": 3})
+        self.assertEqual(stats["top_demoras"][0], {"nombre": "química", "dias": 10})
+        self.assertEqual(EstadisticasService.anios_disponibles(), [2026, 2025])
+
+    def test_cambios_incrementales_coinciden_con_la_reconstruccion(self):
+        """Altas, dictámenes, cambios de fecha y bajas dejan los resúmenes al día."""
+        detalle = self.sol_2026.detallesolicitud_set.get()
+        detalle.estado_asignatura = "Aprobada"
+        detalle.fecha_dictamen = detalle.fecha_dictamen + timedelta(days=3)
+        detalle.save()
+
+        # Mover la solicitud de mes mueve también sus detalles
+        self.sol_2025.fecha_inicio = self.fecha(2025, 2, 20)
+        self.sol_2025.save()
+
+        # Instancia con campos diferidos
+        solicitud = SolicitudEquivalencia.objects.only("id").get(pk=self.sol_2026.pk)
+        solicitud.estado_general = "Completada"
+        solicitud.fecha_completada = self.fecha(2026, 6, 1)
+        solicitud.save()
+
+        nueva, _ = SolicitudService.crear_solicitud(
+            self.estudiante, [self.fisica.pk, self.quimica.pk], [])
+        SolicitudService.registrar_dictamenes(nueva, {
+            d.pk: ("Aprobada", None) for d in nueva.detallesolicitud_set.all()})
+
+        DetalleSolicitud.objects.filter(id_asignatura=self.quimica).first().delete()
+        SolicitudEquivalencia.objects.filter(
+            fecha_inicio__month=5, estado_general="En Proceso").delete()
+
+        self.assertEqual(EstadisticasService.verificar(), 0)
+        incremental = [EstadisticasService.calcular(anio) for anio in (None, 2025, 2026)]
+        EstadisticasService.reconstruir()
+        self.assertEqual(
+            [EstadisticasService.calcular(anio) for anio in (None, 2025, 2026)], incremental)
+
+    def test_consultas_constantes(self):
+        """Las estadísticas leen los resúmenes con dos consultas."""
+        for i in range(5):
+            self.crear_solicitud(self.fecha(2024, 1 + i, 1), [(self.quimica, "Aprobada", None)])
+
+        with self.assertNumQueries(2):
+            EstadisticasService.calcular()
+        with self.assertNumQueries(2):
+            EstadisticasService.calcular(2026)
+
+    def test_vista(self):
+        """La vista muestra el año elegido si tiene solicitudes."""
+        self.client.force_login(User.objects.create_user("secretaria"))
+
+        response = self.client.get(reverse("estadisticas"), {"year": "2025"})
+
+        self.assertEqual(response.context["titulo_periodo"], "Año 2025")
+        self.assertEqual(response.context["stats"]["total_solicitudes"], 1)
+        response = self.client.get(reverse("estadisticas"), {"year": "1999"})
+        self.assertEqual(response.context["stats"]["total_solicitudes"], 3)
+
+    def test_comando_reconstruir(self):
+        """El comando informa los resúmenes desfasados y los reconstruye."""
+        ResumenMensualDictamenes.objects.all().delete()
+        salida = io.StringIO()
+
+        call_command("reconstruir_estadisticas", "--verificar", stdout=salida)
+        self.assertIn("desfasadas", salida.getvalue())
+
+        call_command("reconstruir_estadisticas", stdout=salida)
+        self.assertEqual(EstadisticasService.verificar(), 0)
+
+    def test_cache_por_anio(self):
+        """Los años sin cambios se sirven de la caché; una escritura invalida su año."""
+        for anio in (None, 2025, 2026):
+            EstadisticasService.calcular_cacheado(anio)
+        with self.assertNumQueries(0):
+            EstadisticasService.calcular_cacheado(2025)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SolicitudService.registrar_dictamenes(self.sol_2026, {
+                d.pk: ("Aprobada", None) for d in self.sol_2026.detallesolicitud_set.all()})
+
+        with self.assertNumQueries(0):
+            EstadisticasService.calcular_cacheado(2025)
+        with self.assertNumQueries(2):
+            stats = EstadisticasService.calcular_cacheado(2026)
+        self.assertEqual(stats["dictamen_labels"], ["Aprobada"])
+        with self.assertNumQueries(2):
+            EstadisticasService.calcular_cacheado()
+
+    @override_settings(EQUIVALENCIAS_ESTADISTICAS_TTL=300, EQUIVALENCIAS_ESTADISTICAS_TTL_CERRADOS=86400)
+    def test_ttl_de_anios_cerrados_requiere_cache_compartida(self):
+        """Con una caché por proceso los años cerrados no se guardan más que el TTL corto."""
+        with mock.patch.object(cache, "set", wraps=cache.set) as guardar:
+            EstadisticasService.calcular_cacheado(2025)
+        self.assertEqual(guardar.call_args.args[2], 300)
+
+        cache.clear()
+        with mock.patch.object(EstadisticasService, "_cache_compartida", return_value=True), \
+                mock.patch.object(cache, "set", wraps=cache.set) as guardar:
+            EstadisticasService.calcular_cacheado(2025)
+        self.assertEqual(guardar.call_args.args[2], 86400)
+
+    def test_reconstruir_invalida_todo(self):
+        """Reconstruir los resúmenes descarta todas las estadísticas cacheadas."""
+        viejas = EstadisticasService.calcular_cacheado(2025)
+        DetalleSolicitud.objects.filter(id_solicitud=self.sol_2025).update(
+            estado_asignatura="Aprobada")
+
+        self.assertEqual(EstadisticasService.calcular_cacheado(2025), viejas)
+        with self.captureOnCommitCallbacks(execute=True):
+            EstadisticasService.reconstruir()
+        self.assertEqual(
+            EstadisticasService.calcular_cacheado(2025)["dictamen_labels"], ["Aprobada"])
+
+    @skipUnless(numpy, "El motor de escaneo requiere NumPy")
+    def test_motor_escaneo_coincide_con_los_resumenes(self):
+        """El escaneo con NumPy devuelve lo mismo que los resúmenes."""
+        self.crear_solicitud(self.fecha(2026, 7, 1), [])  # sin detalles
+        for anio in (None, 2025, 2026):
+            with self.subTest(anio=anio):
+                # Bloques chicos: una solicitud queda repartida entre dos bloques
+                self.assertEqual(
+                    EstadisticasService.calcular_por_escaneo(anio, chunk_size=2),
+                    EstadisticasService.calcular(anio),
+                )
+
+    @skipUnless(numpy, "El motor de escaneo requiere NumPy")
+    @override_settings(TIME_ZONE="America/Argentina/Buenos_Aires")
+    def test_motor_escaneo_usa_la_zona_horaria(self):
+        """Los meses se cuentan en hora local, igual que en los resúmenes."""
+        # 1 de abril 01:00 UTC es 31 de marzo 22:00 en Argentina
+        utc = timezone.datetime(2025, 4, 1, 1, tzinfo=timezone.get_fixed_timezone(0))
+        self.crear_solicitud(utc, [(self.fisica, "Aprobada", utc + timedelta(days=2))])
+        EstadisticasService.reconstruir()
+
+        stats = EstadisticasService.calcular_por_escaneo(2025)
+
+        self.assertEqual(stats["meses_labels"], [date(2025, 3, 1).strftime("%B %Y").capitalize()])
+        self.assertEqual(stats, EstadisticasService.calcular(2025))
+
+    @skipUnless(numpy, "El motor de escaneo requiere NumPy")
+    def test_vista_con_motor_escaneo(self):
+        """EQUIVALENCIAS_ESTADISTICAS_MOTOR elige el motor de la vista."""
+        self.client.force_login(User.objects.create_user("secretaria"))
+
+        with override_settings(EQUIVALENCIAS_ESTADISTICAS_MOTOR="escaneo"), \
+                mock.patch.object(EstadisticasService, "calcular") as calcular:
+            response = self.client.get(reverse("estadisticas"), {"year": "2025"})
+
+        calcular.assert_not_called()
+        self.assertEqual(response.context["stats"]["total_solicitudes"], 1)
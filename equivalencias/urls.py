@@ -9,6 +9,11 @@ urlpatterns = [
     # <int:pk> es un parámetro dinámico que captura el ID de la solicitud
     path("solicitud/<int:pk>/", views.solicitud_detalle_view, name="solicitud_detalle"),
     path("solicitud/nueva/", views.crear_solicitud_view, name="crear_solicitud"),
+    path(
+        "solicitud/<int:pk>/dictamenes/",
+        views.dictamenes_masivos_view,
+        name="dictamenes_masivos",
+    ),
     path(
         "solicitud/<int:pk>/generar_pdf/",
         views.generar_acta_pdf_view,
@@ -30,4 +35,9 @@ urlpatterns = [
         name="reenviar_pendientes",
     ),
     path("estadisticas/", views.estadisticas_view, name="estadisticas"),
+    path(
+        "api/estudiantes/",
+        views.estudiantes_autocompletar_api_view,
+        name="api_estudiantes",
+    ),
 ]
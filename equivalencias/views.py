@@ -1,24 +1,24 @@
 # equivalencias/views.py
+from datetime import datetime
+
 # Django imports
+from django.conf import settings
+from django.core import signing
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.conf import settings
-from django.http import HttpResponse
-from django.template.loader import render_to_string
-from django.core.mail import EmailMessage
-from django.db.models import Case, When, Value
+from django.http import Http404, HttpResponse, JsonResponse
 from django.contrib import messages
-from django.db.models import Count, Avg, F, DurationField
-from django.db.models.functions import TruncMonth, Trim, ExtractMonth
+from django.db.models.functions import Upper
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-# Library imports
-import io
-import mimetypes
-import os
-from docx import Document
-from weasyprint import HTML
-from datetime import date
+from carrera_academica.services.autocompletar_service import AutocompletarService
+from notificaciones.services.outbox_service import OutboxService
+
+from .services.acta_service import ActaService
+from .services.estadisticas_service import EstadisticasService
+from .services.planilla_service import PlanillaEvaluacionService
+from .services.solicitud_service import SolicitudService
 
 # Model imports
 from .models import (
@@ -26,330 +26,97 @@ from .models import (
     AsignaturaParaEquivalencia,
     SolicitudEquivalencia,
     DetalleSolicitud,
-    DocumentoAdjunto,
 )
 
 
-def _enviar_email_catedra(detalle_solicitud):
+def _encolar_email_catedra(detalle_solicitud, planilla=None):
     """
-    Función auxiliar que genera el Word, los adjuntos y envía el email
-    para un detalle de solicitud específico.
+    Función auxiliar que genera el Word y encola el email con los adjuntos
+    para un detalle de solicitud específico (lo envía `procesar_correos`).
+
+    `planilla` permite pasar el .docx ya generado (ver
+    PlanillaEvaluacionService.generar_planillas).
     """
-    solicitud = detalle_solicitud.id_solicitud
-    asignatura = detalle_solicitud.id_asignatura
-    estudiante = solicitud.id_estudiante
-
-    # Obtener el email del responsable
-    responsable = asignatura.docente_responsable
-    correo_principal = responsable.correos.filter(principal=True).first()
-
-    if not correo_principal:
-        raise ValueError(f"No se encontró correo principal para {responsable}")
-
-    # --- 2. OBTÉN Y FORMATEA LA FECHA ACTUAL ---
-    hoy = date.today()
-    meses = (
-        "Enero",
-        "Febrero",
-        "Marzo",
-        "Abril",
-        "Mayo",
-        "Junio",
-        "Julio",
-        "Agosto",
-        "Septiembre",
-        "Octubre",
-        "Noviembre",
-        "Diciembre",
-    )
-    fecha_actual_texto = f"{hoy.day} de {meses[hoy.month - 1]} de {hoy.year}"
-
-    # Personalizar el documento de Word en memoria
-    doc = Document("templates_word/planilla_evaluacion.docx")
-    for p in doc.paragraphs:
-        if "[fecha]" in p.text:
-            p.text = p.text.replace("[fecha]", fecha_actual_texto)
-        if "[alumno]" in p.text:
-            p.text = p.text.replace("[alumno]", estudiante.nombre_completo)
-        if "[asignatura]" in p.text:
-            p.text = p.text.replace("[asignatura]", asignatura.asignatura.nombre)
-
-    # ... (Si tienes más reemplazos en tablas, también irían aquí)
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    if "[fecha]" in p.text:
-                        p.text = p.text.replace("[fecha]", fecha_actual_texto)
-                    if "[asignatura]" in p.text:
-                        p.text = p.text.replace(
-                            "[asignatura]", asignatura.asignatura.nombre
-                        )
-
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-
-    # Preparar y enviar el correo
-    email = EmailMessage(
-        # Cambiamos el asunto para que sirva en ambos casos
-        subject=f"Solicitud de Equivalencia de {estudiante.nombre_completo}",
-        # Cambiamos el cuerpo del correo
-        body=f"""
-        <p>Hola profe, le envío la documentación para dar, si corresponde, la equivalencia de <strong>{asignatura.asignatura.nombre}</strong>, al futuro estudiante <strong>{estudiante.nombre_completo}</strong>.</p>
-
-        <p>Agradeceré que responda a este mismo correo con su dictamen. No es necesario reenviar el archivo.</p>
-        
-        <p>Sin otro particular.</p>
-        <p><br></p>
-
-        <p style='font-size:15px;font-family:"Calibri",sans-serif; color:#174E86;'>
-            <strong>Ing. Jorge RONCONI</strong><br>
-            Secretario de Departamento
-        </p>
-        <p style='font-size:15px;font-family:"Calibri",sans-serif;color:#174E86;'>
-            <strong>
-                Departamento Ingeniería Civil<br>
-                Universidad Tecnológica Nacional<br>
-                Facultad Regional La Plata
-            </strong>
-        </p>
-        <p style='font-size:15px;font-family:"Calibri",sans-serif;text-align:center;color:#70AD47;'>
-            Universidad Publica, Gratuita y de Calidad.
-        </p>
-        """,
-        from_email=None,
-        to=[correo_principal.email],
-    )
+    SolicitudService.encolar_email_responsable([(detalle_solicitud, planilla)])
 
-    for documento_adjunto in solicitud.documentoadjunto_set.all():
-        content_type = (
-            mimetypes.guess_type(documento_adjunto.archivo.name)[0]
-            or "application/octet-stream"
-        )
-        email.attach(
-            documento_adjunto.archivo.name.split("/")[-1],
-            documento_adjunto.archivo.read(),
-            content_type,
-        )
 
-    email.attach(
-        f"Planilla_{estudiante.dni_pasaporte}_{asignatura.asignatura.nombre}.docx",
-        buffer.getvalue(),
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    )
-    email.content_subtype = "html"  # Para enviar el cuerpo como HTML
-    email.send()
+SALT_CURSOR_DASHBOARD = "equivalencias.dashboard"
 
 
-def _calculate_statistics(solicitudes_qs, is_historical_view=False):
-    """
-    Recibe un QuerySet de solicitudes y calcula todas las métricas.
-    Devuelve un diccionario con todos los resultados listos para la plantilla.
-    """
-    solicitudes_ids = solicitudes_qs.values_list("id", flat=True)
-    detalles_qs = DetalleSolicitud.objects.filter(id_solicitud__in=solicitudes_ids)
-
-    # --- Métricas de Volumen ---
-    total_solicitudes = solicitudes_qs.count()
-    total_asignaturas_procesadas = detalles_qs.count()
-
-    # --- Gráfico 1: Solicitudes por Período ---
-
-    meses_labels_es = [
-        "Enero",
-        "Febrero",
-        "Marzo",
-        "Abril",
-        "Mayo",
-        "Junio",
-        "Julio",
-        "Agosto",
-        "Septiembre",
-        "Octubre",
-        "Noviembre",
-        "Diciembre",
-    ]
-
-    if is_historical_view:
-        # --- NUEVA LÓGICA PARA EL PROMEDIO HISTÓRICO ---
-        num_years = solicitudes_qs.dates("fecha_inicio", "year").count()
-        num_years = num_years if num_years > 0 else 1  # Evitar división por cero
-
-        # Solicitudes nuevas
-        nuevas_por_mes_total = (
-            solicitudes_qs.annotate(month=ExtractMonth("fecha_inicio"))
-            .values("month")
-            .annotate(total=Count("id"))
-            .order_by("month")
-        )
-        # Completadas
-        completadas_por_mes_total = (
-            solicitudes_qs.filter(
-                estado_general="Completada", fecha_completada__isnull=False
-            )
-            .annotate(month=ExtractMonth("fecha_completada"))
-            .values("month")
-            .annotate(total=Count("id"))
-            .order_by("month")
-        )
-
-        # Preparamos los datos promediados
-        solicitudes_data_promedio = [0] * 12
-        nuevas_data_promedio = [0] * 12
-        completadas_data_promedio = [0] * 12
-
-        for item in nuevas_por_mes_total:
-            solicitudes_data_promedio[item["month"] - 1] = item["total"] / num_years
-            nuevas_data_promedio[item["month"] - 1] = item["total"] / num_years
-
-        for item in completadas_por_mes_total:
-            completadas_data_promedio[item["month"] - 1] = item["total"] / num_years
-
-        meses_labels = meses_labels_es
-        solicitudes_data = solicitudes_data_promedio
-        balance_labels = meses_labels_es
-        nuevas_data = nuevas_data_promedio
-        completadas_data = completadas_data_promedio
-
-    else:
-        solicitudes_por_mes = (
-            solicitudes_qs.annotate(mes=TruncMonth("fecha_inicio"))
-            .values("mes")
-            .annotate(total=Count("id"))
-            .order_by("mes")
-        )
-        meses_labels = [
-            s["mes"].strftime("%B %Y").capitalize() for s in solicitudes_por_mes
-        ]
-        solicitudes_data = [s["total"] for s in solicitudes_por_mes]
-
-        # --- Gráfico 2: Balance Mensual ---
-        completadas_por_mes = (
-            solicitudes_qs.filter(
-                estado_general="Completada", fecha_completada__isnull=False
-            )
-            .annotate(mes=TruncMonth("fecha_completada"))
-            .values("mes")
-            .annotate(total=Count("id"))
-            .order_by("mes")
-        )
-        balance_dict = {
-            s["mes"]: {"nuevas": s["total"], "completadas": 0}
-            for s in solicitudes_por_mes
-        }
-        for item in completadas_por_mes:
-            if item["mes"] in balance_dict:
-                balance_dict[item["mes"]]["completadas"] = item["total"]
-        balance_labels = [
-            mes.strftime("%B %Y").capitalize() for mes in sorted(balance_dict.keys())
-        ]
-        nuevas_data = [
-            balance_dict[mes]["nuevas"] for mes in sorted(balance_dict.keys())
-        ]
-        completadas_data = [
-            balance_dict[mes]["completadas"] for mes in sorted(balance_dict.keys())
-        ]
-
-    # --- Métricas de Resultados ---
-    dictamenes_data = (
-        detalles_qs.annotate(estado_limpio=Trim("estado_asignatura"))
-        .exclude(estado_limpio__in=["Enviada a Cátedra", "Pendiente de envío"])
-        .values("estado_limpio")
-        .annotate(total=Count("id"))
-        .order_by("total")
-    )
-    dictamen_labels = [d["estado_limpio"] for d in dictamenes_data]
-    dictamen_valores = [d["total"] for d in dictamenes_data]
-
-    # <<< CORRECCIÓN: Usamos .annotate() para crear un alias 'nombre_materia' >>>
-    asignaturas_mas_solicitadas = (
-        detalles_qs.values("id_asignatura__asignatura__nombre")
-        .annotate(
-            nombre_materia=F("id_asignatura__asignatura__nombre"), total=Count("id")
-        )
-        .order_by("-total")
-        .values("nombre_materia", "total")[:10]
+def _cursor_dashboard(solicitud):
+    """Token firmado con la clave de orden de la última fila de una página."""
+    return signing.dumps(
+        [solicitud.completada, solicitud.fecha_inicio.isoformat(), solicitud.pk],
+        salt=SALT_CURSOR_DASHBOARD,
     )
 
-    asignaturas_problematicas = (
-        detalles_qs.filter(estado_asignatura__in=["Denegada", "Requiere PC"])
-        .values("id_asignatura__asignatura__nombre", "estado_asignatura")
-        .annotate(
-            nombre_materia=F("id_asignatura__asignatura__nombre"), total=Count("id")
-        )
-        .order_by("-total")
-        .values("nombre_materia", "estado_asignatura", "total")[:10]
-    )
 
-    # --- Métricas de Tiempos (CORREGIDAS) ---
-    avg_resolucion = solicitudes_qs.filter(
-        estado_general="Completada", fecha_completada__isnull=False
-    ).aggregate(avg_diff=Avg(F("fecha_completada") - F("fecha_inicio")))["avg_diff"]
-
-    avg_dictamen = detalles_qs.filter(fecha_dictamen__isnull=False).aggregate(
-        avg_diff=Avg(F("fecha_dictamen") - F("id_solicitud__fecha_inicio"))
-    )["avg_diff"]
-
-    top_demoras_query = (
-        detalles_qs.filter(fecha_dictamen__isnull=False)
-        .annotate(duracion=F("fecha_dictamen") - F("id_solicitud__fecha_inicio"))
-        .values("id_asignatura__asignatura__nombre")
-        .annotate(
-            nombre_materia=F("id_asignatura__asignatura__nombre"),
-            demora_promedio=Avg("duracion"),
-        )
-        .order_by("-demora_promedio")
-        .values("nombre_materia", "demora_promedio")[:5]
-    )
-    top_demoras = [
-        {"nombre": item["nombre_materia"], "dias": item["demora_promedio"].days}
-        for item in top_demoras_query
-    ]
-
-    # --- Devolvemos todo en un solo diccionario ---
-    return {
-        "total_solicitudes": total_solicitudes,
-        "total_asignaturas_procesadas": total_asignaturas_procesadas,
-        "meses_labels": meses_labels,
-        "solicitudes_data": solicitudes_data,
-        "balance_labels": balance_labels,
-        "nuevas_data": nuevas_data,
-        "completadas_data": completadas_data,
-        "dictamen_labels": dictamen_labels,
-        "dictamen_valores": dictamen_valores,
-        "asignaturas_mas_solicitadas": asignaturas_mas_solicitadas,
-        "asignaturas_problematicas": asignaturas_problematicas,
-        "avg_resolucion_dias": avg_resolucion.days if avg_resolucion else 0,
-        "avg_dictamen_dias": avg_dictamen.days if avg_dictamen else 0,
-        "top_demoras": top_demoras,
-    }
+def _leer_cursor_dashboard(token):
+    """Clave (completada, fecha_inicio, pk) del cursor, o None si es inválido."""
+    try:
+        completada, fecha_inicio, pk = signing.loads(token, salt=SALT_CURSOR_DASHBOARD)
+        return bool(completada), datetime.fromisoformat(fecha_inicio), int(pk)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
 
 
 @login_required
 def dashboard_view(request):
-    """Dashboard optimizado de equivalencias."""
+    """
+    Dashboard de equivalencias, paginado por clave (keyset).
+
+    Ordena por (completada, fecha_inicio, id), servido por el índice
+    sol_completada_fecha_idx: cada página cuesta lo mismo sin importar
+    cuántas solicitudes históricas haya.
+    """
     search_query = request.GET.get("q", "")
+    estado = request.GET.get("estado", "")
+    desde = parse_date(request.GET.get("desde", "") or "")
+    hasta = parse_date(request.GET.get("hasta", "") or "")
 
-    # ✅ OPTIMIZACIÓN: Usar manager personalizado
-    solicitudes = SolicitudEquivalencia.objects.with_related_data()
+    # El progreso sale de los contadores: solo hace falta el estudiante
+    solicitudes = SolicitudEquivalencia.objects.select_related("id_estudiante")
 
     if search_query:
         solicitudes = solicitudes.filter(
             id_estudiante__nombre_completo__icontains=search_query
         )
-
-    # ✅ OPTIMIZACIÓN: Ordenamiento optimizado
-    solicitudes = solicitudes.annotate(
-        estado_ordenado=Case(
-            When(estado_general="Completada", then=Value(1)),
-            default=Value(0)
-        )
-    ).order_by("estado_ordenado", "fecha_inicio")
+    if estado == "listas":
+        solicitudes = solicitudes.listas_para_acta()
+    elif estado in dict(SolicitudEquivalencia.ESTADO_CHOICES):
+        solicitudes = solicitudes.filter(estado_general=estado)
+    if desde:
+        solicitudes = solicitudes.filter(fecha_inicio__date__gte=desde)
+    if hasta:
+        solicitudes = solicitudes.filter(fecha_inicio__date__lte=hasta)
+
+    solicitudes = solicitudes.orden_dashboard()
+
+    cursor = _leer_cursor_dashboard(request.GET.get("despues", ""))
+    if cursor:
+        solicitudes = solicitudes.despues_de(*cursor)
+
+    # Una fila de más indica si hay página siguiente
+    por_pagina = settings.EQUIVALENCIAS_DASHBOARD_POR_PAGINA
+    pagina = list(solicitudes[: por_pagina + 1])
+    siguiente = None
+    if len(pagina) > por_pagina:
+        pagina = pagina[:por_pagina]
+        siguiente = _cursor_dashboard(pagina[-1])
+
+    filtros = request.GET.copy()
+    filtros.pop("despues", None)
 
     contexto = {
-        "solicitudes": solicitudes,
+        "solicitudes": pagina,
         "search_query": search_query,
+        "estado": estado,
+        "estado_choices": SolicitudEquivalencia.ESTADO_CHOICES,
+        "desde": desde,
+        "hasta": hasta,
+        "filtros": filtros.urlencode(),
+        "siguiente": siguiente,
+        "es_primera_pagina": cursor is None,
     }
     return render(request, "equivalencias/dashboard.html", contexto)
 
@@ -371,21 +138,16 @@ def solicitud_detalle_view(request, pk):
             # ✅ OPTIMIZACIÓN: Ya está precargado
             detalle_a_actualizar = solicitud.detallesolicitud_set.get(
                 pk=detalle_id)
-            detalle_a_actualizar.estado_asignatura = nuevo_estado
 
-            if nuevo_estado == "Requiere PC":
-                temas_pc = request.POST.get("detalle_pc", "")
-                detalle_a_actualizar.detalle_pc = temas_pc
-            else:
-                detalle_a_actualizar.detalle_pc = None
-
-            estados_finales = ["Aprobada", "Denegada", "Requiere PC"]
-            if nuevo_estado in estados_finales:
-                detalle_a_actualizar.fecha_dictamen = timezone.now()
-            else:
-                detalle_a_actualizar.fecha_dictamen = None
-
-            detalle_a_actualizar.save()
+            # El detalle y los contadores de la solicitud cambian juntos
+            try:
+                SolicitudService.registrar_dictamenes(
+                    solicitud,
+                    {detalle_a_actualizar.pk: (nuevo_estado, request.POST.get("detalle_pc", ""))},
+                )
+            except ValueError as e:
+                messages.error(request, f"No se guardó el dictamen: {e}")
+                return redirect("solicitud_detalle", pk=pk)
 
             nombre_materia = (
                 detalle_a_actualizar.id_asignatura.asignatura.nombre.title()
@@ -400,13 +162,9 @@ def solicitud_detalle_view(request, pk):
     detalles = solicitud.detallesolicitud_set.all()
     estado_choices = DetalleSolicitud.ESTADO_ASIGNATURA_CHOICES
 
-    # Lógica para determinar si la solicitud está completa
-    solicitud_completa = False
-    if detalles:
-        estados_finales = ["Aprobada", "Denegada", "Requiere PC"]
-        solicitud_completa = all(
-            d.estado_asignatura in estados_finales for d in detalles
-        )
+    # La solicitud está completa si todas las asignaturas tienen dictamen
+    # (según los contadores de la solicitud)
+    solicitud_completa = solicitud.lista_para_acta
 
     contexto = {
         "solicitud": solicitud,
@@ -417,6 +175,36 @@ def solicitud_detalle_view(request, pk):
     return render(request, "equivalencias/solicitud_detalle.html", contexto)
 
 
+@login_required
+def dictamenes_masivos_view(request, pk):
+    """
+    Registra los dictámenes de varias asignaturas de una solicitud en un
+    solo envío (campos estado_<pk> y detalle_pc_<pk> por detalle).
+    """
+    solicitud = get_object_or_404(SolicitudEquivalencia, pk=pk)
+    if request.method != "POST":
+        return redirect("solicitud_detalle", pk=pk)
+
+    dictamenes = {}
+    for detalle_pk in solicitud.detallesolicitud_set.values_list("pk", flat=True):
+        estado = request.POST.get(f"estado_{detalle_pk}")
+        if estado:
+            dictamenes[detalle_pk] = (estado, request.POST.get(f"detalle_pc_{detalle_pk}", ""))
+
+    try:
+        modificados = SolicitudService.registrar_dictamenes(solicitud, dictamenes)
+    except ValueError as e:
+        messages.error(request, f"No se guardaron los dictámenes: {e}")
+        return redirect("solicitud_detalle", pk=pk)
+
+    messages.success(request, f"Se actualizaron {len(modificados)} asignaturas.")
+    if solicitud.lista_para_acta:
+        messages.info(
+            request, "Todas las asignaturas tienen dictamen: ya se puede generar el acta."
+        )
+    return redirect("solicitud_detalle", pk=pk)
+
+
 @login_required
 def crear_solicitud_view(request):
     if request.method == "POST":
@@ -440,41 +228,27 @@ def crear_solicitud_view(request):
             )
             return redirect("crear_solicitud")
 
-        # --- CREACIÓN DE LA SOLICITUD Y DOCUMENTOS ---
-        asignatura_ids = request.POST.getlist("asignaturas")
-        documentos = request.FILES.getlist("documentacion")
-
-        nueva_solicitud = SolicitudEquivalencia.objects.create(id_estudiante=estudiante)
-        for doc in documentos:
-            DocumentoAdjunto.objects.create(solicitud=nueva_solicitud, archivo=doc)
-
-        # --- Bucle para procesar cada asignatura y enviar correo ---
-        for asig_id in asignatura_ids:
-            asig_para_equiv = get_object_or_404(AsignaturaParaEquivalencia, pk=asig_id)
-
-            # 1. Creamos el registro del detalle de la solicitud
-            detalle_solicitud = DetalleSolicitud.objects.create(
-                id_solicitud=nueva_solicitud, id_asignatura=asig_para_equiv
+        # --- CREACIÓN DE LA SOLICITUD, DOCUMENTOS Y DETALLES (una transacción) ---
+        try:
+            _, errores = SolicitudService.crear_solicitud(
+                estudiante,
+                request.POST.getlist("asignaturas"),
+                request.FILES.getlist("documentacion"),
             )
+        except AsignaturaParaEquivalencia.DoesNotExist as e:
+            raise Http404(str(e))
 
-            # 2. Enviamos el correo usando la función auxiliar
-            try:
-                # La función se encarga de todo: generar Word, adjuntar y enviar.
-                _enviar_email_catedra(detalle_solicitud)
-            except Exception as e:
-                # Si algo falla en el envío, informamos al usuario.
-                messages.error(
-                    request,
-                    f"No se pudo enviar el correo para {asig_para_equiv.asignatura.nombre}. Error: {e}",
-                )
+        # Los correos se encolaron al confirmarse la transacción
+        for error in errores:
+            messages.error(request, error)
 
         messages.success(
-            request, "Solicitud creada y notificaciones enviadas exitosamente."
+            request, "Solicitud creada; las notificaciones a las cátedras quedaron en cola de envío."
         )
         return redirect("dashboard")
 
     # --- Lógica para mostrar el formulario (GET) ---
-    estudiantes = Estudiante.objects.all()
+    # Los estudiantes se buscan con api_estudiantes (autocompletado)
     asignaturas = (
         AsignaturaParaEquivalencia.objects.all()
         .select_related("asignatura")
@@ -482,12 +256,59 @@ def crear_solicitud_view(request):
     )
 
     contexto = {
-        "estudiantes": estudiantes,
         "asignaturas": asignaturas,
     }
     return render(request, "equivalencias/crear_solicitud.html", contexto)
 
 
+def _consultar_estudiantes(prefijo, limite):
+    """
+    Estudiantes cuyo nombre o DNI/pasaporte empieza con el prefijo.
+
+    Cada columna se consulta por separado con un rango sobre su índice
+    (est_nombre_upper_idx y est_dni_idx) y se unen los dos resultados.
+    """
+    desde, hasta = AutocompletarService.rango_prefijo(prefijo)
+    base = Estudiante.objects.annotate(nombre_mayus=Upper("nombre_completo")).values(
+        "id", "nombre_completo", "dni_pasaporte", "nombre_mayus"
+    )
+    por_nombre = base.filter(nombre_mayus__gte=desde, nombre_mayus__lt=hasta).order_by(
+        "nombre_mayus"
+    )[:limite]
+    por_dni = base.filter(dni_pasaporte__gte=desde, dni_pasaporte__lt=hasta).order_by(
+        "dni_pasaporte"
+    )[:limite]
+
+    unidos = {e["id"]: e for e in [*por_nombre, *por_dni]}
+    estudiantes = sorted(unidos.values(), key=lambda e: (e["nombre_mayus"], e["id"]))[:limite]
+    for estudiante in estudiantes:
+        del estudiante["nombre_mayus"]
+        estudiante["texto"] = (
+            f"{estudiante['nombre_completo']} ({estudiante['dni_pasaporte'] or 'sin DNI'})"
+        )
+    return estudiantes
+
+
+@login_required
+def estudiantes_autocompletar_api_view(request):
+    """
+    API de autocompletado de estudiantes para el formulario de solicitud.
+
+    GET ?q=<prefijo>&limite=<n>: nombre o DNI/pasaporte por prefijo, con
+    los resultados cacheados unos segundos (ver AutocompletarService).
+    """
+    try:
+        limite = int(request.GET.get("limite", 10))
+    except ValueError:
+        limite = 10
+
+    estudiantes = AutocompletarService.buscar(
+        "estudiantes", request.GET.get("q", ""), _consultar_estudiantes, limite
+    )
+
+    return JsonResponse({"estudiantes": estudiantes})
+
+
 @login_required
 def generar_acta_pdf_view(request, pk):
     """
@@ -495,41 +316,19 @@ def generar_acta_pdf_view(request, pk):
     incluyendo una imagen de firma.
     """
     solicitud = get_object_or_404(SolicitudEquivalencia, pk=pk)
-    detalles = solicitud.detallesolicitud_set.all()
-
-    # 1. Construir la ruta absoluta al archivo de la firma
-    # (Asegúrate de que la imagen 'firma_holografica.png' exista en 'static/images/')
-    try:
-        image_path_os = os.path.join(
-            settings.STATICFILES_DIRS[0], "images", "firma_holografica.png"
-        )
-    except (IndexError, AttributeError):
-        # Manejo de error si STATICFILES_DIRS no está configurado
-        image_path_os = None  # O una ruta a una imagen por defecto
-
-    image_path = image_path_os.replace("\\", "/")
-
-    # 2. Preparar el contexto completo para la plantilla
-    context = {
-        "solicitud": solicitud,
-        "detalles": detalles,
-        # Añadimos la ruta de la imagen al contexto. El prefijo 'file://' es clave.
-        #'signature_image_path': f'file://{image_path}' if image_path and os.path.exists(image_path) else None,
-        "signature_image_path": "/static/images/firma_holografica.png",  # Ruta relativa para WeasyPrint
-    }
-    print(f"DEBUG: image_path = {context['signature_image_path']}"),
 
-    # 3. Renderizar la plantilla HTML a un string con el contexto actualizado
-    html_string = render_to_string("equivalencias/acta_template.html", context)
-    # Le decimos a WeasyPrint cuál es la dirección de nuestro sitio.
-    # request.build_absolute_uri('/') obtiene algo como 'http://127.0.0.1:8000'
+    # Le decimos a WeasyPrint cuál es la dirección de nuestro sitio para que
+    # encuentre la imagen de la firma (ej: 'http://127.0.0.1:8000/')
     base_url = request.build_absolute_uri("/")
 
-    # 4. Generar el PDF
-    # La librería WeasyPrint usará la ruta absoluta para encontrar y embeber la imagen
-    pdf_file = HTML(string=html_string, base_url=base_url).write_pdf()
+    # El servicio reutiliza el PDF cacheado si el acta no cambió
+    pdf_file = ActaService.generar_acta(solicitud, base_url)
 
-    # 5. Devolver el PDF como una respuesta para descargar
+    if not pdf_file:
+        messages.error(request, "No se pudo generar el acta.")
+        return redirect("solicitud_detalle", pk=pk)
+
+    # Devolver el PDF como una respuesta para descargar
     response = HttpResponse(pdf_file, content_type="application/pdf")
     response["Content-Disposition"] = (
         f'attachment; filename="acta_{solicitud.id_estudiante.dni_pasaporte}.pdf"'
@@ -546,15 +345,14 @@ def finalizar_solicitud_view(request, pk):
             solicitud.acta_firmada = acta_firmada_file
             solicitud.save()
 
-            # Enviar correo al Dpto. de Alumnos
-            email = EmailMessage(
-                subject=f"Resolución de Equivalencias - {solicitud.id_estudiante.nombre_completo}",
-                body="Se adjunta el acta final de equivalencias para su registro en el legajo del estudiante.",
-                from_email=None,
-                to=["alumnos@frlp.utn.edu.ar"],  # <-- CAMBIA ESTE EMAIL
+            # Encolar el correo al Dpto. de Alumnos
+            OutboxService.encolar(
+                asunto=f"Resolución de Equivalencias - {solicitud.id_estudiante.nombre_completo}",
+                cuerpo="Se adjunta el acta final de equivalencias para su registro en el legajo del estudiante.",
+                destinatarios=["alumnos@frlp.utn.edu.ar"],  # <-- CAMBIA ESTE EMAIL
+                rutas=[solicitud.acta_firmada.path],
+                objeto=solicitud,
             )
-            email.attach_file(solicitud.acta_firmada.path)
-            email.send()
 
             # Cambiar estado y archivar
             solicitud.estado_general = "Completada"
@@ -575,13 +373,13 @@ def reenviar_email_asignatura_view(request, pk, detalle_pk):
     detalle = get_object_or_404(DetalleSolicitud, pk=detalle_pk)
 
     try:
-        _enviar_email_catedra(detalle)
+        _encolar_email_catedra(detalle)
         messages.success(
             request,
-            f"Correo reenviado exitosamente a {detalle.id_asignatura.email_responsable}.",
+            f"Correo a {detalle.id_asignatura.email_responsable} encolado para reenvío.",
         )
     except Exception as e:
-        messages.error(request, f"Error al reenviar el correo: {e}")
+        messages.error(request, f"Error al encolar el correo: {e}")
 
     return redirect("solicitud_detalle", pk=pk)
 
@@ -593,6 +391,10 @@ def reenviar_pendientes_view(request, pk):
     # Filtramos solo las asignaturas que aún no tienen respuesta
     pendientes = solicitud.detallesolicitud_set.filter(
         estado_asignatura="Enviada a Cátedra"
+    ).select_related(
+        "id_solicitud__id_estudiante",
+        "id_asignatura__asignatura",
+        "id_asignatura__docente_responsable",
     )
 
     if not pendientes:
@@ -602,55 +404,50 @@ def reenviar_pendientes_view(request, pk):
         return redirect("solicitud_detalle", pk=pk)
 
     contador = 0
-    for detalle in pendientes:
+    asignaturas = 0
+    for grupo in SolicitudService.agrupar_por_responsable(
+        PlanillaEvaluacionService.generar_planillas(pendientes)
+    ):
         try:
-            _enviar_email_catedra(detalle)
+            SolicitudService.encolar_email_responsable(grupo)
             contador += 1
+            asignaturas += len(grupo)
         except Exception as e:
             messages.error(
                 request,
-                f"Falló el envío a {detalle.id_asignatura.docente_responsable}: {e}",
+                f"No se pudo encolar el correo a {grupo[0][0].id_asignatura.docente_responsable}: {e}",
             )
             continue  # Continúa con el siguiente aunque uno falle
 
     messages.success(
-        request, f"Se reenviaron {contador} correos a las cátedras pendientes."
+        request,
+        f"Se encolaron {contador} correos a las cátedras pendientes "
+        f"({asignaturas} asignaturas).",
     )
     return redirect("solicitud_detalle", pk=pk)
 
 
 @login_required
 def estadisticas_view(request):
-    """Vista de estadísticas optimizada."""
-    selected_year = request.GET.get("year")
+    """
+    Vista de estadísticas.
 
-    # ✅ OPTIMIZACIÓN: Solo traer años, no objetos completos
-    available_years = SolicitudEquivalencia.objects.dates(
-        "fecha_inicio", "year", order="DESC"
-    ).values_list('fecha_inicio__year', flat=True).distinct()
-
-    # ✅ OPTIMIZACIÓN: Usar select_related en el queryset base
-    solicitudes_base = SolicitudEquivalencia.objects.select_related(
-        'id_estudiante'
-    ).prefetch_related(
-        'detallesolicitud_set',
-        'detallesolicitud_set__id_asignatura',
-        'detallesolicitud_set__id_asignatura__asignatura',
-    )
+    Lee los resúmenes mensuales de EstadisticasService (a lo sumo unos
+    cientos de filas) en lugar de agregar todas las solicitudes y detalles,
+    y cachea el resultado por año hasta que cambien sus resúmenes.
+    """
+    selected_year = request.GET.get("year")
+    available_years = EstadisticasService.anios_disponibles()
 
     titulo_periodo = "Promedio Histórico (todos los años)"
-    is_historical = True
+    anio = None
 
     if selected_year and selected_year.isdigit():
         if int(selected_year) in available_years:
-            solicitudes_base = solicitudes_base.filter(
-                fecha_inicio__year=int(selected_year)
-            )
+            anio = int(selected_year)
             titulo_periodo = f"Año {selected_year}"
-            is_historical = False
 
-    stats = _calculate_statistics(
-        solicitudes_base, is_historical_view=is_historical)
+    stats = EstadisticasService.calcular_cacheado(anio)
 
     contexto = {
         "stats": stats,
@@ -0,0 +1,51 @@
+# notificaciones/admin.py
+
+from django.contrib import admin, messages
+
+from .models import AdjuntoCorreo, CorreoSaliente, NotificacionEnviada
+from .services.outbox_service import OutboxService
+
+
+class AdjuntoCorreoInline(admin.TabularInline):
+    model = AdjuntoCorreo
+    extra = 0
+    readonly_fields = ('nombre', 'tipo_mime', 'archivo', 'ruta')
+    can_delete = False
+
+
+@admin.register(CorreoSaliente)
+class CorreoSalienteAdmin(admin.ModelAdmin):
+    list_display = (
+        'asunto', 'get_destinatarios', 'estado', 'intentos',
+        'proximo_intento', 'fecha_creacion', 'fecha_envio',
+    )
+    list_filter = ('estado', 'fecha_creacion')
+    search_fields = ('asunto', 'destinatarios')
+    readonly_fields = (
+        'intentos', 'proximo_intento', 'bloqueado_hasta', 'ultimo_error',
+        'fecha_creacion', 'fecha_envio',
+    )
+    inlines = [AdjuntoCorreoInline]
+    actions = ['reintentar_envio']
+
+    @admin.display(description='Destinatarios')
+    def get_destinatarios(self, obj):
+        return ", ".join(obj.destinatarios)
+
+    @admin.action(description='Reintentar envío de los correos fallidos')
+    def reintentar_envio(self, request, queryset):
+        cantidad = OutboxService.reintentar(queryset)
+        self.message_user(
+            request, f"{cantidad} correos vueltos a poner en cola.", messages.SUCCESS)
+
+
+@admin.register(NotificacionEnviada)
+class NotificacionEnviadaAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'destinatario', 'asunto', 'estado', 'duracion_ms', 'objeto')
+    list_filter = ('estado', 'content_type', 'fecha')
+    search_fields = ('destinatario', 'asunto', 'error')
+    readonly_fields = [f.name for f in NotificacionEnviada._meta.fields]
+    list_select_related = ('content_type',)
+
+    def has_add_permission(self, request):
+        return False
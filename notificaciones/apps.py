@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class NotificacionesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "notificaciones"
+    verbose_name = "Notificaciones"
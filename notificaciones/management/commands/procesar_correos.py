@@ -0,0 +1,47 @@
+# notificaciones/management/commands/procesar_correos.py
+"""
+Worker de la bandeja de salida: envía los correos encolados.
+
+Uso:
+    python manage.py procesar_correos                  # una pasada (ej: desde cron)
+    python manage.py procesar_correos --loop --intervalo 15
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from notificaciones.services.outbox_service import OutboxService
+
+
+class Command(BaseCommand):
+    help = 'Envía los correos pendientes de la bandeja de salida, con reintentos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limite', type=int, default=100,
+            help='Máxima cantidad de correos por pasada')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Seguir procesando indefinidamente')
+        parser.add_argument(
+            '--intervalo', type=int, default=30,
+            help='Segundos de espera entre pasadas con --loop')
+
+    def handle(self, *args, **options):
+        """Procesa la cola una vez o en bucle."""
+        while True:
+            resultado = OutboxService.procesar_pendientes(limite=options['limite'])
+
+            if any(resultado.values()) or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"✅ {resultado['enviados']} enviados, "
+                    f"{resultado['reintentos']} para reintentar, "
+                    f"{resultado['fallidos']} fallidos"
+                ))
+
+            if not options['loop']:
+                break
+
+            # Si se llenó el lote puede haber más: no esperar
+            if sum(resultado.values()) < options['limite']:
+                time.sleep(options['intervalo'])
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:41
+
+import django.db.models.deletion
+import django.utils.timezone
+import notificaciones.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorreoSaliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asunto', models.CharField(max_length=255)),
+                ('cuerpo', models.TextField()),
+                ('es_html', models.BooleanField(default=False)),
+                ('remitente', models.CharField(blank=True, help_text='Vacío: se usa DEFAULT_FROM_EMAIL', max_length=255)),
+                ('destinatarios', models.JSONField(default=list)),
+                ('estado', models.CharField(choices=[('PEN', 'Pendiente'), ('PRO', 'Procesando'), ('ENV', 'Enviado'), ('REI', 'Reintentando'), ('FAL', 'Fallido')], default='PEN', max_length=3)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('max_intentos', models.PositiveSmallIntegerField(default=5)),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now)),
+                ('bloqueado_hasta', models.DateTimeField(blank=True, help_text='Mientras un worker lo procesa, otro no lo toma', null=True)),
+                ('ultimo_error', models.TextField(blank=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_envio', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Correo Saliente',
+                'verbose_name_plural': 'Correos Salientes',
+                'ordering': ['proximo_intento', 'id'],
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='correo_estado_prox_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AdjuntoCorreo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255)),
+                ('tipo_mime', models.CharField(default='application/octet-stream', max_length=100)),
+                ('archivo', models.FileField(blank=True, upload_to=notificaciones.models.get_adjunto_upload_path)),
+                ('ruta', models.CharField(blank=True, help_text='Ruta absoluta de un archivo existente (no se copia)', max_length=500)),
+                ('correo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjuntos', to='notificaciones.correosaliente')),
+            ],
+            options={
+                'verbose_name': 'Adjunto de Correo',
+                'verbose_name_plural': 'Adjuntos de Correos',
+            },
+        ),
+    ]
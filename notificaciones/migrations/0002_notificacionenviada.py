@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notificaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificacionEnviada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinatario', models.CharField(max_length=255)),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('asunto', models.CharField(max_length=255)),
+                ('estado', models.CharField(choices=[('OK', 'Enviado'), ('ERR', 'Error')], max_length=3)),
+                ('duracion_ms', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('fecha', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Notificación Enviada',
+                'verbose_name_plural': 'Notificaciones Enviadas',
+                'ordering': ['-fecha'],
+            },
+        ),
+        migrations.AddField(
+            model_name='correosaliente',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='correosaliente',
+            name='object_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='correosaliente',
+            index=models.Index(fields=['content_type', 'object_id'], name='correo_objeto_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificacionenviada',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='notificacionenviada',
+            name='correo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='intentos_envio', to='notificaciones.correosaliente'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacionenviada',
+            index=models.Index(fields=['content_type', 'object_id', 'estado'], name='notif_objeto_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificacionenviada',
+            index=models.Index(fields=['destinatario'], name='notif_destinatario_idx'),
+        ),
+    ]
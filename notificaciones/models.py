@@ -0,0 +1,161 @@
+# notificaciones/models.py
+"""
+Bandeja de salida (outbox) de correos.
+
+Las vistas solo insertan el correo; el envío real lo hace el comando
+`procesar_correos`, con reintentos y backoff exponencial.
+"""
+import os
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+
+class CorreoSaliente(models.Model):
+    ESTADO_CHOICES = [
+        ("PEN", "Pendiente"),
+        ("PRO", "Procesando"),
+        ("ENV", "Enviado"),
+        ("REI", "Reintentando"),
+        ("FAL", "Fallido"),
+    ]
+
+    asunto = models.CharField(max_length=255)
+    cuerpo = models.TextField()
+    es_html = models.BooleanField(default=False)
+    remitente = models.CharField(
+        max_length=255, blank=True,
+        help_text="Vacío: se usa DEFAULT_FROM_EMAIL",
+    )
+    destinatarios = models.JSONField(default=list)
+
+    estado = models.CharField(max_length=3, choices=ESTADO_CHOICES, default="PEN")
+    intentos = models.PositiveSmallIntegerField(default=0)
+    max_intentos = models.PositiveSmallIntegerField(default=5)
+    proximo_intento = models.DateTimeField(default=timezone.now)
+    bloqueado_hasta = models.DateTimeField(
+        null=True, blank=True,
+        help_text="Mientras un worker lo procesa, otro no lo toma",
+    )
+    ultimo_error = models.TextField(blank=True)
+
+    # Objeto que origina el correo (Evaluacion, DetalleSolicitud, ...)
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    objeto = GenericForeignKey("content_type", "object_id")
+
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_envio = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["proximo_intento", "id"]
+        verbose_name = "Correo Saliente"
+        verbose_name_plural = "Correos Salientes"
+        indexes = [
+            # Índice para que el worker busque los correos listos para enviar
+            models.Index(fields=['estado', 'proximo_intento'], name='correo_estado_prox_idx'),
+            # Índice para buscar los correos de un objeto
+            models.Index(fields=['content_type', 'object_id'], name='correo_objeto_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.asunto} → {', '.join(self.destinatarios)} ({self.get_estado_display()})"
+
+
+def get_adjunto_upload_path(instance, filename):
+    return os.path.join("notificaciones", "adjuntos", timezone.now().strftime("%Y/%m"), filename)
+
+
+class AdjuntoCorreo(models.Model):
+    """
+    Adjunto de un correo saliente.
+
+    Si el archivo ya existe en MEDIA (formularios, documentación de
+    equivalencias, actas) se guarda solo su ruta; el contenido generado en
+    memoria (ej: planillas Word) se guarda como archivo propio.
+    """
+
+    correo = models.ForeignKey(
+        CorreoSaliente, on_delete=models.CASCADE, related_name="adjuntos"
+    )
+    nombre = models.CharField(max_length=255)
+    tipo_mime = models.CharField(max_length=100, default="application/octet-stream")
+    archivo = models.FileField(upload_to=get_adjunto_upload_path, blank=True)
+    ruta = models.CharField(
+        max_length=500, blank=True,
+        help_text="Ruta absoluta de un archivo existente (no se copia)",
+    )
+
+    class Meta:
+        verbose_name = "Adjunto de Correo"
+        verbose_name_plural = "Adjuntos de Correos"
+
+    def __str__(self):
+        return self.nombre
+
+    def leer(self) -> bytes:
+        """Contenido del adjunto."""
+        with self.abrir() as f:
+            return f.read()
+
+    def abrir(self):
+        """Abre el adjunto en modo binario (para leerlo por bloques)."""
+        if self.archivo:
+            return self.archivo.open("rb")
+        return open(self.ruta, "rb")
+
+    def tamanio(self) -> int:
+        """Tamaño en bytes según el sistema de archivos (sin leerlo)."""
+        if self.archivo:
+            return self.archivo.size
+        return os.path.getsize(self.ruta)
+
+
+class NotificacionEnviada(models.Model):
+    """
+    Registro de auditoría de cada intento de envío, por destinatario.
+
+    Permite ver latencia y fallos por destinatario y saber a quién ya se
+    le entregó la notificación de un objeto.
+    """
+
+    ESTADO_CHOICES = [
+        ("OK", "Enviado"),
+        ("ERR", "Error"),
+    ]
+
+    correo = models.ForeignKey(
+        CorreoSaliente, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="intentos_envio",
+    )
+    destinatario = models.CharField(max_length=255)
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    objeto = GenericForeignKey("content_type", "object_id")
+    asunto = models.CharField(max_length=255)
+    estado = models.CharField(max_length=3, choices=ESTADO_CHOICES)
+    duracion_ms = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    fecha = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-fecha"]
+        verbose_name = "Notificación Enviada"
+        verbose_name_plural = "Notificaciones Enviadas"
+        indexes = [
+            # Índice para saber quién ya recibió la notificación de un objeto
+            models.Index(
+                fields=['content_type', 'object_id', 'estado'],
+                name='notif_objeto_estado_idx',
+            ),
+            models.Index(fields=['destinatario'], name='notif_destinatario_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.destinatario} - {self.asunto} ({self.get_estado_display()})"
@@ -0,0 +1,64 @@
+# notificaciones/services/attachment_cache.py
+"""
+Caché de adjuntos codificados para un lote de envío.
+
+Al notificar a una junta, cada miembro recibe los mismos formularios, y
+cada cátedra de una solicitud recibe la misma documentación del
+estudiante. La caché lee y codifica en base64 cada archivo una sola vez
+por lote y comparte la parte MIME resultante entre todos los mensajes.
+"""
+import logging
+from email import encoders
+from email.mime.base import MIMEBase
+
+logger = logging.getLogger(__name__)
+
+
+class CacheAdjuntos:
+    """Partes MIME de adjuntos, compartidas dentro de un lote."""
+
+    def __init__(self):
+        self._partes = {}
+        self.lecturas = 0
+        self.aciertos = 0
+
+    def parte(self, adjunto) -> MIMEBase:
+        """
+        Devuelve la parte MIME del adjunto, codificándola solo la primera vez.
+
+        Args:
+            adjunto: AdjuntoCorreo
+
+        Returns:
+            MIMEBase: Parte lista para EmailMessage.attach()
+        """
+        clave = (
+            adjunto.ruta or f"archivo:{adjunto.archivo.name}",
+            adjunto.nombre,
+            adjunto.tipo_mime,
+        )
+
+        parte = self._partes.get(clave)
+        if parte is not None:
+            self.aciertos += 1
+            return parte
+
+        parte = CacheAdjuntos._crear_parte(adjunto.nombre, adjunto.leer(), adjunto.tipo_mime)
+        self._partes[clave] = parte
+        self.lecturas += 1
+        return parte
+
+    @staticmethod
+    def _crear_parte(nombre: str, contenido: bytes, tipo_mime: str) -> MIMEBase:
+        """Arma la parte MIME codificada en base64 con su nombre de archivo."""
+        tipo, subtipo = tipo_mime.split("/", 1)
+        parte = MIMEBase(tipo, subtipo)
+        parte.set_payload(contenido)
+        encoders.encode_base64(parte)
+
+        try:
+            nombre.encode("ascii")
+        except UnicodeEncodeError:
+            nombre = ("utf-8", "", nombre)
+        parte.add_header("Content-Disposition", "attachment", filename=nombre)
+        return parte
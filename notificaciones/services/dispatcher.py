@@ -0,0 +1,171 @@
+# notificaciones/services/dispatcher.py
+"""
+Despacho de lotes de correos por una conexión SMTP reutilizada.
+
+Abrir una conexión TLS con smtp.office365.com por cada mensaje es lo más
+lento del envío. El despachador abre una conexión, envía por ella hasta
+`OUTBOX_MENSAJES_POR_CONEXION` mensajes con `send_messages` y respeta el
+cupo `OUTBOX_MAX_POR_MINUTO` del proveedor. El resultado se informa por
+mensaje (y por destinatario cuando el servidor los rechaza), de modo que
+un fallo no aborta el resto del lote. Los mensajes con adjuntos pesados
+(MensajeEnDisco) se transmiten por bloques por la misma conexión.
+"""
+import logging
+import smtplib
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.message import sanitize_address
+
+from notificaciones.services.streaming import MensajeEnDisco
+
+logger = logging.getLogger(__name__)
+
+
+class DespachadorCorreos:
+    """Envío de lotes de EmailMessage con conexión compartida y límite de tasa."""
+
+    @staticmethod
+    def enviar(
+        mensajes: List[Union[EmailMessage, MensajeEnDisco]],
+        connection=None,
+        max_por_minuto: Optional[float] = None,
+        al_terminar: Optional[Callable[[int, Optional[str], int, dict], None]] = None,
+    ) -> List[Tuple[Optional[str], int, dict]]:
+        """
+        Envía los mensajes reutilizando la conexión.
+
+        Args:
+            mensajes: Mensajes a enviar (un None se informa como error)
+            connection: Backend de correo a usar (por defecto, get_connection())
+            max_por_minuto: Cupo para este despacho (por defecto, OUTBOX_MAX_POR_MINUTO)
+            al_terminar: Se llama con (índice, error, duración en ms, rechazados)
+                apenas termina cada mensaje, para no esperar al final del lote
+
+        Returns:
+            list: Un elemento por mensaje: (None si se envió o el error,
+                duración del envío en milisegundos, destinatarios que el
+                servidor rechazó aunque el mensaje salió para el resto, con el
+                formato de smtplib.SMTP.sendmail)
+        """
+        resultados = []
+
+        def anotar(error, duracion_ms, rechazados=None):
+            rechazados = rechazados or {}
+            if al_terminar:
+                al_terminar(len(resultados), error, duracion_ms, rechazados)
+            resultados.append((error, duracion_ms, rechazados))
+
+        intervalo = DespachadorCorreos._intervalo(max_por_minuto)
+        por_conexion = settings.OUTBOX_MENSAJES_POR_CONEXION
+        conexion = None
+        enviados_en_conexion = 0
+        ultimo_envio = None
+
+        try:
+            for mensaje in mensajes:
+                if mensaje is None:
+                    anotar("No se pudo armar el mensaje", 0)
+                    continue
+
+                inicio = time.monotonic()
+                try:
+                    if conexion is None or (por_conexion and enviados_en_conexion >= por_conexion):
+                        DespachadorCorreos._cerrar(conexion)
+                        conexion = connection or get_connection()
+                        conexion.open()
+                        enviados_en_conexion = 0
+
+                    if intervalo and ultimo_envio is not None:
+                        espera = intervalo - (time.monotonic() - ultimo_envio)
+                        if espera > 0:
+                            time.sleep(espera)
+                            inicio = time.monotonic()
+
+                    ultimo_envio = time.monotonic()
+                    if isinstance(mensaje, MensajeEnDisco):
+                        rechazados = mensaje.enviar_por(conexion)
+                    else:
+                        rechazados = DespachadorCorreos._enviar_email(conexion, mensaje)
+                except Exception as e:
+                    anotar(
+                        DespachadorCorreos._describir_error(e),
+                        DespachadorCorreos._milisegundos(inicio),
+                    )
+                    # La conexión puede haber quedado inutilizable: se abre otra
+                    DespachadorCorreos._cerrar(conexion)
+                    conexion = None
+                else:
+                    anotar(None, DespachadorCorreos._milisegundos(inicio), rechazados)
+                    enviados_en_conexion += 1
+        finally:
+            DespachadorCorreos._cerrar(conexion)
+
+        return resultados
+
+    @staticmethod
+    def _enviar_email(conexion, mensaje: EmailMessage) -> Dict[str, tuple]:
+        """
+        Envía un EmailMessage y devuelve los destinatarios rechazados.
+
+        El backend SMTP de Django descarta lo que devuelve sendmail(), así que
+        con una sesión SMTP abierta se llama directamente; otros backends
+        (consola, memoria en los tests) usan send_messages.
+        """
+        smtp = getattr(conexion, "connection", None)
+        if not isinstance(smtp, smtplib.SMTP):
+            conexion.send_messages([mensaje])
+            return {}
+
+        destinatarios = mensaje.recipients()
+        if not destinatarios:
+            return {}
+        codificacion = mensaje.encoding or settings.DEFAULT_CHARSET
+        rechazados = smtp.sendmail(
+            sanitize_address(mensaje.from_email, codificacion),
+            [sanitize_address(d, codificacion) for d in destinatarios],
+            mensaje.message().as_bytes(linesep="\r\n"),
+        )
+        if rechazados:
+            logger.warning(f"Destinatarios rechazados: {', '.join(rechazados)}")
+        return rechazados
+
+    @staticmethod
+    def _milisegundos(inicio: float) -> int:
+        return int((time.monotonic() - inicio) * 1000)
+
+    @staticmethod
+    def _intervalo(max_por_minuto: Optional[float] = None) -> float:
+        """Segundos mínimos entre mensajes según el cupo por minuto (0: sin límite)."""
+        maximo = settings.OUTBOX_MAX_POR_MINUTO if max_por_minuto is None else max_por_minuto
+        return 60 / maximo if maximo else 0
+
+    @staticmethod
+    def _describir_error(error: Exception) -> str:
+        """Texto del error; si el servidor rechazó destinatarios, detalla cada uno."""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            rechazados = [
+                f"{destinatario} ({DespachadorCorreos.describir_rechazo(respuesta)})"
+                for destinatario, respuesta in error.recipients.items()
+            ]
+            return f"Destinatarios rechazados: {', '.join(rechazados)}"
+        return str(error) or error.__class__.__name__
+
+    @staticmethod
+    def describir_rechazo(respuesta: tuple) -> str:
+        """Texto de la respuesta (código, mensaje) con que se rechazó un destinatario."""
+        codigo, mensaje = respuesta
+        if isinstance(mensaje, bytes):
+            mensaje = mensaje.decode(errors="replace")
+        return f"{codigo} {mensaje}"
+
+    @staticmethod
+    def _cerrar(conexion):
+        if conexion is None:
+            return
+        try:
+            conexion.close()
+        except Exception as e:
+            logger.warning(f"Error cerrando conexión SMTP: {e}")
@@ -0,0 +1,417 @@
+# notificaciones/services/outbox_service.py
+"""
+Servicio de la bandeja de salida de correos.
+
+Las vistas y servicios llaman a `OutboxService.encolar()`, que solo inserta
+el correo y sus adjuntos. El comando `procesar_correos` toma los correos
+pendientes y los envía en lote, repartidos entre `OUTBOX_HILOS` hilos con
+una conexión SMTP cada uno (DespachadorCorreos); si el envío falla se
+reintenta con backoff exponencial hasta `OUTBOX_MAX_INTENTOS`. Cada intento
+queda registrado por destinatario en NotificacionEnviada.
+"""
+import logging
+import mimetypes
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Iterable, List, Optional, Union
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from notificaciones.models import AdjuntoCorreo, CorreoSaliente, NotificacionEnviada
+from notificaciones.services.attachment_cache import CacheAdjuntos
+from notificaciones.services.dispatcher import DespachadorCorreos
+from notificaciones.services.streaming import MensajeEnDisco
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """Encolado y entrega de correos salientes."""
+
+    @staticmethod
+    def encolar(
+        asunto: str,
+        cuerpo: str,
+        destinatarios: List[str],
+        es_html: bool = False,
+        rutas: Iterable[str] = (),
+        adjuntos: Iterable[tuple] = (),
+        remitente: str = "",
+        objeto=None,
+    ) -> CorreoSaliente:
+        """
+        Inserta un correo en la bandeja de salida.
+
+        Args:
+            asunto: Asunto del correo
+            cuerpo: Cuerpo (texto plano o HTML según `es_html`)
+            destinatarios: Lista de direcciones
+            es_html: Si el cuerpo es HTML
+            rutas: Archivos existentes a adjuntar (no se copian)
+            adjuntos: Contenido generado en memoria, como tuplas
+                (nombre, contenido, tipo_mime)
+            remitente: Dirección del remitente (vacío: DEFAULT_FROM_EMAIL)
+            objeto: Instancia que origina el correo (para auditoría y reenvíos)
+
+        Returns:
+            CorreoSaliente: El correo encolado
+        """
+        with transaction.atomic():
+            correo = CorreoSaliente.objects.create(
+                asunto=asunto,
+                cuerpo=cuerpo,
+                es_html=es_html,
+                remitente=remitente,
+                destinatarios=list(destinatarios),
+                max_intentos=settings.OUTBOX_MAX_INTENTOS,
+                objeto=objeto,
+            )
+
+            for ruta in rutas:
+                AdjuntoCorreo.objects.create(
+                    correo=correo,
+                    nombre=os.path.basename(ruta),
+                    tipo_mime=OutboxService._tipo_mime(ruta),
+                    ruta=ruta,
+                )
+
+            for nombre, contenido, tipo_mime in adjuntos:
+                adjunto = AdjuntoCorreo(
+                    correo=correo,
+                    nombre=nombre,
+                    tipo_mime=tipo_mime or OutboxService._tipo_mime(nombre),
+                )
+                adjunto.archivo.save(nombre, ContentFile(contenido), save=False)
+                adjunto.save()
+
+        logger.info(f"Correo {correo.pk} encolado para {', '.join(correo.destinatarios)}")
+        return correo
+
+    @staticmethod
+    def procesar_pendientes(limite: Optional[int] = None) -> dict:
+        """
+        Envía los correos pendientes cuyo próximo intento ya venció.
+
+        Los correos se reclaman en lotes que alcanzan a enviarse, con el
+        cupo por minuto, antes de que venza su bloqueo (ver tamanio_lote),
+        y el resultado de cada uno se guarda apenas termina su envío.
+
+        Args:
+            limite: Máxima cantidad de correos a procesar
+
+        Returns:
+            dict: {'enviados': int, 'reintentos': int, 'fallidos': int}
+        """
+        resultado = {"enviados": 0, "reintentos": 0, "fallidos": 0}
+        restantes = limite
+
+        while restantes is None or restantes > 0:
+            lote = OutboxService.tamanio_lote(restantes)
+            correos = OutboxService.reclamar(lote)
+            if not correos:
+                break
+
+            OutboxService._procesar_lote(correos, resultado)
+
+            if restantes is not None:
+                restantes -= len(correos)
+            if lote is None or len(correos) < lote:
+                break
+
+        return resultado
+
+    @staticmethod
+    def tamanio_lote(limite: Optional[int] = None) -> Optional[int]:
+        """
+        Cantidad de correos a reclamar de una vez.
+
+        Con cupo por minuto, un lote no puede tardar más que el bloqueo de
+        sus correos: si venciera a mitad del envío, otro worker los
+        retomaría y los enviaría dos veces. Se usa la mitad de lo que el
+        cupo permite enviar en OUTBOX_BLOQUEO_SEGUNDOS, como margen para
+        conexiones y adjuntos lentos.
+
+        Returns:
+            int o None: Tamaño del lote (None: sin límite)
+        """
+        if not settings.OUTBOX_MAX_POR_MINUTO:
+            return limite
+        maximo = max(1, int(
+            settings.OUTBOX_MAX_POR_MINUTO * settings.OUTBOX_BLOQUEO_SEGUNDOS / 60 / 2))
+        return min(limite, maximo) if limite else maximo
+
+    @staticmethod
+    def _procesar_lote(correos: List[CorreoSaliente], resultado: dict):
+        """Envía un lote reclamado y acumula sus resultados en `resultado`."""
+        # Los adjuntos repetidos en el lote se leen y codifican una sola vez
+        adjuntos = CacheAdjuntos()
+        mensajes = []
+        errores_armado = {}
+        for correo in correos:
+            try:
+                mensajes.append(OutboxService._construir_mensaje(correo, adjuntos))
+            except Exception as e:
+                # Ej: un adjunto que ya no existe en disco
+                errores_armado[correo.pk] = str(e)
+                mensajes.append(None)
+
+        if adjuntos.aciertos:
+            logger.info(
+                f"Adjuntos del lote: {adjuntos.lecturas} codificados, "
+                f"{adjuntos.aciertos} reutilizados")
+
+        pendientes = {correo.pk for correo in correos}
+
+        def registrar(indice, error, duracion_ms, rechazados):
+            correo = correos[indice]
+            error = errores_armado.get(correo.pk, error)
+            OutboxService._auditar(correo, error, duracion_ms, rechazados)
+            estado = OutboxService.registrar_resultado(correo, error)
+            if estado == "ENV":
+                resultado["enviados"] += 1
+            elif estado == "REI":
+                resultado["reintentos"] += 1
+            else:
+                resultado["fallidos"] += 1
+
+            pendientes.discard(correo.pk)
+            OutboxService._renovar_bloqueo(pendientes)
+
+        OutboxService._despachar_en_paralelo(mensajes, registrar)
+
+    @staticmethod
+    def _renovar_bloqueo(pks):
+        """Extiende el bloqueo de los correos del lote que aún no se enviaron."""
+        if pks:
+            CorreoSaliente.objects.filter(pk__in=pks, estado="PRO").update(
+                bloqueado_hasta=timezone.now()
+                + timedelta(seconds=settings.OUTBOX_BLOQUEO_SEGUNDOS))
+
+    @staticmethod
+    def _despachar_en_paralelo(mensajes: List[Optional[EmailMessage]], al_terminar):
+        """
+        Reparte el lote entre OUTBOX_HILOS hilos, cada uno con su conexión.
+
+        El cupo por minuto se divide entre los hilos para respetar el total.
+        Los hilos solo hablan con el servidor SMTP: cada resultado pasa por
+        una cola y `al_terminar(índice, error, duración en ms, rechazados)` lo guarda
+        desde el hilo principal apenas llega.
+        """
+        hilos = max(1, min(settings.OUTBOX_HILOS, len(mensajes)))
+        if hilos == 1:
+            DespachadorCorreos.enviar(mensajes, al_terminar=al_terminar)
+            return
+
+        cupo = settings.OUTBOX_MAX_POR_MINUTO / hilos
+        porciones = [list(range(i, len(mensajes), hilos)) for i in range(hilos)]
+        cola = queue.Queue()
+
+        def despachar(indices):
+            informados = set()
+
+            def avisar(i, error, duracion_ms, rechazados):
+                informados.add(i)
+                cola.put((indices[i], error, duracion_ms, rechazados))
+
+            try:
+                DespachadorCorreos.enviar(
+                    [mensajes[i] for i in indices],
+                    max_por_minuto=cupo,
+                    al_terminar=avisar,
+                )
+            except Exception as e:
+                for i in range(len(indices)):
+                    if i not in informados:
+                        cola.put((indices[i], str(e), 0, {}))
+
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            for indices in porciones:
+                pool.submit(despachar, indices)
+            for _ in mensajes:
+                al_terminar(*cola.get())
+
+    @staticmethod
+    def _auditar(
+        correo: CorreoSaliente,
+        error: Optional[str],
+        duracion_ms: int,
+        rechazados: Optional[dict] = None,
+    ):
+        """
+        Registra el intento de envío para cada destinatario del correo.
+
+        Los destinatarios que el servidor rechazó aunque el mensaje salió
+        para el resto quedan con error, para que `destinatarios_notificados`
+        no los cuente como notificados.
+        """
+        rechazos = {
+            destinatario.lower():
+                f"Destinatario rechazado: {DespachadorCorreos.describir_rechazo(respuesta)}"
+            for destinatario, respuesta in (rechazados or {}).items()
+        }
+        intentos = []
+        for destinatario in correo.destinatarios:
+            error_destinatario = error or rechazos.get(destinatario.lower())
+            intentos.append(NotificacionEnviada(
+                correo=correo,
+                destinatario=destinatario,
+                content_type_id=correo.content_type_id,
+                object_id=correo.object_id,
+                asunto=correo.asunto[:255],
+                estado="ERR" if error_destinatario else "OK",
+                duracion_ms=duracion_ms,
+                error=error_destinatario or "",
+            ))
+        NotificacionEnviada.objects.bulk_create(intentos)
+
+    @staticmethod
+    def destinatarios_notificados(objeto) -> set:
+        """
+        Direcciones que ya recibieron (o tienen en cola) un correo del objeto.
+
+        Sirve para que un reenvío no repita la notificación a quienes ya la
+        recibieron correctamente.
+        """
+        content_type = ContentType.objects.get_for_model(objeto)
+        notificados = set(
+            NotificacionEnviada.objects.filter(
+                content_type=content_type, object_id=objeto.pk, estado="OK"
+            ).values_list("destinatario", flat=True)
+        )
+        en_cola = CorreoSaliente.objects.filter(
+            content_type=content_type, object_id=objeto.pk,
+            estado__in=["PEN", "PRO", "REI"],
+        ).values_list("destinatarios", flat=True)
+        for destinatarios in en_cola:
+            notificados.update(destinatarios)
+        return notificados
+
+    @staticmethod
+    def reclamar(limite: Optional[int] = None) -> List[CorreoSaliente]:
+        """
+        Toma correos listos para enviar y los marca como "Procesando".
+
+        Cada correo se toma con un UPDATE condicionado a su estado, de modo
+        que dos workers simultáneos nunca envían el mismo correo. Los que
+        quedaron "Procesando" de un worker caído se retoman al vencer
+        `bloqueado_hasta`.
+        """
+        ahora = timezone.now()
+        disponibles = (
+            Q(estado__in=["PEN", "REI"], proximo_intento__lte=ahora)
+            | Q(estado="PRO", bloqueado_hasta__lt=ahora)
+        )
+
+        candidatos = CorreoSaliente.objects.filter(disponibles).values_list("pk", flat=True)
+        if limite:
+            candidatos = candidatos[:limite]
+
+        bloqueado_hasta = ahora + timedelta(seconds=settings.OUTBOX_BLOQUEO_SEGUNDOS)
+        reclamados = [
+            pk for pk in list(candidatos)
+            if CorreoSaliente.objects.filter(disponibles, pk=pk).update(
+                estado="PRO", bloqueado_hasta=bloqueado_hasta)
+        ]
+
+        return list(
+            CorreoSaliente.objects.filter(pk__in=reclamados)
+            .prefetch_related("adjuntos")
+            .order_by("proximo_intento", "pk")
+        )
+
+    @staticmethod
+    def registrar_resultado(correo: CorreoSaliente, error: Optional[str]) -> str:
+        """
+        Registra el resultado del envío de un correo reclamado.
+
+        Args:
+            correo: Correo procesado
+            error: None si se envió, o el texto del error
+
+        Returns:
+            str: Estado final del correo ("ENV", "REI" o "FAL")
+        """
+        correo.intentos += 1
+
+        if error:
+            correo.ultimo_error = error
+            if correo.intentos >= correo.max_intentos:
+                correo.estado = "FAL"
+                logger.error(
+                    f"Correo {correo.pk} descartado tras {correo.intentos} intentos: {error}")
+            else:
+                correo.estado = "REI"
+                correo.proximo_intento = timezone.now() + OutboxService.espera(correo.intentos)
+                logger.warning(
+                    f"Correo {correo.pk} falló (intento {correo.intentos}), "
+                    f"se reintenta a las {correo.proximo_intento:%H:%M:%S}: {error}")
+        else:
+            correo.estado = "ENV"
+            correo.fecha_envio = timezone.now()
+            correo.ultimo_error = ""
+            logger.info(f"Correo {correo.pk} enviado a {', '.join(correo.destinatarios)}")
+
+        correo.bloqueado_hasta = None
+        correo.save(update_fields=[
+            "estado", "intentos", "proximo_intento", "bloqueado_hasta",
+            "ultimo_error", "fecha_envio",
+        ])
+        return correo.estado
+
+    @staticmethod
+    def reintentar(queryset) -> int:
+        """Vuelve a poner en cola correos fallidos (acción del admin)."""
+        return queryset.filter(estado="FAL").update(
+            estado="PEN", intentos=0, proximo_intento=timezone.now(), ultimo_error="")
+
+    @staticmethod
+    def espera(intentos: int) -> timedelta:
+        """Backoff exponencial: base, 2×base, 4×base... hasta el máximo."""
+        segundos = settings.OUTBOX_BACKOFF_SEGUNDOS * 2 ** (intentos - 1)
+        return timedelta(seconds=min(segundos, settings.OUTBOX_BACKOFF_MAX_SEGUNDOS))
+
+    @staticmethod
+    def _construir_mensaje(
+        correo: CorreoSaliente, adjuntos: Optional[CacheAdjuntos] = None
+    ) -> Union[EmailMessage, MensajeEnDisco]:
+        """
+        Arma el EmailMessage de Django a partir del registro.
+
+        Si los adjuntos superan OUTBOX_STREAMING_MIN_BYTES devuelve un
+        MensajeEnDisco, que los codifica y envía por bloques en lugar de
+        cargarlos en memoria (y no pasan por la caché del lote).
+
+        Args:
+            correo: Correo de la bandeja de salida
+            adjuntos: Caché del lote para compartir las partes MIME
+        """
+        email = EmailMessage(
+            subject=correo.asunto,
+            body=correo.cuerpo,
+            from_email=correo.remitente or None,
+            to=correo.destinatarios,
+        )
+        if correo.es_html:
+            email.content_subtype = "html"
+
+        lista = list(correo.adjuntos.all())
+        if lista and sum(adjunto.tamanio() for adjunto in lista) > settings.OUTBOX_STREAMING_MIN_BYTES:
+            return MensajeEnDisco(email, lista)
+
+        adjuntos = adjuntos or CacheAdjuntos()
+        for adjunto in lista:
+            email.attach(adjuntos.parte(adjunto))
+
+        return email
+
+    @staticmethod
+    def _tipo_mime(nombre: str) -> str:
+        return mimetypes.guess_type(nombre)[0] or "application/octet-stream"
@@ -0,0 +1,191 @@
+# notificaciones/services/streaming.py
+"""
+Envío por bloques de correos con adjuntos pesados.
+
+Un EmailMessage de Django arma el mensaje completo en memoria (el archivo
+leído, su base64 y el texto final). Para adjuntos grandes, como los
+analíticos escaneados de equivalencias, `MensajeEnDisco` codifica cada
+adjunto por bloques en un archivo temporal (en memoria solo hasta
+`OUTBOX_SPOOL_BYTES`) y lo transmite al socket SMTP en bloques de
+`ENVIO` bytes, así la memoria por envío no depende del tamaño de los
+adjuntos y la cantidad de escrituras al socket se mantiene baja.
+"""
+import base64
+import logging
+import smtplib
+import tempfile
+import uuid
+from email.mime.base import MIMEBase
+from email.mime.text import MIMEText
+from email import policy
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.mail.message import sanitize_address
+
+logger = logging.getLogger(__name__)
+
+# Múltiplo de 57 bytes: cada bloque se codifica en líneas base64 completas
+BLOQUE = 57 * 1024
+
+# Tamaño de cada escritura al socket SMTP durante DATA
+ENVIO = 64 * 1024
+
+CABECERAS_DE_CONTENIDO = ("content-type", "content-transfer-encoding", "mime-version")
+
+
+class MensajeEnDisco:
+    """Correo cuyos adjuntos se codifican y envían por bloques."""
+
+    def __init__(self, email: EmailMessage, adjuntos):
+        """
+        Args:
+            email: Mensaje sin adjuntos (asunto, cuerpo y destinatarios)
+            adjuntos: AdjuntoCorreo a incluir
+        """
+        self.email = email
+        self.adjuntos = list(adjuntos)
+
+    def escribir(self, destino):
+        """Escribe el mensaje MIME completo (con CRLF) en un archivo binario."""
+        frontera = f"=_{uuid.uuid4().hex}"
+
+        cabeceras = [
+            f"{clave}: {valor}"
+            for clave, valor in self.email.message().items()
+            if clave.lower() not in CABECERAS_DE_CONTENIDO
+        ]
+        cabeceras += [
+            "MIME-Version: 1.0",
+            f'Content-Type: multipart/mixed; boundary="{frontera}"',
+        ]
+        texto = "\n".join(cabeceras).replace("\r\n", "\n").replace("\n", "\r\n")
+        destino.write(texto.encode("ascii") + b"\r\n\r\n")
+
+        cuerpo = MIMEText(self.email.body, self.email.content_subtype, "utf-8")
+        del cuerpo["MIME-Version"]
+        destino.write(f"--{frontera}\r\n".encode())
+        destino.write(cuerpo.as_bytes(policy=policy.SMTP))
+
+        for adjunto in self.adjuntos:
+            destino.write(f"\r\n--{frontera}\r\n".encode())
+            destino.write(MensajeEnDisco._cabecera_adjunto(adjunto))
+            with adjunto.abrir() as archivo:
+                while bloque := archivo.read(BLOQUE):
+                    destino.write(base64.encodebytes(bloque).replace(b"\n", b"\r\n"))
+
+        destino.write(f"\r\n--{frontera}--\r\n".encode())
+
+    def enviar_por(self, conexion):
+        """
+        Envía el mensaje por un backend de correo ya abierto.
+
+        Con el backend SMTP se transmite por bloques; otros backends (consola,
+        memoria en los tests) reciben un EmailMessage común.
+
+        Returns:
+            dict: Destinatarios rechazados (vacío si no es una sesión SMTP)
+        """
+        smtp = getattr(conexion, "connection", None)
+        if isinstance(smtp, smtplib.SMTP):
+            return self.enviar_smtp(smtp)
+        conexion.send_messages([self.como_email()])
+        return {}
+
+    def enviar_smtp(self, smtp: smtplib.SMTP) -> dict:
+        """
+        Transmite el mensaje por una sesión SMTP (MAIL, RCPT y DATA a mano).
+
+        Returns:
+            dict: Destinatarios rechazados, como smtplib.SMTP.sendmail
+
+        Raises:
+            smtplib.SMTPException: Si el servidor rechaza el remitente, todos
+                los destinatarios o el contenido
+        """
+        codificacion = self.email.encoding or settings.DEFAULT_CHARSET
+        remitente = sanitize_address(self.email.from_email, codificacion)
+        destinatarios = [sanitize_address(d, codificacion) for d in self.email.recipients()]
+
+        with tempfile.SpooledTemporaryFile(max_size=settings.OUTBOX_SPOOL_BYTES) as spool:
+            self.escribir(spool)
+            spool.seek(0)
+
+            smtp.ehlo_or_helo_if_needed()
+            codigo, respuesta = smtp.mail(remitente)
+            if codigo != 250:
+                smtp.rset()
+                raise smtplib.SMTPSenderRefused(codigo, respuesta, remitente)
+
+            rechazados = {}
+            for destinatario in destinatarios:
+                codigo, respuesta = smtp.rcpt(destinatario)
+                if codigo not in (250, 251):
+                    rechazados[destinatario] = (codigo, respuesta)
+            if len(rechazados) == len(destinatarios):
+                smtp.rset()
+                raise smtplib.SMTPRecipientsRefused(rechazados)
+
+            codigo, respuesta = smtp.docmd("data")
+            if codigo != 354:
+                smtp.rset()
+                raise smtplib.SMTPDataError(codigo, respuesta)
+
+            for bloque in MensajeEnDisco._bloques_con_relleno(spool):
+                smtp.send(bloque)
+            smtp.send(b".\r\n")
+
+            codigo, respuesta = smtp.getreply()
+            if codigo != 250:
+                raise smtplib.SMTPDataError(codigo, respuesta)
+
+        if rechazados:
+            logger.warning(f"Destinatarios rechazados: {', '.join(rechazados)}")
+        return rechazados
+
+    def como_email(self) -> EmailMessage:
+        """EmailMessage equivalente, con los adjuntos leídos en memoria."""
+        email = EmailMessage(
+            subject=self.email.subject,
+            body=self.email.body,
+            from_email=self.email.from_email,
+            to=self.email.to,
+        )
+        email.content_subtype = self.email.content_subtype
+        for adjunto in self.adjuntos:
+            email.attach(adjunto.nombre, adjunto.leer(), adjunto.tipo_mime)
+        return email
+
+    @staticmethod
+    def _bloques_con_relleno(archivo, tamanio: int = ENVIO):
+        """
+        Lee el mensaje por bloques y duplica el punto inicial de cada línea
+        (RFC 5321, 4.5.2).
+
+        Cada bloque se procesa junto con los dos últimos bytes del anterior,
+        así un "\\r\\n." partido entre dos bloques también se rellena; el
+        inicio del mensaje cuenta como comienzo de línea.
+        """
+        anterior = b"\r\n"
+        while bloque := archivo.read(tamanio):
+            datos = anterior + bloque
+            # El reemplazo agrega bytes solo después de cada "\r\n", así que
+            # el prefijo (2 bytes) queda intacto y se puede recortar
+            yield datos.replace(b"\r\n.", b"\r\n..")[len(anterior):]
+            anterior = datos[-2:]
+
+    @staticmethod
+    def _cabecera_adjunto(adjunto) -> bytes:
+        """Cabeceras MIME de la parte de un adjunto (sin el contenido)."""
+        tipo, subtipo = adjunto.tipo_mime.split("/", 1)
+        parte = MIMEBase(tipo, subtipo)
+        del parte["MIME-Version"]
+        parte["Content-Transfer-Encoding"] = "base64"
+
+        nombre = adjunto.nombre
+        try:
+            nombre.encode("ascii")
+        except UnicodeEncodeError:
+            nombre = ("utf-8", "", nombre)
+        parte.add_header("Content-Disposition", "attachment", filename=nombre)
+        return parte.as_bytes(policy=policy.SMTP)
@@ -0,0 +1,105 @@
+# notificaciones/test/test_dispatcher.py
+"""
+Tests para el despacho de lotes por conexión SMTP compartida.
+"""
+import smtplib
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from notificaciones.services.dispatcher import DespachadorCorreos
+
+
+def mensajes(cantidad):
+    return [
+        EmailMessage(subject=f"Correo {i}", body="Hola", to=[f"docente{i}@frlp.utn.edu.ar"])
+        for i in range(cantidad)
+    ]
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_MENSAJES_POR_CONEXION=0,
+    OUTBOX_MAX_POR_MINUTO=0,
+)
+class DespachadorCorreosTestCase(SimpleTestCase):
+    """Tests de reutilización de conexión, errores por mensaje y cupo."""
+
+    def test_una_conexion_para_todo_el_lote(self):
+        """Los mensajes del lote comparten la conexión."""
+        with mock.patch.object(EmailBackend, "open", autospec=True) as abrir:
+            resultados = DespachadorCorreos.enviar(mensajes(5))
+
+        self.assertEqual([error for error, *_ in resultados], [None] * 5)
+        self.assertEqual(abrir.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+
+    @override_settings(OUTBOX_MENSAJES_POR_CONEXION=2)
+    def test_reconecta_cada_n_mensajes(self):
+        """Se respeta el máximo de mensajes por conexión."""
+        with mock.patch.object(EmailBackend, "open", autospec=True) as abrir:
+            DespachadorCorreos.enviar(mensajes(5))
+
+        self.assertEqual(abrir.call_count, 3)
+
+    def test_error_de_un_mensaje_no_aborta_el_lote(self):
+        """Cada mensaje informa su resultado y los destinatarios rechazados."""
+        enviar_original = EmailBackend.send_messages
+
+        def enviar(backend, lote):
+            if lote[0].to == ["docente1@frlp.utn.edu.ar"]:
+                raise smtplib.SMTPRecipientsRefused(
+                    {"docente1@frlp.utn.edu.ar": (550, b"Mailbox unavailable")})
+            return enviar_original(backend, lote)
+
+        with mock.patch.object(EmailBackend, "send_messages", autospec=True, side_effect=enviar):
+            resultados = DespachadorCorreos.enviar(mensajes(3))
+
+        errores = [error for error, *_ in resultados]
+        self.assertIsNone(errores[0])
+        self.assertEqual(
+            errores[1],
+            "Destinatarios rechazados: docente1@frlp.utn.edu.ar (550 Mailbox unavailable)",
+        )
+        self.assertIsNone(errores[2])
+        self.assertEqual(len(mail.outbox), 2)
+
+    @override_settings(OUTBOX_MAX_POR_MINUTO=30)
+    def test_limite_de_tasa(self):
+        """Con cupo de 30 por minuto se espera ~2 segundos entre mensajes."""
+        with mock.patch("notificaciones.services.dispatcher.time.sleep") as dormir:
+            DespachadorCorreos.enviar(mensajes(3))
+
+        self.assertEqual(dormir.call_count, 2)
+        for llamada in dormir.call_args_list:
+            self.assertAlmostEqual(llamada.args[0], 2, delta=0.5)
+
+    def test_rechazo_parcial_con_backend_smtp(self):
+        """Los destinatarios rechazados por sendmail() se informan aunque el mensaje salga."""
+        smtp = mock.Mock(spec=smtplib.SMTP)
+        smtp.sendmail.return_value = {"docente1@frlp.utn.edu.ar": (550, b"Mailbox unavailable")}
+        mensaje = EmailMessage(
+            subject="Correo", body="Hola",
+            to=["docente0@frlp.utn.edu.ar", "docente1@frlp.utn.edu.ar"])
+
+        def abrir(backend):
+            backend.connection = smtp
+            return True
+
+        avisos = []
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend"), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.open", abrir), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.close"):
+            resultados = DespachadorCorreos.enviar(
+                [mensaje], al_terminar=lambda *aviso: avisos.append(aviso))
+
+        error, _, rechazados = resultados[0]
+        self.assertIsNone(error)
+        self.assertEqual(rechazados, {"docente1@frlp.utn.edu.ar": (550, b"Mailbox unavailable")})
+        self.assertEqual(avisos[0][3], rechazados)
+        self.assertEqual(
+            smtp.sendmail.call_args.args[1],
+            ["docente0@frlp.utn.edu.ar", "docente1@frlp.utn.edu.ar"])
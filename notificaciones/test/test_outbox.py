@@ -0,0 +1,322 @@
+# notificaciones/test/test_outbox.py
+"""
+Tests para la bandeja de salida de correos.
+"""
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from carrera_academica.models import CarreraAcademica
+from carrera_academica.services.email_service import EmailService
+from notificaciones.models import CorreoSaliente, NotificacionEnviada
+from notificaciones.services.dispatcher import DespachadorCorreos
+from notificaciones.services.outbox_service import OutboxService
+from planta_docente.models import Asignatura, Cargo, Correo, Docente
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_MAX_INTENTOS=3,
+    OUTBOX_BACKOFF_SEGUNDOS=60,
+    OUTBOX_BACKOFF_MAX_SEGUNDOS=90,
+    OUTBOX_MAX_POR_MINUTO=0,
+    OUTBOX_HILOS=1,
+)
+class OutboxServiceTestCase(TestCase):
+    """Tests de encolado, envío y reintentos."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def encolar(self, **kwargs):
+        datos = {"asunto": "Prueba", "cuerpo": "Hola", "destinatarios": ["a@frlp.utn.edu.ar"]}
+        datos.update(kwargs)
+        return OutboxService.encolar(**datos)
+
+    def test_encolar_no_envia(self):
+        """Encolar solo inserta: el envío lo hace el worker."""
+        correo = self.encolar()
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(correo.estado, "PEN")
+
+    def test_envio_con_adjuntos(self):
+        """Se adjuntan tanto archivos existentes como contenido generado."""
+        ruta = f"{self.media_root}/acta.pdf"
+        with open(ruta, "wb") as f:
+            f.write(b"%PDF")
+        correo = self.encolar(
+            es_html=True, rutas=[ruta],
+            adjuntos=[("planilla.docx", b"docx", None)],
+        )
+
+        resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado, {"enviados": 1, "reintentos": 0, "fallidos": 0})
+        self.assertEqual(len(mail.outbox), 1)
+        mensaje = mail.outbox[0]
+        self.assertEqual(mensaje.content_subtype, "html")
+        self.assertEqual(
+            [(parte.get_filename(), parte.get_payload(decode=True)) for parte in mensaje.attachments],
+            [("acta.pdf", b"%PDF"), ("planilla.docx", b"docx")],
+        )
+        correo.refresh_from_db()
+        self.assertEqual(correo.estado, "ENV")
+        self.assertEqual(correo.intentos, 1)
+        self.assertIsNotNone(correo.fecha_envio)
+
+    def test_adjunto_compartido_se_codifica_una_vez(self):
+        """Un mismo archivo enviado a varios destinatarios se lee una vez por lote."""
+        ruta = f"{self.media_root}/F01.pdf"
+        with open(ruta, "wb") as f:
+            f.write(b"%PDF" * 1000)
+        for i in range(4):
+            self.encolar(destinatarios=[f"miembro{i}@frlp.utn.edu.ar"], rutas=[ruta])
+
+        with mock.patch(
+            "notificaciones.models.AdjuntoCorreo.leer", autospec=True,
+            side_effect=lambda adjunto: b"%PDF" * 1000,
+        ) as leer, mock.patch.object(
+            DespachadorCorreos, "enviar", wraps=DespachadorCorreos.enviar
+        ) as enviar:
+            OutboxService.procesar_pendientes()
+
+        self.assertEqual(leer.call_count, 1)
+        self.assertEqual(len(mail.outbox), 4)
+        lote = enviar.call_args.args[0]
+        self.assertEqual(len({id(mensaje.attachments[0]) for mensaje in lote}), 1)
+        self.assertIn(b"filename=\"F01.pdf\"", mail.outbox[3].message().as_bytes())
+
+    def test_no_reenvia_los_ya_enviados(self):
+        """Una segunda pasada no vuelve a enviar."""
+        self.encolar()
+        OutboxService.procesar_pendientes()
+        OutboxService.procesar_pendientes()
+
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_reintento_con_backoff(self):
+        """Un fallo reprograma el correo con espera exponencial acotada."""
+        correo = self.encolar()
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("SMTP caído"),
+        ):
+            resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado["reintentos"], 1)
+        correo.refresh_from_db()
+        self.assertEqual(correo.estado, "REI")
+        self.assertEqual(correo.ultimo_error, "SMTP caído")
+        self.assertGreater(correo.proximo_intento, timezone.now() + timedelta(seconds=50))
+
+        # Antes de que venza la espera no se vuelve a intentar
+        self.assertEqual(OutboxService.procesar_pendientes()["reintentos"], 0)
+        self.assertEqual(OutboxService.espera(2), timedelta(seconds=90))
+
+    def test_fallido_tras_max_intentos(self):
+        """Al agotar los intentos queda como fallido, y el admin lo reencola."""
+        correo = self.encolar()
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("SMTP caído"),
+        ):
+            for _ in range(3):
+                CorreoSaliente.objects.filter(pk=correo.pk).update(
+                    proximo_intento=timezone.now())
+                OutboxService.procesar_pendientes()
+
+        correo.refresh_from_db()
+        self.assertEqual(correo.estado, "FAL")
+        self.assertEqual(correo.intentos, 3)
+
+        self.assertEqual(OutboxService.reintentar(CorreoSaliente.objects.all()), 1)
+        OutboxService.procesar_pendientes()
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_no_toma_correos_de_otro_worker(self):
+        """Un correo "Procesando" con bloqueo vigente no se vuelve a tomar."""
+        correo = self.encolar()
+        self.assertEqual(len(OutboxService.reclamar()), 1)
+
+        self.assertEqual(OutboxService.reclamar(), [])
+
+        # Si el worker se cayó, al vencer el bloqueo se retoma
+        CorreoSaliente.objects.filter(pk=correo.pk).update(
+            bloqueado_hasta=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(OutboxService.reclamar()), 1)
+
+    def test_adjunto_faltante_no_frena_el_lote(self):
+        """Si un correo no se puede armar, el resto se envía igual."""
+        roto = self.encolar(rutas=[f"{self.media_root}/no_existe.pdf"])
+        self.encolar()
+
+        resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado["enviados"], 1)
+        self.assertEqual(resultado["reintentos"], 1)
+        roto.refresh_from_db()
+        self.assertIn("no_existe.pdf", roto.ultimo_error)
+
+    def test_auditoria_por_destinatario(self):
+        """Cada intento queda registrado por destinatario, con su duración."""
+        correo = self.encolar(destinatarios=["a@frlp.utn.edu.ar", "b@frlp.utn.edu.ar"])
+
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("SMTP caído"),
+        ):
+            OutboxService.procesar_pendientes()
+        CorreoSaliente.objects.filter(pk=correo.pk).update(proximo_intento=timezone.now())
+        OutboxService.procesar_pendientes()
+
+        intentos = NotificacionEnviada.objects.filter(correo=correo)
+        self.assertEqual(intentos.filter(estado="ERR").count(), 2)
+        self.assertEqual(
+            set(intentos.filter(estado="OK").values_list("destinatario", flat=True)),
+            {"a@frlp.utn.edu.ar", "b@frlp.utn.edu.ar"},
+        )
+        self.assertEqual(intentos.filter(estado="ERR").first().error, "SMTP caído")
+
+    def test_rechazo_parcial_se_audita_como_error(self):
+        """Un destinatario rechazado queda con error y no cuenta como notificado."""
+        objeto = self.encolar(destinatarios=["x@frlp.utn.edu.ar"])
+        correo = self.encolar(
+            destinatarios=["a@frlp.utn.edu.ar", "b@frlp.utn.edu.ar"], objeto=objeto)
+
+        with mock.patch.object(
+            DespachadorCorreos, "_enviar_email",
+            return_value={"b@frlp.utn.edu.ar": (550, b"Mailbox unavailable")},
+        ):
+            resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado["enviados"], 2)
+        intentos = NotificacionEnviada.objects.filter(correo=correo)
+        self.assertEqual(intentos.get(destinatario="a@frlp.utn.edu.ar").estado, "OK")
+        rechazado = intentos.get(destinatario="b@frlp.utn.edu.ar")
+        self.assertEqual(rechazado.estado, "ERR")
+        self.assertEqual(rechazado.error, "Destinatario rechazado: 550 Mailbox unavailable")
+        self.assertEqual(OutboxService.destinatarios_notificados(objeto), {"a@frlp.utn.edu.ar"})
+
+    @override_settings(OUTBOX_HILOS=3)
+    def test_envio_concurrente(self):
+        """Con varios hilos se envía todo y cada resultado va a su correo."""
+        correos = [self.encolar(destinatarios=[f"d{i}@frlp.utn.edu.ar"]) for i in range(7)]
+        enviar_original = mail.backends.locmem.EmailBackend.send_messages
+
+        def enviar(backend, lote):
+            if lote[0].to == ["d4@frlp.utn.edu.ar"]:
+                raise OSError("rechazado")
+            return enviar_original(backend, lote)
+
+        with mock.patch.object(
+            mail.backends.locmem.EmailBackend, "send_messages", autospec=True, side_effect=enviar
+        ):
+            resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado, {"enviados": 6, "reintentos": 1, "fallidos": 0})
+        self.assertEqual(len(mail.outbox), 6)
+        correos[4].refresh_from_db()
+        self.assertEqual(correos[4].ultimo_error, "rechazado")
+
+    @override_settings(OUTBOX_MAX_POR_MINUTO=60, OUTBOX_BLOQUEO_SEGUNDOS=4)
+    def test_lotes_que_terminan_antes_del_bloqueo(self):
+        """Con cupo por minuto, cada reclamo entra en la mitad del bloqueo."""
+        for i in range(5):
+            self.encolar(destinatarios=[f"d{i}@frlp.utn.edu.ar"])
+
+        with mock.patch("notificaciones.services.dispatcher.time.sleep"), \
+                mock.patch.object(
+                    OutboxService, "reclamar", wraps=OutboxService.reclamar) as reclamar:
+            resultado = OutboxService.procesar_pendientes(limite=100)
+
+        # 60 por minuto durante 4 segundos, con margen de la mitad: 2 por lote
+        self.assertEqual([c.args[0] for c in reclamar.call_args_list], [2, 2, 2])
+        self.assertEqual(resultado["enviados"], 5)
+        self.assertEqual(OutboxService.tamanio_lote(1), 1)
+
+    def test_resultado_se_guarda_al_enviar_cada_correo(self):
+        """Cada correo queda "Enviado" apenas sale, sin esperar al resto del lote."""
+        for i in range(3):
+            self.encolar(destinatarios=[f"d{i}@frlp.utn.edu.ar"])
+        enviados_antes = []
+        enviar_original = mail.backends.locmem.EmailBackend.send_messages
+
+        def enviar(backend, lote):
+            enviados_antes.append(CorreoSaliente.objects.filter(estado="ENV").count())
+            return enviar_original(backend, lote)
+
+        with mock.patch.object(
+            mail.backends.locmem.EmailBackend, "send_messages", autospec=True, side_effect=enviar
+        ):
+            OutboxService.procesar_pendientes()
+
+        self.assertEqual(enviados_antes, [0, 1, 2])
+
+    def test_destinatarios_notificados(self):
+        """Se consideran notificados los enviados y los que están en cola."""
+        otro_objeto = self.encolar(destinatarios=["x@frlp.utn.edu.ar"])
+        self.encolar(destinatarios=["a@frlp.utn.edu.ar"], objeto=otro_objeto)
+        self.assertEqual(
+            OutboxService.destinatarios_notificados(otro_objeto), {"a@frlp.utn.edu.ar"})
+
+        OutboxService.procesar_pendientes()
+        self.assertEqual(
+            OutboxService.destinatarios_notificados(otro_objeto), {"a@frlp.utn.edu.ar"})
+
+    def test_comando_procesar_correos(self):
+        """El comando hace una pasada y envía la cola."""
+        self.encolar()
+        self.encolar()
+
+        call_command("procesar_correos", stdout=mock.Mock())
+
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class EmailServiceOutboxTestCase(TestCase):
+    """Los correos de Carrera Académica pasan por la bandeja de salida."""
+
+    def test_recordatorio_se_encola(self):
+        """El recordatorio no abre conexión SMTP durante la request."""
+        docente = Docente.objects.create(
+            nombre="juan", apellido="perez", documento=12345678,
+            legajo=1001, fecha_nacimiento=date(1980, 1, 1),
+        )
+        Correo.objects.create(docente=docente, email="juan@frlp.utn.edu.ar", principal=True)
+        asignatura = Asignatura.objects.create(
+            nombre="hidraulica", nivel="i", departamento="civil",
+            especialidad="civil", hora_semanal=4, hora_total=96, dictado="a",
+        )
+        cargo = Cargo.objects.create(
+            docente=docente, asignatura=asignatura, caracter="reg",
+            categoria="adj", dedicacion="ds", cantidad_horas=10,
+            fecha_inicio=date(2023, 1, 1), fecha_vencimiento=date(2026, 1, 1),
+        )
+        ca = CarreraAcademica.objects.create(
+            cargo=cargo, fecha_inicio=date(2023, 1, 1),
+            fecha_vencimiento_original=date(2026, 1, 1),
+            fecha_vencimiento_actual=date(2026, 1, 1),
+        )
+
+        exito, _ = EmailService.enviar_recordatorio_formularios_pendientes(ca)
+
+        self.assertTrue(exito)
+        self.assertEqual(len(mail.outbox), 0)
+        correo = CorreoSaliente.objects.get()
+        self.assertEqual(correo.destinatarios, ["juan@frlp.utn.edu.ar"])
@@ -0,0 +1,199 @@
+# notificaciones/test/test_streaming.py
+"""
+Tests para el envío por bloques de adjuntos pesados.
+"""
+import email
+import email.policy
+import io
+import os
+import shutil
+import smtplib
+import tempfile
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.test import TestCase, override_settings
+
+from notificaciones.models import CorreoSaliente, NotificacionEnviada
+from notificaciones.services.outbox_service import OutboxService
+from notificaciones.services.streaming import BLOQUE, ENVIO, MensajeEnDisco
+
+
+class SMTPGrabador(smtplib.SMTP):
+    """Sesión SMTP sin red que registra lo transmitido."""
+
+    def __init__(self):
+        super().__init__()
+        self.enviado = []
+
+    def ehlo_or_helo_if_needed(self):
+        pass
+
+    def mail(self, remitente, options=()):
+        return 250, b"OK"
+
+    def rcpt(self, destinatario, options=()):
+        if destinatario.startswith("rechazado"):
+            return 550, b"Mailbox unavailable"
+        return 250, b"OK"
+
+    def docmd(self, cmd, args=""):
+        return 354, b"Go ahead"
+
+    def send(self, datos):
+        self.enviado.append(datos)
+
+    def getreply(self):
+        return 250, b"Queued"
+
+    def rset(self):
+        return 250, b"OK"
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_STREAMING_MIN_BYTES=1024,
+    OUTBOX_SPOOL_BYTES=4096,
+    OUTBOX_MAX_POR_MINUTO=0,
+    OUTBOX_HILOS=1,
+)
+class MensajeEnDiscoTestCase(TestCase):
+    """Tests del armado y la transmisión por bloques."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+        # Un "analítico escaneado" de varios bloques
+        self.contenido = os.urandom(3 * BLOQUE + 1000)
+        self.ruta = os.path.join(self.media_root, "analitico.pdf")
+        with open(self.ruta, "wb") as f:
+            f.write(self.contenido)
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def encolar(self, destinatarios=("docente@frlp.utn.edu.ar",)):
+        return OutboxService.encolar(
+            asunto="Solicitud de Equivalencia de Ana Gómez",
+            cuerpo=".Línea que empieza con punto\n<p>Hola profe</p>",
+            destinatarios=list(destinatarios),
+            es_html=True,
+            rutas=[self.ruta],
+            adjuntos=[("Planilla_Física I.docx", b"docx", None)],
+        )
+
+    def test_adjuntos_grandes_van_por_bloques(self):
+        """Por encima del umbral el mensaje no se arma en memoria."""
+        mensaje = OutboxService._construir_mensaje(self.encolar())
+
+        self.assertIsInstance(mensaje, MensajeEnDisco)
+        self.assertEqual(mensaje.email.attachments, [])
+
+    def test_transmision_smtp(self):
+        """Lo transmitido, sin el relleno de puntos, es el mensaje completo."""
+        mensaje = OutboxService._construir_mensaje(
+            self.encolar(["docente@frlp.utn.edu.ar", "rechazado@frlp.utn.edu.ar"]))
+        smtp = SMTPGrabador()
+
+        rechazados = mensaje.enviar_smtp(smtp)
+
+        self.assertEqual(list(rechazados), ["rechazado@frlp.utn.edu.ar"])
+        self.assertEqual(smtp.enviado[-1], b".\r\n")
+
+        transmitido = b"\r\n" + b"".join(smtp.enviado[:-1])
+        crudo = transmitido.replace(b"\r\n..", b"\r\n.")[2:]
+        recibido = email.message_from_bytes(crudo, policy=email.policy.default)
+        self.assertEqual(recibido["Subject"], "Solicitud de Equivalencia de Ana Gómez")
+
+        partes = list(recibido.iter_parts())
+        self.assertIn(".Línea que empieza con punto", partes[0].get_content())
+        self.assertEqual(partes[1].get_payload(decode=True), self.contenido)
+        self.assertEqual(partes[2].get_filename(), "Planilla_Física I.docx")
+        self.assertEqual(partes[2].get_payload(decode=True), b"docx")
+
+    def test_escrituras_por_bloques_grandes(self):
+        """El socket recibe bloques de ENVIO bytes, no una escritura por línea."""
+        mensaje = OutboxService._construir_mensaje(self.encolar())
+        smtp = SMTPGrabador()
+
+        mensaje.enviar_smtp(smtp)
+
+        datos = smtp.enviado[:-1]
+        total = sum(len(d) for d in datos)
+        # Cada bloque leído crece a lo sumo por el relleno de puntos
+        self.assertLessEqual(len(datos), total // ENVIO + 1)
+        self.assertLess(len(smtp.enviado), 10)
+
+    def test_relleno_de_puntos_entre_bloques(self):
+        """El relleno es el mismo línea por línea que con cualquier tamaño de bloque."""
+        crudo = b".inicio\r\nmedio\r\n..doble\r\n.\r\nx.y\r\n\r\n.fin\r\n"
+        esperado = b"".join(
+            b"." + linea if linea.startswith(b".") else linea
+            for linea in io.BytesIO(crudo)
+        )
+
+        for tamanio in range(1, len(crudo) + 1):
+            with self.subTest(tamanio=tamanio):
+                bloques = list(MensajeEnDisco._bloques_con_relleno(io.BytesIO(crudo), tamanio))
+                self.assertEqual(b"".join(bloques), esperado)
+
+    def test_todos_rechazados(self):
+        """Si el servidor rechaza a todos los destinatarios no se envía DATA."""
+        mensaje = OutboxService._construir_mensaje(self.encolar(["rechazado@frlp.utn.edu.ar"]))
+        smtp = SMTPGrabador()
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            mensaje.enviar_smtp(smtp)
+        self.assertEqual(smtp.enviado, [])
+
+    def test_worker_con_backend_smtp(self):
+        """El worker transmite por bloques por la conexión del backend SMTP."""
+        self.encolar()
+        smtp = SMTPGrabador()
+
+        def abrir(backend):
+            backend.connection = smtp
+            return True
+
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend"), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.open", abrir), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.close"):
+            resultado = OutboxService.procesar_pendientes()
+
+        self.assertEqual(resultado["enviados"], 1)
+        self.assertEqual(CorreoSaliente.objects.get().estado, "ENV")
+        self.assertEqual(smtp.enviado[-1], b".\r\n")
+        self.assertGreater(sum(len(d) for d in smtp.enviado), 4 * BLOQUE)
+
+    def test_worker_audita_rechazo_parcial(self):
+        """Los destinatarios rechazados al transmitir por bloques quedan con error."""
+        correo = self.encolar(["docente@frlp.utn.edu.ar", "rechazado@frlp.utn.edu.ar"])
+        smtp = SMTPGrabador()
+
+        def abrir(backend):
+            backend.connection = smtp
+            return True
+
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend"), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.open", abrir), \
+                mock.patch("django.core.mail.backends.smtp.EmailBackend.close"):
+            OutboxService.procesar_pendientes()
+
+        estados = dict(NotificacionEnviada.objects.filter(correo=correo).values_list(
+            "destinatario", "estado"))
+        self.assertEqual(
+            estados, {"docente@frlp.utn.edu.ar": "OK", "rechazado@frlp.utn.edu.ar": "ERR"})
+
+    def test_otros_backends_reciben_email_comun(self):
+        """Con el backend en memoria (tests, desarrollo) se envía un EmailMessage."""
+        self.encolar()
+
+        self.assertEqual(OutboxService.procesar_pendientes()["enviados"], 1)
+
+        enviado = mail.outbox[0]
+        self.assertIsInstance(enviado, EmailMessage)
+        self.assertEqual(enviado.attachments[0][1], self.contenido)